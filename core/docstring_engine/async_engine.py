@@ -0,0 +1,361 @@
+"""
+Async Generation Engine - Milestone 2
+
+Generates docstrings for many functions concurrently.
+
+- Bounded concurrency (a semaphore caps requests in flight)
+- Token-bucket rate limiting on both requests and tokens per minute
+- Jittered exponential backoff on 429, 5xx and connection errors
+  (a server's retry-after header is honoured when longer)
+- Functions documented in another style are converted locally
+  (``style_converter``), without a request
+- Duplicate functions (same normalized source and signature) share one
+  request; the copies wait for it and reuse its docstring
+- Shares the GROQ backend's circuit breaker: once it is open, remaining
+  functions get template skeletons without a request (see ``backends``)
+- Without an API key every function gets a template skeleton
+  (``FALLBACK_BACKEND``) and no client is created
+- Throughput reported in docstrings per minute; every request's latency,
+  tokens, retries and status go to ``llm_metrics.registry``
+
+Works against the real GROQ API or any OpenAI-compatible server, such as
+``mock_server.MockLLMServer`` for tests and benchmarks.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional
+
+from core.docstring_engine.backends import FALLBACK_BACKEND, get_backend, get_breaker
+from core.docstring_engine.client_pool import async_client
+from core.docstring_engine.generation_cache import GenerationCache
+from core.docstring_engine.llm_integration import MODEL, build_prompt, is_retryable
+from core.docstring_engine.llm_metrics import track
+from core.docstring_engine.prompt_builder import estimate_tokens, reported_prompt_tokens, stats as prompt_stats
+from core.docstring_engine.generator import build_function_source, duplicate_key, format_content
+from core.docstring_engine.style_converter import convert_function
+
+# Defaults sized for the GROQ free tier of the default model
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RPM = 30
+DEFAULT_TPM = 6000
+
+# Completion tokens reserved per request (docstrings are short)
+COMPLETION_TOKENS = 300
+
+MAX_RETRIES = 5
+BASE_DELAY = 0.5
+MAX_DELAY = 30.0
+
+
+class TokenBucket:
+    """Bucket refilled continuously at ``per_minute`` units per minute."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """
+        Seconds until ``amount`` units are available (0 if they are now).
+
+        Args:
+            amount (float): Units wanted (clamped to the capacity)
+
+        Returns:
+            float: Seconds to wait
+        """
+
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        """Remove units (may go negative after an under-estimate)."""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits applied together."""
+
+    def __init__(self, rpm: float = DEFAULT_RPM, tpm: float = DEFAULT_TPM):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.waited = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int):
+        """
+        Wait until one request of ``tokens`` tokens fits both limits.
+
+        Args:
+            tokens (int): Estimated prompt plus completion tokens
+        """
+
+        # One waiter at a time keeps requests in arrival order
+        async with self._lock:
+            while True:
+                delay = max(self.requests.delay_for(1), self.tokens.delay_for(tokens))
+                if delay <= 0:
+                    break
+                self.waited += delay
+                await asyncio.sleep(delay)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+
+
+def backoff_delay(attempt: int, base: float = BASE_DELAY, cap: float = MAX_DELAY,
+                  retry_after: Optional[float] = None, rng: random.Random = random) -> float:
+    """
+    Full-jitter exponential backoff.
+
+    Args:
+        attempt (int): Retry number, from 0
+        base (float): Delay scale in seconds
+        cap (float): Longest delay
+        retry_after (Optional[float]): Server-requested delay, used as a floor
+        rng (random.Random): Random source
+
+    Returns:
+        float: Seconds to wait before retrying
+    """
+
+    delay = rng.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after:
+        delay = max(delay, min(cap, retry_after))
+    return delay
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a response's retry-after header, if any."""
+    response = getattr(error, 'response', None)
+    try:
+        return float(response.headers.get('retry-after'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class AsyncGenerationEngine:
+    """Concurrent, rate-limited docstring generation."""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, rpm: float = DEFAULT_RPM,
+                 tpm: float = DEFAULT_TPM, max_retries: int = MAX_RETRIES,
+                 base_delay: float = BASE_DELAY, max_delay: float = MAX_DELAY,
+                 base_url: Optional[str] = None, api_key: Optional[str] = None, client=None,
+                 cache: Optional[GenerationCache] = None, dedupe: bool = True):
+        self.concurrency = concurrency
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.base_url = base_url
+        self.api_key = api_key
+        self.client = client
+        self.cache = cache
+        self.dedupe = dedupe
+
+    def _borrow_client(self):
+        """Given client, or the loop's shared pooled client (its own retries off: the engine retries)."""
+        if self.client is not None:
+            return nullcontext(self.client)
+        return async_client(self.api_key, self.base_url, max_retries=0)
+
+    async def _request(self, client, limiter: RateLimiter, prompt: str, stats: Dict) -> str:
+        """Send one prompt, retrying transient failures with backoff."""
+        tokens = estimate_tokens(prompt) + COMPLETION_TOKENS
+        attempt = 0
+        with track("async") as call:
+            while True:
+                await limiter.acquire(tokens)
+                if not attempt:
+                    # Queueing for the rate limiter is not request latency
+                    call.started = time.perf_counter()
+                try:
+                    response = await client.chat.completions.create(
+                        model=MODEL,
+                        messages=[{"role": "user", "content": prompt}],
+                        temperature=0.2
+                    )
+                    text = response.choices[0].message.content.strip()
+                    call.set_usage(prompt, text, response)
+                    stats['tokens_used'] += call.prompt_tokens + call.completion_tokens
+                    stats['prompt_tokens'] += prompt_stats.record_request(prompt, reported_prompt_tokens(response))
+                    return text
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_retryable(e):
+                        raise
+                    if getattr(e, 'status_code', None) == 429:
+                        stats['rate_limited'] += 1
+                    delay = backoff_delay(attempt, self.base_delay, self.max_delay, _retry_after(e))
+                    stats['retries'] += 1
+                    stats['backoff_seconds'] += delay
+                    attempt += 1
+                    call.retries = attempt
+                    await asyncio.sleep(delay)
+
+    async def generate(self, fns: List[Dict], style: str = "google",
+                       progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """
+        Generate docstrings for many functions concurrently.
+
+        Args:
+            fns (List[Dict]): Function metadata from parser
+            style (str): Docstring style (google, numpy, rest)
+            progress (Optional[Callable[[int, int], None]]): Called with
+                (finished, total) after each function
+
+        Returns:
+            Dict: ``docstrings`` (formatted, in input order; failures,
+            short-circuited calls and every function when no API key is
+            configured get template skeletons), ``errors`` per index, and
+            ``stats`` with retries, rate-limit hits, waits, template
+            fallbacks, duplicate calls avoided, tokens used (as reported
+            by the responses) and docstrings per minute
+        """
+
+        started = time.perf_counter()
+        stats = {'functions': len(fns), 'completed': 0, 'converted': 0, 'cache_hits': 0, 'failed': 0, 'short_circuited': 0,
+                 'template_fallbacks': 0, 'calls_avoided': 0, 'retries': 0, 'rate_limited': 0, 'backoff_seconds': 0.0, 'prompt_tokens': 0,
+                 'tokens_used': 0}
+        docstrings: List[Optional[str]] = [None] * len(fns)
+        errors: Dict[int, str] = {}
+
+        limiter = RateLimiter(self.rpm, self.tpm)
+        breaker = get_breaker("groq")
+        template = get_backend(FALLBACK_BACKEND)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        finished = 0
+        # Duplicate key -> (representative index, its generation task)
+        shared: Dict = {}
+        # No key configured (and no client or key given): skeletons only, no
+        # client is created. The breaker is left alone so a half-open probe
+        # is not used up here.
+        unavailable = self.client is None and not self.api_key and not get_backend("groq").available()
+
+        async def run(index: int, fn: Dict):
+            nonlocal finished
+            converted = convert_function(fn, style)
+            cached = self.cache.get(fn, style) if self.cache is not None and converted is None else None
+            if converted is not None:
+                docstrings[index] = format_content(fn, converted, style)
+                stats['completed'] += 1
+                stats['converted'] += 1
+            elif cached is not None:
+                docstrings[index] = cached
+                stats['completed'] += 1
+                stats['cache_hits'] += 1
+            elif unavailable:
+                docstrings[index] = format_content(fn, template.generate(fn, style), style)
+                stats['completed'] += 1
+                stats['template_fallbacks'] += 1
+            else:
+                await generate_shared(index, fn)
+            finished += 1
+            if progress:
+                progress(finished, len(fns))
+
+        async def generate_shared(index: int, fn: Dict):
+            key = duplicate_key(fn) if self.dedupe else index
+            if key not in shared:
+                shared[key] = (index, asyncio.ensure_future(generate_one(index, fn)))
+                await shared[key][1]
+                return
+
+            leader, task = shared[key]
+            await task
+            stats['calls_avoided'] += 1
+            docstrings[index] = docstrings[leader]
+            if leader in errors:
+                errors[index] = errors[leader]
+                stats['failed'] += 1
+            else:
+                stats['completed'] += 1
+
+        async def generate_one(index: int, fn: Dict):
+            async with semaphore:
+                if not breaker.allow():
+                    docstrings[index] = format_content(fn, template.generate(fn, style), style)
+                    errors[index] = "circuit open"
+                    stats['short_circuited'] += 1
+                    return
+                try:
+                    prompt = build_prompt(build_function_source(fn), style)
+                    content = await self._request(client, limiter, prompt, stats)
+                    breaker.record_success()
+                    docstrings[index] = format_content(fn, content, style)
+                    if self.cache is not None:
+                        self.cache.put(fn, style, docstrings[index])
+                    stats['completed'] += 1
+                except Exception as e:
+                    # A rejected request (4xx) says nothing about an outage
+                    if is_retryable(e):
+                        breaker.record_failure()
+                    print(f"⚠️  Error generating docstring for {fn['name']}: {e}")
+                    docstrings[index] = format_content(fn, template.generate(fn, style), style)
+                    errors[index] = str(e)
+                    stats['failed'] += 1
+
+        async with nullcontext() if unavailable else self._borrow_client() as client:
+            await asyncio.gather(*(run(i, fn) for i, fn in enumerate(fns)))
+
+        seconds = time.perf_counter() - started
+        stats['seconds'] = round(seconds, 3)
+        stats['backoff_seconds'] = round(stats['backoff_seconds'], 3)
+        stats['rate_limit_wait_seconds'] = round(limiter.waited, 3)
+        stats['docstrings_per_minute'] = round(stats['completed'] / seconds * 60, 1) if seconds else 0.0
+
+        return {'docstrings': docstrings, 'errors': errors, 'stats': stats}
+
+
+def generate_concurrently(fns: List[Dict], style: str = "google",
+                          progress: Optional[Callable[[int, int], None]] = None, **options) -> Dict:
+    """
+    Run the async engine from synchronous code (e.g. the Streamlit script).
+
+    Args:
+        fns (List[Dict]): Function metadata from parser
+        style (str): Docstring style (google, numpy, rest)
+        progress (Optional[Callable[[int, int], None]]): Progress callback
+        **options: AsyncGenerationEngine settings (concurrency, rpm, tpm, ...)
+
+    Returns:
+        Dict: See ``AsyncGenerationEngine.generate``
+    """
+
+    return asyncio.run(AsyncGenerationEngine(**options).generate(fns, style, progress))
+
+
+if __name__ == '__main__':
+    import sys
+    from core.parser.python_parser import parse_path
+    from core.docstring_engine.mock_server import MockLLMServer
+
+    args = sys.argv[1:]
+    target = next((a for a in args if not a.startswith('--')), '.')
+    fns = [fn for f in parse_path(target) for fn in f['functions']]
+
+    if '--mock' in args:
+        # Benchmark the engine itself against a local server
+        with MockLLMServer(latency=0.2, failures=[429, 500]) as server:
+            result = generate_concurrently(fns, base_url=server.base_url, api_key='mock',
+                                           rpm=6000, tpm=1_000_000, base_delay=0.05)
+    else:
+        result = generate_concurrently(fns)
+
+    stats = result['stats']
+    print(f"\n⚡ {stats['completed']}/{stats['functions']} docstrings in {stats['seconds']}s "
+          f"({stats['docstrings_per_minute']}/min), {stats['retries']} retries, "
+          f"{stats['rate_limit_wait_seconds']}s waiting on rate limits")
@@ -0,0 +1,322 @@
+"""
+Docstring Backends - Milestone 2
+
+Pluggable sources of docstring content.
+
+- ``DocstringBackend`` protocol: ``available()`` and ``generate(fn, style)``;
+  backends that can stream also have ``stream(fn, style, on_chunk)``
+- Registry: backends register under a name (``@register_backend``)
+- groq: the LLM (needs GROQ_API_KEY)
+- template: offline and deterministic; builds a style-correct skeleton from
+  the parser's args, returns and raises with ``style_converter.render``
+
+LLM backends sit behind a circuit breaker. After repeated failures the
+breaker opens and calls go straight to the template backend, so an outage
+costs no per-call timeout; after a cool-down one probe call is let through
+to see whether the backend has recovered.
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Protocol, Tuple, runtime_checkable
+
+from core.docstring_engine.style_converter import render
+
+DEFAULT_BACKEND = os.getenv("DOCSTRING_BACKEND", "groq")
+FALLBACK_BACKEND = "template"
+
+# Consecutive failures that open a breaker, and seconds before a probe
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 60.0
+
+
+@runtime_checkable
+class DocstringBackend(Protocol):
+    """Source of docstring content (text without the quotes)."""
+
+    name: str
+    offline: bool
+
+    def available(self) -> bool:
+        """Whether the backend is configured and can be called."""
+        ...
+
+    def generate(self, fn: Dict, style: str) -> str:
+        """Docstring content for a parser function record."""
+        ...
+
+
+_REGISTRY: Dict[str, Callable[[], DocstringBackend]] = {}
+_instances: Dict[str, DocstringBackend] = {}
+
+
+def register_backend(name: str):
+    """
+    Class decorator adding a backend to the registry.
+
+    Args:
+        name (str): Name used to select the backend
+    """
+
+    def decorator(cls):
+        cls.name = name
+        _REGISTRY[name] = cls
+        _instances.pop(name, None)
+        return cls
+    return decorator
+
+
+def available_backends() -> List[str]:
+    """Names of every registered backend."""
+    return sorted(_REGISTRY)
+
+
+def get_backend(name: Optional[str] = None) -> DocstringBackend:
+    """
+    Shared instance of a registered backend.
+
+    Args:
+        name (Optional[str]): Backend name (DEFAULT_BACKEND if None)
+
+    Returns:
+        DocstringBackend: Backend instance
+
+    Raises:
+        ValueError: If no backend has that name
+    """
+
+    name = name or DEFAULT_BACKEND
+    if name not in _REGISTRY:
+        raise ValueError(f"Unknown backend '{name}', expected one of {available_backends()}")
+    if name not in _instances:
+        _instances[name] = _REGISTRY[name]()
+    return _instances[name]
+
+
+@register_backend("groq")
+class GroqBackend:
+    """GROQ-hosted LLM."""
+
+    offline = False
+
+    def available(self) -> bool:
+        return bool(os.getenv("GROQ_API_KEY"))
+
+    def generate(self, fn: Dict, style: str) -> str:
+        from core.docstring_engine.llm_integration import generate_docstring_llm
+        from core.docstring_engine.generator import build_function_source
+        return generate_docstring_llm(fn['name'], build_function_source(fn), style)
+
+    def stream(self, fn: Dict, style: str, on_chunk: Callable[[str], None]) -> str:
+        from core.docstring_engine.llm_integration import generate_docstring_llm
+        from core.docstring_engine.generator import build_function_source
+        return generate_docstring_llm(fn['name'], build_function_source(fn), style, on_chunk=on_chunk)
+
+
+# Leading name word -> summary verb
+_VERBS = {
+    'get': 'Return', 'is': 'Check whether', 'has': 'Check whether', 'can': 'Check whether',
+    'to': 'Convert to', 'as': 'Convert to', 'on': 'Handle', 'do': 'Run', 'make': 'Create',
+    'new': 'Create', 'calc': 'Calculate', 'init': 'Initialize',
+}
+_CAMEL = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+
+
+def _words(name: str) -> List[str]:
+    """Lowercase words of a snake_case or camelCase name."""
+    return [w.lower() for w in _CAMEL.sub('_', name).split('_') if w]
+
+
+@register_backend("template")
+class TemplateBackend:
+    """Offline skeletons from the function signature."""
+
+    offline = True
+
+    def available(self) -> bool:
+        return True
+
+    @staticmethod
+    def summary(fn: Dict) -> str:
+        """Imperative one-line summary derived from the function name."""
+        name = fn['name']
+        if name == '__init__':
+            return "Initialize the instance."
+        if name.startswith('__') and name.endswith('__'):
+            return f"Implement the {name} protocol."
+
+        words = _words(name)
+        if not words:
+            return "Run the function."
+        verb = _VERBS.get(words[0], words[0].capitalize())
+        return ' '.join([verb] + words[1:]) + '.'
+
+    def generate(self, fn: Dict, style: str) -> str:
+        annotations = {a['name']: a.get('annotation') for a in fn.get('args', [])}
+        params = list(fn.get('params') or annotations)
+        decorators = fn.get('decorators', [])
+        if fn.get('kind') == 'method' and 'staticmethod' not in decorators and params:
+            if params[0] in ('self', 'cls') or 'classmethod' in decorators:
+                params = params[1:]
+
+        returns = fn.get('returns')
+        return render({
+            'summary': self.summary(fn),
+            'description': '',
+            'params': [
+                {'name': param, 'type': annotations.get(param.lstrip('*')),
+                 'description': f"The {' '.join(_words(param.lstrip('*'))) or param.lstrip('*')}."}
+                for param in params
+            ],
+            'returns': {'type': returns, 'description': 'The result.'} if returns and returns != 'None' else None,
+            'yields': None,
+            'raises': [{'name': name, 'description': 'If the operation fails.'} for name in fn.get('raises', [])],
+            'other': []
+        }, style)
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open probe after a cool-down."""
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.short_circuited = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go to the protected backend now.
+
+        Returns:
+            bool: True when closed, or for the single probe once the
+            cool-down has passed
+        """
+
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+            if self.state == 'half_open' and not self._probing:
+                self._probing = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        """Close the breaker after a successful call."""
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        """Count a failure; open the breaker at the threshold or when a probe fails."""
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.trips += 1
+                self.state = 'open'
+                self.opened_at = self.clock()
+            self._probing = False
+
+    def stats(self) -> Dict:
+        """State, consecutive failures, trips and calls short-circuited."""
+        with self._lock:
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'trips': self.trips,
+                'short_circuited': self.short_circuited
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Process-wide circuit breaker of a backend."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker()
+        return _breakers[name]
+
+
+def reset_breakers():
+    """Forget every breaker (e.g. after changing the API key)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def can_call(name: Optional[str] = None) -> bool:
+    """
+    Whether a request to a backend should be attempted now.
+
+    Args:
+        name (Optional[str]): Backend name (DEFAULT_BACKEND if None)
+
+    Returns:
+        bool: True if the backend is available and its breaker lets the call through
+    """
+
+    backend = get_backend(name)
+    if backend.offline:
+        return True
+    return backend.available() and get_breaker(backend.name).allow()
+
+
+def _run(backend: DocstringBackend, fn: Dict, style: str, on_chunk: Optional[Callable[[str], None]]) -> str:
+    """Generate, streaming when asked and supported (otherwise one chunk at the end)."""
+    if on_chunk is not None and hasattr(backend, 'stream'):
+        return backend.stream(fn, style, on_chunk)
+    content = backend.generate(fn, style)
+    if on_chunk is not None:
+        on_chunk(content)
+    return content
+
+
+def generate_content(fn: Dict, style: str, name: Optional[str] = None,
+                     on_chunk: Optional[Callable[[str], None]] = None) -> Tuple[str, DocstringBackend]:
+    """
+    Docstring content from a backend, falling back to the template backend.
+
+    Args:
+        fn (Dict): Function metadata from parser
+        style (str): Docstring style (google, numpy, rest)
+        name (Optional[str]): Backend name (DEFAULT_BACKEND if None)
+        on_chunk (Optional[Callable[[str], None]]): Called with each piece
+            of text as it is generated (if a stream breaks off, the fallback's
+            text follows; the returned content is the one to keep)
+
+    Returns:
+        Tuple[str, DocstringBackend]: Content and the backend that produced it
+    """
+
+    backend = get_backend(name)
+    if backend.offline:
+        return _run(backend, fn, style, on_chunk), backend
+
+    if can_call(backend.name):
+        breaker = get_breaker(backend.name)
+        try:
+            content = _run(backend, fn, style, on_chunk)
+            breaker.record_success()
+            return content, backend
+        except Exception as e:
+            breaker.record_failure()
+            print(f"⚠️  {backend.name} backend failed, using {FALLBACK_BACKEND}: {e}")
+
+    fallback = get_backend(FALLBACK_BACKEND)
+    return _run(fallback, fn, style, on_chunk), fallback
@@ -0,0 +1,204 @@
+"""
+LLM Client Pool - Milestone 2
+
+One GROQ client per process (per API key and base URL) instead of a new
+client, and new HTTP connections, on every call.
+
+- Sync clients share a keep-alive httpx connection pool; httpx clients are
+  thread-safe, so one client serves every thread
+- Async connections belong to an event loop, so async clients are shared
+  per loop and closed when the last task using them is done
+- Every request is traced (httpcore ``trace`` extension) to count how many
+  needed a new TCP connection and how many reused one
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+
+import httpx
+from groq import AsyncGroq, DefaultAsyncHttpxClient, DefaultHttpxClient, Groq
+
+# Connections kept open per client
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE = 10
+KEEPALIVE_EXPIRY = 60.0
+
+
+class PoolStats:
+    """Thread-safe request and connection counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clients_created = 0
+        self.requests = 0
+        self.connections_opened = 0
+
+    def _add(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def reset(self):
+        """Zero every counter."""
+        with self._lock:
+            self.clients_created = self.requests = self.connections_opened = 0
+
+    def to_dict(self) -> Dict:
+        """
+        Snapshot of the counters.
+
+        Returns:
+            Dict: Clients created, requests, connections opened and reused,
+            and the share of requests that reused a connection
+        """
+
+        with self._lock:
+            reused = max(0, self.requests - self.connections_opened)
+            return {
+                'clients_created': self.clients_created,
+                'requests': self.requests,
+                'connections_opened': self.connections_opened,
+                'connections_reused': reused,
+                'reuse_ratio': round(reused / self.requests, 3) if self.requests else 0.0
+            }
+
+
+stats = PoolStats()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE,
+                        keepalive_expiry=KEEPALIVE_EXPIRY)
+
+
+def _trace(event: str, info: Dict):
+    """httpcore trace callback: a completed TCP connect is a new connection."""
+    if event == 'connection.connect_tcp.complete':
+        stats._add('connections_opened')
+
+
+async def _atrace(event: str, info: Dict):
+    _trace(event, info)
+
+
+def _on_request(request: httpx.Request):
+    stats._add('requests')
+    request.extensions['trace'] = _trace
+
+
+async def _on_async_request(request: httpx.Request):
+    stats._add('requests')
+    request.extensions['trace'] = _atrace
+
+
+def _resolve(api_key: Optional[str]) -> str:
+    api_key = api_key or os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise ValueError("GROQ_API_KEY not found in environment")
+    return api_key
+
+
+_lock = threading.Lock()
+_clients: Dict[Tuple[str, Optional[str]], Groq] = {}
+
+
+def get_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> Groq:
+    """
+    Shared sync client for an API key and base URL.
+
+    Args:
+        api_key (Optional[str]): API key (GROQ_API_KEY if None)
+        base_url (Optional[str]): API base URL (GROQ default if None)
+
+    Returns:
+        Groq: Process-wide client with a keep-alive connection pool
+    """
+
+    key = (_resolve(api_key), base_url)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                http_client = DefaultHttpxClient(limits=_limits(), event_hooks={'request': [_on_request]})
+                client = _clients[key] = Groq(api_key=key[0], base_url=base_url, http_client=http_client)
+                stats._add('clients_created')
+    return client
+
+
+# event loop -> {(api_key, base_url): [client, users]}
+_async_clients: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+@asynccontextmanager
+async def async_client(api_key: Optional[str] = None, base_url: Optional[str] = None,
+                       max_retries: int = 2):
+    """
+    Borrow the running loop's shared async client.
+
+    Tasks on the same loop get the same client; it is closed when the last
+    borrower returns it.
+
+    Args:
+        api_key (Optional[str]): API key (GROQ_API_KEY if None)
+        base_url (Optional[str]): API base URL (GROQ default if None)
+        max_retries (int): Client-level retries (only used when the client is created)
+
+    Yields:
+        AsyncGroq: Shared client
+    """
+
+    key = (_resolve(api_key), base_url)
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    entry = clients.get(key)
+    if entry is None:
+        http_client = DefaultAsyncHttpxClient(limits=_limits(), event_hooks={'request': [_on_async_request]})
+        entry = clients[key] = [AsyncGroq(api_key=key[0], base_url=base_url, max_retries=max_retries,
+                                          http_client=http_client), 0]
+        stats._add('clients_created')
+
+    entry[1] += 1
+    try:
+        yield entry[0]
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del clients[key]
+            await entry[0].close()
+
+
+def close_all():
+    """Close every shared sync client (e.g. at shutdown or in tests)."""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+    from core.docstring_engine.mock_server import MockLLMServer
+
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    messages = [{"role": "user", "content": "Document: def add(a, b): return a + b"}]
+
+    with MockLLMServer(latency=0) as server:
+        def per_call(make_client) -> float:
+            started = time.perf_counter()
+            for _ in range(calls):
+                make_client().chat.completions.create(model="mock", messages=messages)
+            return (time.perf_counter() - started) / calls * 1000
+
+        stats.reset()
+        fresh = per_call(lambda: Groq(api_key='mock', base_url=server.base_url))
+        pooled = per_call(lambda: get_client('mock', server.base_url))
+
+        print(f"\n🔌 {calls} calls against {server.base_url}")
+        print(f"   New client per call: {fresh:.2f} ms/call")
+        print(f"   Pooled client:       {pooled:.2f} ms/call ({fresh / pooled:.1f}x faster)")
+        print(f"   Pool stats: {stats.to_dict()}")
+        close_all()
@@ -19,7 +19,8 @@ def format_docstring(data: dict, style: str) -> str:
                 lines.append(f":param {k}: {v}")
 
     if data["returns"]:
-        lines.append("")
+        if lines[-1]:
+            lines.append("")
         if style == "google":
             lines.append("Returns:")
             lines.append(f"    {data['returns']}")
@@ -31,9 +32,20 @@ def format_docstring(data: dict, style: str) -> str:
             lines.append(f":return: {data['returns']}")
 
     if data["raises"]:
-        lines.append("")
-        lines.append("Raises:")
-        for k, v in data["raises"].items():
-            lines.append(f"    {k}: {v}")
+        if lines[-1]:
+            lines.append("")
+        if style == "google":
+            lines.append("Raises:")
+            for k, v in data["raises"].items():
+                lines.append(f"    {k}: {v}")
+        elif style == "numpy":
+            lines.append("Raises")
+            lines.append("------")
+            for k, v in data["raises"].items():
+                lines.append(f"{k}")
+                lines.append(f"    {v}")
+        else:
+            for k, v in data["raises"].items():
+                lines.append(f":raises {k}: {v}")
 
-    return "\n".join(lines)
+    return "\n".join(lines).rstrip()
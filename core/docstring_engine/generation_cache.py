@@ -0,0 +1,270 @@
+"""
+Docstring Generation Cache - Milestone 2
+
+Persistent cache of generated docstrings, so regenerating a function,
+switching styles and back, or rescanning does not call the LLM again.
+
+- Key: normalized function source hash (docstring, comments and indentation
+  ignored, see ``python_parser.normalized_source_hash``), style, model and
+  prompt template version
+- SQLite storage, safe to share between threads
+- Least-recently-used entries are evicted once the cache exceeds its size
+  budget
+- Hit/miss/eviction counters for the session
+- Can be warmed from the accept history in storage/review_logs.json
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from core.docstring_engine.llm_integration import MODEL, PROMPT_VERSION
+
+CACHE_DB = "storage/generation_cache.sqlite3"
+REVIEW_LOG = "storage/review_logs.json"
+
+# Size budget for cached docstrings, in bytes
+MAX_BYTES = 20 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    style TEXT NOT NULL,
+    docstring TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+def function_key(fn: Dict) -> str:
+    """
+    Source hash of a parser function record.
+
+    Args:
+        fn (Dict): Function metadata from parser
+
+    Returns:
+        str: ``source_hash``, or a hash of the signature for records
+        built without the parser
+    """
+
+    if fn.get('source_hash'):
+        return fn['source_hash']
+    from core.docstring_engine.generator import build_function_source
+    return hashlib.blake2b(build_function_source(fn).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class GenerationCache:
+    """SQLite-backed LRU cache of formatted docstrings."""
+
+    def __init__(self, path: str = CACHE_DB, max_bytes: int = MAX_BYTES,
+                 model: str = MODEL, prompt_version: str = PROMPT_VERSION):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.model = model
+        self.prompt_version = prompt_version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self, create: bool) -> Optional[sqlite3.Connection]:
+        """Open the database; lookups before the first write never create it."""
+        if self._conn is None:
+            if not create and not os.path.exists(self.path):
+                return None
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def key(self, source_hash: str, style: str) -> str:
+        """
+        Cache key for a function source and style under this model and prompt.
+
+        Args:
+            source_hash (str): Normalized function source hash
+            style (str): Docstring style
+
+        Returns:
+            str: Hex digest
+        """
+
+        raw = '\0'.join((source_hash, style, self.model, self.prompt_version))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, fn: Dict, style: str) -> Optional[str]:
+        """
+        Look up a generated docstring.
+
+        Args:
+            fn (Dict): Function metadata from parser
+            style (str): Docstring style
+
+        Returns:
+            Optional[str]: Cached docstring, or None on a miss
+        """
+
+        key = self.key(function_key(fn), style)
+        with self._lock:
+            conn = self._connect(create=False)
+            row = None
+            if conn is not None:
+                row = conn.execute("SELECT docstring FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE entries SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                         (time.time(), key))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, fn: Dict, style: str, docstring: str):
+        """
+        Store a generated docstring, evicting old entries past the size budget.
+
+        Args:
+            fn (Dict): Function metadata from parser
+            style (str): Docstring style
+            docstring (str): Formatted docstring
+        """
+
+        key = self.key(function_key(fn), style)
+        now = time.time()
+        size = len(docstring.encode('utf-8'))
+        with self._lock:
+            conn = self._connect(create=True)
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, style, docstring, size, created, last_used, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (key, style, docstring, size, now, now)
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least-recently-used entries until the cache fits its budget."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is not None:
+                conn.execute("DELETE FROM entries")
+                conn.commit()
+
+    def stats(self) -> Dict:
+        """
+        Session counters and current size.
+
+        Returns:
+            Dict: Hits, misses, hit rate, evictions, entries and bytes stored
+        """
+
+        with self._lock:
+            conn = self._connect(create=False)
+            entries, size = (0, 0)
+            if conn is not None:
+                entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size
+        }
+
+    def warm_from_review_log(self, log_path: str = REVIEW_LOG) -> int:
+        """
+        Seed the cache with docstrings that were accepted earlier.
+
+        Every accept entry ({file, function, style}) whose function still has
+        a docstring is stored under that function's current source hash, so
+        the unchanged function is served from the cache next time.
+
+        Args:
+            log_path (str): Accept history written by ``ai_review.log_accept``
+
+        Returns:
+            int: Entries added
+        """
+
+        from core.parser.python_parser import parse_file
+        from core.docstring_engine.generator import format_content
+
+        try:
+            with open(log_path, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read review log {log_path}: {e}")
+            return 0
+
+        if not isinstance(history, list):
+            # The same path may hold a coverage report instead of accepts
+            print(f"⚠️  {log_path} is not an accept history, nothing to warm")
+            return 0
+
+        parsed: Dict[str, Optional[Dict]] = {}
+        added = 0
+        for entry in history:
+            if not isinstance(entry, dict):
+                continue
+            path, name, style = entry.get('file'), entry.get('function'), entry.get('style')
+            if not (path and name and style):
+                continue
+            if path not in parsed:
+                parsed[path] = parse_file(path) if os.path.exists(path) else None
+            file_data = parsed[path]
+            if not file_data:
+                continue
+
+            for fn in file_data['functions']:
+                if fn['name'] == name and fn['has_docstring']:
+                    self.put(fn, style, format_content(fn, fn['docstring'], style))
+                    added += 1
+                    break
+
+        return added
+
+
+_cache: Optional[GenerationCache] = None
+
+
+def get_cache() -> GenerationCache:
+    """Process-wide generation cache."""
+    global _cache
+    if _cache is None:
+        _cache = GenerationCache()
+    return _cache
+
+
+if __name__ == '__main__':
+    import sys
+
+    cache = get_cache()
+    if '--warm' in sys.argv:
+        log_path = next((a for a in sys.argv[1:] if not a.startswith('--')), REVIEW_LOG)
+        print(f"🔥 Warmed {cache.warm_from_review_log(log_path)} entries from {log_path}")
+    print(f"📦 {cache.stats()}")
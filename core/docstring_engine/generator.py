@@ -3,8 +3,13 @@ Docstring Generator - Milestones 1 & 2
 Generates docstrings in Google, NumPy, and reST styles using LLM
 """
 
-from typing import Dict
-from core.docstring_engine.llm_integration import generate_docstring_llm
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from core.docstring_engine.llm_integration import generate_docstrings_batch
+from core.docstring_engine.generation_cache import function_key, get_cache
+from core.docstring_engine.prompt_builder import FUNCTION_TOKEN_BUDGET, fit_source
+from core.docstring_engine.backends import FALLBACK_BACKEND, generate_content, get_backend, get_breaker
+from core.docstring_engine.style_converter import convert_function
 
 
 def generate_google_docstring(fn: Dict, content: str) -> str:
@@ -52,19 +57,22 @@ def generate_rest_docstring(fn: Dict, content: str) -> str:
     return f'"""\n{content}\n"""'
 
 
-def generate_docstring(fn: Dict, style: str = "google") -> str:
+def build_function_source(fn: Dict, token_budget: int = FUNCTION_TOKEN_BUDGET) -> str:
     """
-    Generate docstring using LLM and format in selected style.
+    Build the function source sent to the LLM as context.
     
     Args:
         fn (Dict): Function metadata from parser
-        style (str): Docstring style (google, numpy, rest)
+        token_budget (int): Tokens allowed for the source
         
     Returns:
-        str: Complete formatted docstring
+        str: Real source from the parser fitted to the budget, or the
+        signature with a ``pass`` body for records without source
     """
     
-    # Build function source for LLM context
+    if fn.get('source'):
+        return fit_source(fn['source'], token_budget)
+    
     fn_source = f"def {fn['name']}("
     
     if fn.get('args'):
@@ -81,28 +89,283 @@ def generate_docstring(fn: Dict, style: str = "google") -> str:
     
     fn_source += ":\n    pass"
     
+    return fn_source
+
+
+def format_content(fn: Dict, content: str, style: str) -> str:
+    """
+    Format LLM content in the selected style.
+    
+    Args:
+        fn (Dict): Function metadata from parser
+        content (str): LLM-generated content
+        style (str): Docstring style (google, numpy, rest)
+        
+    Returns:
+        str: Complete formatted docstring
+    """
+    
+    if style == "google":
+        return generate_google_docstring(fn, content)
+    elif style == "numpy":
+        return generate_numpy_docstring(fn, content)
+    elif style == "rest":
+        return generate_rest_docstring(fn, content)
+    else:
+        raise ValueError(f"Unknown style: {style}")
+
+
+def fallback_docstring(fn: Dict) -> str:
+    """Simple docstring used when generation fails."""
+    summary = f"Short description of `{fn['name']}`."
+    return f'"""\n{summary}\n"""'
+
+
+def generate_docstring(fn: Dict, style: str = "google", use_cache: bool = True,
+                       backend: Optional[str] = None) -> str:
+    """
+    Generate docstring using LLM and format in selected style.
+    
+    Args:
+        fn (Dict): Function metadata from parser
+        style (str): Docstring style (google, numpy, rest)
+        use_cache (bool): Serve and store results in the generation cache
+        backend (Optional[str]): Backend name (``backends.DEFAULT_BACKEND`` if None);
+            the offline template backend is used when it is unavailable or failing
+        
+    Returns:
+        str: Complete formatted docstring (converted locally when the
+        function is already documented in another style)
+    """
+    
+    converted = convert_function(fn, style)
+    if converted is not None:
+        return format_content(fn, converted, style)
+    
+    cache = get_cache() if use_cache and not get_backend(backend).offline else None
+    if cache is not None:
+        cached = cache.get(fn, style)
+        if cached is not None:
+            return cached
+    
     try:
-        # Generate content using LLM
-        content = generate_docstring_llm(fn['name'], fn_source, style)
+        # Generate content (LLM, or template skeleton on outage)
+        content, used = generate_content(fn, style, backend)
         
         # Format according to style
-        if style == "google":
-            return generate_google_docstring(fn, content)
-        elif style == "numpy":
-            return generate_numpy_docstring(fn, content)
-        elif style == "rest":
-            return generate_rest_docstring(fn, content)
-        else:
-            raise ValueError(f"Unknown style: {style}")
+        docstring = format_content(fn, content, style)
+        if cache is not None and not used.offline:
+            cache.put(fn, style, docstring)
+        return docstring
             
     except Exception as e:
         print(f"⚠️  Error generating docstring: {e}")
         
         # Fallback: simple docstring
-        summary = f"Short description of `{fn['name']}`."
-        return f'"""\n{summary}\n"""'
+        return fallback_docstring(fn)
+
+
+def stream_docstring(fn: Dict, style: str = "google", on_text: Optional[Callable[[str], None]] = None,
+                     use_cache: bool = True, backend: Optional[str] = None) -> Tuple[str, Dict]:
+    """
+    Generate a docstring, reporting the text as it streams in.
+    
+    Args:
+        fn (Dict): Function metadata from parser
+        style (str): Docstring style (google, numpy, rest)
+        on_text (Optional[Callable[[str], None]]): Called with the text so far
+            after every streamed piece
+        use_cache (bool): Serve and store results in the generation cache
+        backend (Optional[str]): Backend name (``backends.DEFAULT_BACKEND`` if None)
+        
+    Returns:
+        Tuple[str, Dict]: Complete formatted docstring, and timing (seconds to
+        the first piece of text and in total, backend used, cache hit)
+    """
+    
+    started = time.perf_counter()
+    timing = {'first_token_seconds': None, 'total_seconds': None, 'backend': None, 'cached': False}
+    
+    converted = convert_function(fn, style)
+    if converted is not None:
+        if on_text:
+            on_text(converted)
+        elapsed = round(time.perf_counter() - started, 3)
+        timing.update(first_token_seconds=elapsed, total_seconds=elapsed, backend='converter')
+        return format_content(fn, converted, style), timing
+    
+    cache = get_cache() if use_cache and not get_backend(backend).offline else None
+    cached = cache.get(fn, style) if cache is not None else None
+    if cached is not None:
+        elapsed = round(time.perf_counter() - started, 3)
+        timing.update(first_token_seconds=elapsed, total_seconds=elapsed, backend=get_backend(backend).name, cached=True)
+        return cached, timing
+    
+    pieces = []
+    
+    def on_chunk(piece: str):
+        if timing['first_token_seconds'] is None:
+            timing['first_token_seconds'] = round(time.perf_counter() - started, 3)
+        pieces.append(piece)
+        if on_text:
+            on_text("".join(pieces))
+    
+    try:
+        content, used = generate_content(fn, style, backend, on_chunk)
+        docstring = format_content(fn, content, style)
+        if cache is not None and not used.offline:
+            cache.put(fn, style, docstring)
+        timing['backend'] = used.name
+    except Exception as e:
+        print(f"⚠️  Error generating docstring: {e}")
+        docstring = fallback_docstring(fn)
+    
+    timing['total_seconds'] = round(time.perf_counter() - started, 3)
+    return docstring, timing
 
 
+def duplicate_key(fn: Dict) -> Tuple:
+    """
+    Grouping key of functions that get the same docstring.
+    
+    Args:
+        fn (Dict): Function metadata from parser
+        
+    Returns:
+        Tuple: Normalized source hash plus the signature (kind, params,
+        annotations, return type)
+    """
+    
+    annotations = tuple((a['name'], a.get('annotation')) for a in fn.get('args', []))
+    return (function_key(fn), fn.get('kind'), tuple(fn.get('params') or []), annotations, fn.get('returns'))
+
+
+def group_duplicates(fns: List[Dict]) -> List[List[int]]:
+    """
+    Group identical functions (e.g. a helper copied into several modules).
+    
+    Args:
+        fns (List[Dict]): Function metadata from parser
+        
+    Returns:
+        List[List[int]]: Indexes into ``fns`` per group, in first-seen
+        order; the first index of each group is its representative
+    """
+    
+    groups = {}
+    for i, fn in enumerate(fns):
+        groups.setdefault(duplicate_key(fn), []).append(i)
+    return list(groups.values())
+
+
+def generate_docstrings(fns: List[Dict], style: str = "google", use_cache: bool = True,
+                        backend: Optional[str] = None, dedupe: bool = True) -> Tuple[List[str], Dict]:
+    """
+    Generate docstrings for several functions in batched LLM requests.
+    
+    Args:
+        fns (List[Dict]): Function metadata from parser
+        style (str): Docstring style (google, numpy, rest)
+        use_cache (bool): Serve and store results in the generation cache
+        backend (Optional[str]): Backend name (``backends.DEFAULT_BACKEND`` if None)
+        dedupe (bool): Generate once per group of duplicate functions and
+            share the result (False reviews every copy on its own)
+        
+    Returns:
+        Tuple[List[str], Dict]: Formatted docstrings (in input order) and
+        batching stats (local style conversions, cache hits, requests,
+        requests saved, duplicate calls avoided, template fallbacks,
+        seconds per docstring)
+    """
+    
+    if style not in ("google", "numpy", "rest"):
+        raise ValueError(f"Unknown style: {style}")
+    
+    primary = get_backend(backend)
+    template = get_backend(FALLBACK_BACKEND)
+    cache = get_cache() if use_cache and not primary.offline else None
+    
+    # Documented in another style: convert locally, no request
+    docstrings = [None] * len(fns)
+    for i, fn in enumerate(fns):
+        converted = convert_function(fn, style)
+        if converted is not None:
+            docstrings[i] = format_content(fn, converted, style)
+    converted_count = sum(doc is not None for doc in docstrings)
+    
+    if cache is not None:
+        docstrings = [doc if doc is not None else cache.get(fn, style) for fn, doc in zip(fns, docstrings)]
+    missing = [i for i, doc in enumerate(docstrings) if doc is None]
+    cache_hits = len(fns) - len(missing) - converted_count
+    
+    # One representative per group of duplicates; copies share its result
+    if dedupe:
+        groups = [[missing[k] for k in group] for group in group_duplicates([fns[i] for i in missing])]
+    else:
+        groups = [[i] for i in missing]
+    missing = [group[0] for group in groups]
+    
+    stats = {'functions': len(fns), 'converted': converted_count, 'cache_hits': cache_hits, 'requests': 0,
+             'requests_saved': 0, 'backend': primary.name, 'template_fallbacks': 0,
+             'duplicate_groups': sum(len(group) > 1 for group in groups),
+             'calls_avoided': sum(len(group) - 1 for group in groups)}
+    
+    def use_template(indexes: List[int]):
+        for i in indexes:
+            docstrings[i] = format_content(fns[i], template.generate(fns[i], style), style)
+        stats['template_fallbacks'] += len(indexes)
+    
+    def fan_out():
+        for group in groups:
+            for i in group[1:]:
+                docstrings[i] = docstrings[group[0]]
+        return docstrings, stats
+    
+    if not missing:
+        return docstrings, stats
+    
+    if primary.offline:
+        for i in missing:
+            docstrings[i] = format_content(fns[i], primary.generate(fns[i], style), style)
+        return fan_out()
+    
+    if primary.name != "groq":
+        # Only the GROQ backend has a batched prompt
+        for i in missing:
+            docstrings[i] = generate_docstring(fns[i], style, False, primary.name)
+        return fan_out()
+    
+    # No API key: skeletons without waiting on a request
+    if not primary.available():
+        use_template(missing)
+        return fan_out()
+    
+    # The breaker is asked before every request, so an outage stops the run
+    # after a few failures; short-circuited functions get skeletons
+    try:
+        batch = generate_docstrings_batch(
+            [(fns[i]['name'], build_function_source(fns[i])) for i in missing], style,
+            breaker=get_breaker(primary.name)
+        )
+    except Exception as e:
+        print(f"⚠️  Error generating docstrings: {e}")
+        use_template(missing)
+        stats['error'] = str(e)
+        return fan_out()
+    
+    failed = []
+    for i, content in zip(missing, batch['docstrings']):
+        if content:
+            docstrings[i] = format_content(fns[i], content, style)
+            if cache is not None:
+                cache.put(fns[i], style, docstrings[i])
+        else:
+            failed.append(i)
+    use_template(failed)
+    
+    stats.update(batch['stats'], functions=len(fns), cache_hits=cache_hits)
+    return fan_out()
+
 if __name__ == '__main__':
     # Test
     test_fn = {
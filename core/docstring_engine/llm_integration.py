@@ -1,17 +1,97 @@
 """
 LLM Integration for Docstring Content Generation
 Uses GROQ API
+
+Functions can be documented one call at a time (generate_docstring_llm,
+optionally streamed as the model writes: stream_docstring_llm) or packed
+several to a request, up to a token budget (generate_docstrings_batch).
+Batched answers come back between per-function markers; entries that are
+missing or unparsable are retried as single calls. Every prompt's size is
+recorded in ``prompt_builder.stats``, and every call's latency, tokens
+and status in ``llm_metrics.registry``.
 """
 
-import os
+import re
+import time
 import json
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
-from groq import Groq
+from groq import APIConnectionError, APIStatusError, Groq
+
+from core.docstring_engine.client_pool import get_client
+from core.docstring_engine.llm_metrics import track
+from core.docstring_engine.prompt_builder import estimate_tokens, reported_prompt_tokens, stats as prompt_stats
 
 load_dotenv()
 
+MODEL = "llama-3.1-8b-instant"
+
+# Bump when the prompts change (part of generation cache keys)
+PROMPT_VERSION = "2"
+
+STYLE_MAP = {
+    "google": "Google style",
+    "numpy": "NumPy style",
+    "rest": "reStructuredText (reST) style"
+}
+
+# Prompt tokens per batched request (function sources plus instructions)
+BATCH_TOKEN_BUDGET = 3000
+
+# Functions per batched request, whatever their size
+MAX_BATCH_SIZE = 12
+
+_RULES = """STRICT RULES:
+- Start summary with an IMPERATIVE VERB (Add, Calculate, Return, Validate)
+- DO NOT use words like "Process"
+- End summary with a period
+- Include Args, Returns only if applicable
+- Do NOT include markdown
+- Do NOT include code fences"""
+
+_ANSWER = re.compile(r'<<<DOCSTRING (\d+)>>>\n?(.*?)\n?<<<END \1>>>', re.DOTALL)
+_FENCE = re.compile(r'^```\w*\n|\n?```$')
+
 
-def generate_docstring_llm(fn_name: str, fn_source: str, style: str) -> str:
+def _client() -> Groq:
+    """Shared GROQ client (keep-alive connections, created once per process)."""
+    return get_client()
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether a failed request should be retried (and counts as an outage).
+    
+    Args:
+        error (Exception): Error raised by the client
+    
+    Returns:
+        bool: True for 429, 5xx, timeouts and connection errors
+    """
+    
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, APIConnectionError)
+
+
+def _complete(client, prompt: str, stats: Optional[Dict] = None, operation: str = "single") -> str:
+    """Run one chat completion, record the prompt size and call metrics, and return its text."""
+    with track(operation) as call:
+        response = client.chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2
+        )
+        text = response.choices[0].message.content.strip()
+        call.set_usage(prompt, text, response)
+    tokens = prompt_stats.record_request(prompt, reported_prompt_tokens(response))
+    if stats is not None:
+        stats['prompt_tokens'] += tokens
+    return text
+
+
+def generate_docstring_llm(fn_name: str, fn_source: str, style: str, client=None,
+                           on_chunk: Optional[Callable[[str], None]] = None) -> str:
     """
     Generate HIGH-QUALITY Python docstring using GROQ LLM.
     
@@ -19,48 +99,271 @@ def generate_docstring_llm(fn_name: str, fn_source: str, style: str) -> str:
         fn_name (str): Function name
         fn_source (str): Function source code
         style (str): Docstring style (google, numpy, rest)
-        
+        client: GROQ client to use (the shared pooled client if None)
+        on_chunk (Optional[Callable[[str], None]]): Streams the completion
+            and is called with each piece of text as it arrives
+    
     Returns:
         str: Generated docstring text
     """
     
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY not found in environment")
+    client = client or _client()
+    if on_chunk is None:
+        return _complete(client, build_prompt(fn_source, style))
     
-    client = Groq(api_key=api_key)
+    pieces = []
+    for piece in stream_docstring_llm(fn_name, fn_source, style, client):
+        pieces.append(piece)
+        on_chunk(piece)
+    return "".join(pieces).strip()
+
+
+def stream_docstring_llm(fn_name: str, fn_source: str, style: str, client=None) -> Iterator[str]:
+    """
+    Stream a docstring from the GROQ LLM as it is generated.
+    
+    Args:
+        fn_name (str): Function name
+        fn_source (str): Function source code
+        style (str): Docstring style (google, numpy, rest)
+        client: GROQ client to use (the shared pooled client if None)
     
-    style_map = {
-        "google": "Google style",
-        "numpy": "NumPy style",
-        "rest": "reStructuredText (reST) style"
-    }
+    Yields:
+        str: Pieces of docstring text, in order
+    """
     
-    prompt = f"""
+    client = client or _client()
+    prompt = build_prompt(fn_source, style)
+    with track("stream") as call:
+        stream = client.chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+            stream=True
+        )
+        
+        usage, pieces = None, []
+        try:
+            for chunk in stream:
+                # GROQ reports usage on the last chunk, under x_groq
+                for source in (chunk, getattr(chunk, 'x_groq', None)):
+                    if reported_prompt_tokens(source):
+                        usage = source
+                if chunk.choices and chunk.choices[0].delta.content:
+                    call.first_token()
+                    pieces.append(chunk.choices[0].delta.content)
+                    yield pieces[-1]
+        finally:
+            stream.close()
+            prompt_stats.record_request(prompt, reported_prompt_tokens(usage))
+            call.set_usage(prompt, "".join(pieces), usage)
+
+
+def build_prompt(fn_source: str, style: str) -> str:
+    """
+    Build the prompt for a single function.
+    
+    Args:
+        fn_source (str): Function source code
+        style (str): Docstring style (google, numpy, rest)
+        
+    Returns:
+        str: Prompt text
+    """
+    
+    return f"""
 You are a senior Python engineer.
 
-Generate a HIGH-QUALITY Python docstring in {style_map[style]}.
+Generate a HIGH-QUALITY Python docstring in {STYLE_MAP[style]}.
 
-STRICT RULES:
-- Start summary with an IMPERATIVE VERB (Add, Calculate, Return, Validate)
-- DO NOT use words like "Process"
-- End summary with a period
-- Include Args, Returns only if applicable
-- Do NOT include markdown
-- Do NOT include code fences
+{_RULES}
 - Return ONLY the docstring text
 
 Function source:
 {fn_source}
 """
 
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.2
+
+def build_batch_prompt(functions: List[Tuple[str, str]], style: str) -> str:
+    """
+    Build one prompt asking for the docstrings of several functions.
+    
+    Args:
+        functions (List[Tuple[str, str]]): (name, source) pairs, numbered from 1
+        style (str): Docstring style (google, numpy, rest)
+    
+    Returns:
+        str: Prompt text
+    """
+    
+    sources = "\n\n".join(
+        f"### Function {i}: {name}\n{source}"
+        for i, (name, source) in enumerate(functions, 1)
     )
     
-    return response.choices[0].message.content.strip()
+    return f"""
+You are a senior Python engineer.
+
+Generate a HIGH-QUALITY Python docstring in {STYLE_MAP[style]} for EACH function below.
+
+{_RULES}
+- Answer every function, in order, using exactly this format and nothing else:
+<<<DOCSTRING n>>>
+docstring text
+<<<END n>>>
+  where n is the function number
+
+{sources}
+"""
+
+
+def parse_batch_response(text: str, count: int) -> Dict[int, str]:
+    """
+    Pull per-function docstrings out of a batched answer.
+    
+    Args:
+        text (str): LLM response
+        count (int): Number of functions in the batch
+    
+    Returns:
+        Dict[int, str]: Docstring text per function number (1-based);
+        missing or empty entries are left out
+    """
+    
+    results = {}
+    for match in _ANSWER.finditer(text):
+        number = int(match.group(1))
+        content = _FENCE.sub('', match.group(2).strip()).strip().strip('"').strip()
+        if 1 <= number <= count and content and number not in results:
+            results[number] = content
+    return results
+
+
+def pack_batches(functions: List[Tuple[str, str]], token_budget: int = BATCH_TOKEN_BUDGET,
+                 max_size: int = MAX_BATCH_SIZE) -> List[List[int]]:
+    """
+    Group functions into batches that fit the prompt token budget.
+    
+    Args:
+        functions (List[Tuple[str, str]]): (name, source) pairs
+        token_budget (int): Prompt tokens allowed per request
+        max_size (int): Functions allowed per request
+    
+    Returns:
+        List[List[int]]: Indexes into ``functions`` per batch (a function
+        larger than the budget gets a batch of its own)
+    """
+    
+    overhead = estimate_tokens(build_batch_prompt([], "google"))
+    batches, current, used = [], [], overhead
+    
+    for index, (name, source) in enumerate(functions):
+        cost = estimate_tokens(source) + estimate_tokens(name) + 8
+        if current and (used + cost > token_budget or len(current) >= max_size):
+            batches.append(current)
+            current, used = [], overhead
+        current.append(index)
+        used += cost
+    
+    if current:
+        batches.append(current)
+    return batches
+
+
+def generate_docstrings_batch(functions: List[Tuple[str, str]], style: str,
+                              token_budget: int = BATCH_TOKEN_BUDGET,
+                              max_size: int = MAX_BATCH_SIZE, client=None, breaker=None) -> Dict:
+    """
+    Generate docstrings for many functions with as few requests as possible.
+    
+    Entries a batched answer leaves out (or garbles) are retried as single
+    calls. A batched request that fails outright (connection error, 429,
+    5xx) is not: its functions are counted as failed, so an outage or rate
+    limit is not multiplied by the batch size.
+    
+    With a circuit breaker, every request (batched or single) asks it first
+    and reports back; retryable errors count as failures. Once it opens, the
+    remaining functions are left unanswered without a request.
+    
+    Args:
+        functions (List[Tuple[str, str]]): (name, source) pairs
+        style (str): Docstring style (google, numpy, rest)
+        token_budget (int): Prompt tokens allowed per request
+        max_size (int): Functions allowed per request
+        client: GROQ client to use (the shared pooled client if None)
+        breaker: ``backends.CircuitBreaker`` guarding the backend (None: no breaker)
+    
+    Returns:
+        Dict: ``docstrings`` (text or None per function, in input order) and
+        ``stats`` with requests made, requests saved, single-call fallbacks,
+        failed functions, functions short-circuited by the breaker, prompt
+        tokens sent and seconds per docstring
+    """
+    
+    started = time.perf_counter()
+    docstrings: List[Optional[str]] = [None] * len(functions)
+    stats = {'functions': len(functions), 'batches': 0, 'requests': 0, 'fallbacks': 0, 'failed': 0,
+             'short_circuited': 0, 'prompt_tokens': 0}
+    
+    if functions:
+        client = client or _client()
+    
+    def request(prompt: str, operation: str = "single") -> Optional[str]:
+        """Send one request through the breaker; None if it is open."""
+        if breaker is not None and not breaker.allow():
+            return None
+        stats['requests'] += 1
+        try:
+            text = _complete(client, prompt, stats, operation)
+        except Exception as e:
+            # A rejected request (4xx) says nothing about an outage
+            if breaker is not None and is_retryable(e):
+                breaker.record_failure()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return text
+    
+    for batch in pack_batches(functions, token_budget, max_size):
+        stats['batches'] += 1
+        answers = {}
+        if len(batch) > 1:
+            items = [functions[i] for i in batch]
+            try:
+                text = request(build_batch_prompt(items, style), "batch")
+            except Exception as e:
+                stats['failed'] += len(batch)
+                print(f"⚠️  Batched generation failed for {len(batch)} functions: {e}")
+                continue
+            if text is None:
+                stats['short_circuited'] += len(batch)
+                continue
+            answers = parse_batch_response(text, len(items))
+        
+        for number, index in enumerate(batch, 1):
+            if number in answers:
+                docstrings[index] = answers[number]
+                continue
+            
+            # Not answered (or a batch of one): single call
+            if len(batch) > 1:
+                stats['fallbacks'] += 1
+            name, source = functions[index]
+            try:
+                docstrings[index] = request(build_prompt(source, style))
+            except Exception as e:
+                stats['failed'] += 1
+                print(f"⚠️  Error generating docstring for {name}: {e}")
+                continue
+            if docstrings[index] is None:
+                stats['short_circuited'] += 1
+    
+    seconds = time.perf_counter() - started
+    stats['requests_saved'] = len(functions) - stats['requests']
+    stats['seconds'] = round(seconds, 3)
+    stats['seconds_per_docstring'] = round(seconds / len(functions), 3) if functions else 0.0
+    
+    return {'docstrings': docstrings, 'stats': stats}
 
 
 if __name__ == '__main__':
@@ -69,6 +372,12 @@ if __name__ == '__main__':
 def add(a: int, b: int) -> int:
     return a + b
 '''
-    
+
     result = generate_docstring_llm("add", test_fn, "google")
     print(result)
+    
+    batch = generate_docstrings_batch([
+        ("add", test_fn),
+        ("neg", "def neg(x: int) -> int:\n    return -x")
+    ], "google")
+    print(json.dumps(batch, indent=2))
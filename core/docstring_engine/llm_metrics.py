@@ -0,0 +1,346 @@
+"""
+LLM Metrics - Milestone 2
+
+In-process instrumentation of every LLM call.
+
+- ``track(operation)`` wraps one call (single, batch, stream or async) and
+  records wall time, time to first token, prompt and completion tokens,
+  retries, cost and the final status
+- Histograms use fixed buckets, like Prometheus; percentiles (p50, p95,
+  p99) are interpolated from the buckets
+- ``registry.export(path)`` writes JSON (``.json``) or the Prometheus text
+  format (anything else, e.g. ``.prom`` for node_exporter's textfile
+  collector)
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.docstring_engine.prompt_builder import estimate_tokens, reported_completion_tokens, reported_prompt_tokens
+
+METRICS_FILE = "storage/llm_metrics.json"
+
+# Approximate list price of the default model, in dollars per 1K tokens
+PRICE_PER_1K_TOKENS = float(os.getenv("GROQ_PRICE_PER_1K_TOKENS", "0.0008"))
+
+_SECONDS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_TOKENS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+# Histogram name -> (buckets, help text)
+HISTOGRAMS = {
+    'llm_request_duration_seconds': (_SECONDS, "Wall time of an LLM call, retries included"),
+    'llm_time_to_first_token_seconds': (_SECONDS, "Time until the first streamed token"),
+    'llm_prompt_tokens': (_TOKENS, "Prompt tokens per call (reported by the API, else estimated)"),
+    'llm_completion_tokens': (_TOKENS, "Completion tokens per call (reported by the API, else estimated)"),
+    'llm_request_retries': ((0, 1, 2, 3, 5, 10), "Retries before the final status"),
+    'llm_request_cost_dollars': ((1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2), "Estimated cost per call"),
+}
+REQUESTS_TOTAL = 'llm_requests_total'
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Counts of observations per bucket upper bound (plus +Inf)."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Add one observation."""
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+
+        Args:
+            q (float): Quantile between 0 and 1 (0.95 for p95)
+
+        Returns:
+            Optional[float]: Estimate (the largest bound if it falls in the
+            +Inf bucket), or None without observations
+        """
+
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(upper bound, observations at or below it) pairs, ending with +Inf."""
+        pairs, total = [], 0
+        for bound, count in zip([*map(str, self.buckets), '+Inf'], self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def to_dict(self) -> Dict:
+        """Buckets, count, sum and p50/p95/p99."""
+        return {
+            'buckets': dict(self.cumulative()),
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99)
+        }
+
+
+def call_status(error: Optional[BaseException]) -> str:
+    """
+    Final status label of a call.
+
+    Args:
+        error (Optional[BaseException]): Exception that ended the call, if any
+
+    Returns:
+        str: ok, rate_limited, server_error, client_error, cancelled or error
+    """
+
+    if error is None:
+        return 'ok'
+    if isinstance(error, (GeneratorExit, KeyboardInterrupt)) or type(error).__name__ == 'CancelledError':
+        return 'cancelled'
+    status_code = getattr(error, 'status_code', None)
+    if status_code == 429:
+        return 'rate_limited'
+    if isinstance(status_code, int):
+        return 'server_error' if status_code >= 500 else 'client_error'
+    return 'error'
+
+
+class LLMCall:
+    """Measurements of one call, filled in while it runs."""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self.first_token_seconds: Optional[float] = None
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+        self.retries = 0
+        self.status = 'ok'
+
+    def first_token(self):
+        """Mark the arrival of the first token (later calls are ignored)."""
+        if self.first_token_seconds is None:
+            self.first_token_seconds = time.perf_counter() - self.started
+
+    def set_usage(self, prompt: str, text: str, response=None):
+        """
+        Token counts from a response's usage block, estimated when missing.
+
+        Args:
+            prompt (str): Prompt text sent
+            text (str): Completion text received
+            response: Completion (or last stream chunk) carrying ``usage``
+        """
+
+        self.prompt_tokens = reported_prompt_tokens(response) or estimate_tokens(prompt)
+        self.completion_tokens = reported_completion_tokens(response) or estimate_tokens(text)
+
+    @property
+    def cost(self) -> Optional[float]:
+        """Estimated dollars, once token counts are known."""
+        if self.prompt_tokens is None:
+            return None
+        return (self.prompt_tokens + (self.completion_tokens or 0)) / 1000 * PRICE_PER_1K_TOKENS
+
+
+class MetricsRegistry:
+    """Thread-safe labelled histograms and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+
+    def reset(self):
+        """Forget every observation."""
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def observe(self, name: str, value: float, **labels: str):
+        """Add an observation to a histogram from ``HISTOGRAMS``."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(HISTOGRAMS[name][0])
+            self.histograms[key].observe(value)
+
+    def increment(self, name: str, amount: float = 1, **labels: str):
+        """Add to a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def record_call(self, call: LLMCall):
+        """Record every measurement of a finished call."""
+        operation = call.operation
+        self.increment(REQUESTS_TOTAL, operation=operation, status=call.status)
+        self.observe('llm_request_duration_seconds', call.seconds, operation=operation)
+        self.observe('llm_request_retries', call.retries, operation=operation)
+        if call.first_token_seconds is not None:
+            self.observe('llm_time_to_first_token_seconds', call.first_token_seconds, operation=operation)
+        if call.prompt_tokens is not None:
+            self.observe('llm_prompt_tokens', call.prompt_tokens, operation=operation)
+            self.observe('llm_completion_tokens', call.completion_tokens or 0, operation=operation)
+            self.observe('llm_request_cost_dollars', call.cost, operation=operation)
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Headline numbers per operation.
+
+        Returns:
+            Dict[str, Dict]: Operation -> requests, errors, error_rate,
+            p50/p95 latency, p95 time to first token, tokens and cost
+        """
+
+        with self._lock:
+            counters = dict(self.counters)
+            histograms = dict(self.histograms)
+
+        operations = sorted({dict(labels)['operation'] for _, labels in counters})
+        summary = {}
+        for operation in operations:
+            statuses = {dict(labels)['status']: count for (name, labels), count in counters.items()
+                        if name == REQUESTS_TOTAL and dict(labels)['operation'] == operation}
+            requests = sum(statuses.values())
+            errors = requests - statuses.get('ok', 0)
+
+            def histogram(name: str) -> Histogram:
+                return histograms.get((name, (('operation', operation),)), Histogram(HISTOGRAMS[name][0]))
+
+            latency = histogram('llm_request_duration_seconds')
+            summary[operation] = {
+                'requests': requests,
+                'errors': errors,
+                'error_rate': round(errors / requests, 4) if requests else 0.0,
+                'statuses': statuses,
+                'p50_seconds': latency.quantile(0.5),
+                'p95_seconds': latency.quantile(0.95),
+                'p95_first_token_seconds': histogram('llm_time_to_first_token_seconds').quantile(0.95),
+                'prompt_tokens': int(histogram('llm_prompt_tokens').sum),
+                'completion_tokens': int(histogram('llm_completion_tokens').sum),
+                'retries': int(histogram('llm_request_retries').sum),
+                'cost_dollars': round(histogram('llm_request_cost_dollars').sum, 6)
+            }
+        return summary
+
+    def to_dict(self) -> Dict:
+        """Every histogram and counter, plus the per-operation summary."""
+        with self._lock:
+            histograms = [{'name': name, 'labels': dict(labels), **h.to_dict()}
+                          for (name, labels), h in sorted(self.histograms.items())]
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self.counters.items())]
+        return {'histograms': histograms, 'counters': counters, 'summary': self.summary()}
+
+    def to_prometheus(self) -> str:
+        """Everything in the Prometheus text exposition format."""
+
+        def render_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = [*labels, *extra]
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+
+        lines = []
+        if counters:
+            lines += [f"# HELP {REQUESTS_TOTAL} LLM calls by final status", f"# TYPE {REQUESTS_TOTAL} counter"]
+            lines += [f"{name}{render_labels(labels)} {value:g}" for (name, labels), value in counters]
+
+        previous = None
+        for (name, labels), histogram in histograms:
+            if name != previous:
+                lines += [f"# HELP {name} {HISTOGRAMS[name][1]}", f"# TYPE {name} histogram"]
+                previous = name
+            for bound, total in histogram.cumulative():
+                lines.append(f"{name}_bucket{render_labels(labels, (('le', bound),))} {total}")
+            lines.append(f"{name}_sum{render_labels(labels)} {histogram.sum:g}")
+            lines.append(f"{name}_count{render_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str = METRICS_FILE) -> str:
+        """
+        Write the metrics to a file.
+
+        Args:
+            path (str): ``.json`` for JSON, anything else for Prometheus text
+
+        Returns:
+            str: Path written
+        """
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith('.json'):
+                json.dump(self.to_dict(), f, indent=2)
+            else:
+                f.write(self.to_prometheus())
+        return path
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def track(operation: str) -> Iterator[LLMCall]:
+    """
+    Measure one LLM call and record it in ``registry`` when it ends.
+
+    Args:
+        operation (str): Kind of call (single, batch, stream, async)
+
+    Yields:
+        LLMCall: Measurements for the caller to fill in (tokens, first
+        token, retries); wall time and status are set here
+    """
+
+    call = LLMCall(operation)
+    try:
+        yield call
+    except BaseException as e:
+        call.status = call_status(e)
+        raise
+    finally:
+        call.seconds = time.perf_counter() - call.started
+        registry.record_call(call)
+
+
+if __name__ == '__main__':
+    import sys
+
+    # Print the summary of an exported JSON file
+    path = sys.argv[1] if len(sys.argv) > 1 else METRICS_FILE
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for operation, row in data['summary'].items():
+        print(f"📈 {operation:<7} {row['requests']:>5} calls  p50 {row['p50_seconds']}s  p95 {row['p95_seconds']}s  "
+              f"errors {row['error_rate']:.1%}  tokens {row['prompt_tokens']}+{row['completion_tokens']}  "
+              f"${row['cost_dollars']}")
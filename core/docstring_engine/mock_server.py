@@ -0,0 +1,213 @@
+"""
+Mock LLM Server - Milestone 2
+
+Local OpenAI-compatible chat completions endpoint (the path the GROQ client
+calls), for testing and benchmarking generation without the real API.
+
+- Answers every prompt with a short docstring after a fixed latency
+- Streams the answer word by word (server-sent events, like the real API)
+  when the request asks for ``stream``, with a delay between words
+- Can be scripted to fail: a list of status codes (429, 500, ...) is served
+  one per request before normal answers resume
+- Counts requests and the highest number in flight at once
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Optional
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler; state lives on the MockLLMServer instance."""
+
+    # Keep-alive, like the real API; headers and body go out as separate
+    # writes, so Nagle would add a delayed-ACK stall to every reused request
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: dict, headers: Optional[dict] = None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, model: str, words, delay: float):
+        """Send completion chunks as server-sent events, one HTTP chunk each."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        def send(payload: str):
+            data = f"data: {payload}\n\n".encode('utf-8')
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+            self.wfile.flush()
+
+        for index, word in enumerate(words):
+            if index and delay:
+                time.sleep(delay)
+            send(json.dumps(MockLLMServer.chunk(model, {'content': word})))
+        send(json.dumps(MockLLMServer.chunk(model, {}, 'stop')))
+        send('[DONE]')
+        self.wfile.write(b"0\r\n\r\n")
+
+    def do_POST(self):
+        mock = self.server.mock
+        length = int(self.headers.get('Content-Length') or 0)
+        request = json.loads(self.rfile.read(length) or b'{}')
+
+        if self.path != COMPLETIONS_PATH:
+            self._reply(404, {'error': {'message': f'Unknown path {self.path}'}})
+            return
+
+        status = mock._enter()
+        try:
+            time.sleep(mock.latency)
+            if status == 429:
+                self._reply(429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_exceeded'}},
+                            {'retry-after': str(mock.retry_after)})
+            elif status:
+                self._reply(status, {'error': {'message': f'Mock failure {status}', 'type': 'server_error'}})
+            elif request.get('stream'):
+                content = mock.completion('mock', '')['choices'][0]['message']['content']
+                self._stream(request.get('model', 'mock'), re.findall(r'\S+\s*', content), mock.token_delay)
+            else:
+                prompt = request.get('messages', [{}])[-1].get('content', '')
+                self._reply(200, mock.completion(request.get('model', 'mock'), prompt))
+        finally:
+            mock._leave()
+
+
+class MockLLMServer:
+    """Threaded mock server; use as a context manager."""
+
+    def __init__(self, latency: float = 0.05, failures: Iterable[int] = (),
+                 retry_after: float = 0, token_delay: float = 0.0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.retry_after = retry_after
+        self._failures = list(failures)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to the GROQ client."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _enter(self) -> int:
+        """Count a request and pick its scripted status (0 = answer normally)."""
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return self._failures.pop(0) if self._failures else 0
+
+    def _leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    @staticmethod
+    def completion(model: str, prompt: str) -> dict:
+        """
+        Build a chat completion answering a prompt.
+
+        Args:
+            model (str): Model name echoed back
+            prompt (str): Prompt text
+
+        Returns:
+            dict: OpenAI-format chat completion
+        """
+
+        content = "Return the result of the function.\n\nReturns:\n    Any: Result."
+        return {
+            'id': 'chatcmpl-mock',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': len(prompt) // 4 + 1,
+                'completion_tokens': len(content) // 4 + 1,
+                'total_tokens': (len(prompt) + len(content)) // 4 + 2
+            }
+        }
+
+    @staticmethod
+    def chunk(model: str, delta: dict, finish_reason: Optional[str] = None) -> dict:
+        """
+        Build one streamed completion chunk.
+
+        Args:
+            model (str): Model name echoed back
+            delta (dict): New content (``{'content': ...}``), empty at the end
+            finish_reason (Optional[str]): Set on the last chunk
+
+        Returns:
+            dict: OpenAI-format chat completion chunk
+        """
+
+        return {
+            'id': 'chatcmpl-mock',
+            'object': 'chat.completion.chunk',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+        }
+
+    def start(self) -> 'MockLLMServer':
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+if __name__ == '__main__':
+    import sys
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server = MockLLMServer(port=port)
+    print(f"🧪 Mock LLM server on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
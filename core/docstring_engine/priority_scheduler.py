@@ -0,0 +1,314 @@
+"""
+Priority Scheduler - Milestone 2
+
+Budget-aware docstring generation for the whole project.
+
+- Undocumented functions are ranked by public visibility, cyclomatic
+  complexity, call-site fan-in and git churn of their file
+- Generation follows that order until the token or cost budget runs out
+  (budgets are per day: spending resets when the date changes)
+- Functions that are free (documented in another style, or already in the
+  generation cache) are served locally and cost nothing; copies of a
+  function already scheduled in the run are free too
+- Progress is checkpointed to JSON after every batch, so the next run
+  continues where the last one stopped; a function whose code changed is
+  scheduled again
+"""
+
+import datetime
+import json
+import os
+from typing import Callable, Dict, List, Optional
+
+from core.docstring_engine.async_engine import COMPLETION_TOKENS, generate_concurrently
+from core.docstring_engine.backends import get_backend
+from core.docstring_engine.generation_cache import GenerationCache, get_cache
+from core.docstring_engine.generator import build_function_source, duplicate_key, format_content
+from core.docstring_engine.llm_integration import build_prompt
+from core.docstring_engine.llm_metrics import PRICE_PER_1K_TOKENS
+from core.docstring_engine.prompt_builder import estimate_tokens
+from core.docstring_engine.style_converter import convert_function
+from core.metrics.churn import collect_churn, repo_root
+from core.metrics.code_metrics import get_function_complexity
+from core.metrics.import_graph import function_fan_in
+
+CHECKPOINT_FILE = "storage/generation_checkpoint.json"
+
+# Bump when the shape of the checkpoint changes
+CHECKPOINT_FORMAT = 1
+
+# Public functions count this many times more than private ones
+PUBLIC_WEIGHT = 3
+
+# Functions generated between checkpoints
+BATCH_SIZE = 8
+
+
+def function_id(file_path: str, fn: Dict) -> str:
+    """
+    Checkpoint key of a function (changes when its code changes).
+
+    Args:
+        file_path (str): File containing the function
+        fn (Dict): Function metadata from parser
+
+    Returns:
+        str: ``path::name::source hash``
+    """
+
+    return f"{file_path}::{fn['name']}::{fn.get('source_hash', '')}"
+
+
+def rank_functions(parsed_files: List[Dict], repo_path: str = ".",
+                   churn: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+    """
+    Rank undocumented functions by how much a docstring is worth.
+
+    Priority is ``(1 + fan-in) x complexity x (1 + commits)``, multiplied
+    by ``PUBLIC_WEIGHT`` for public functions.
+
+    Args:
+        parsed_files (List[Dict]): Output of ``parse_path``
+        repo_path (str): Path inside the git repository (for churn)
+        churn (Optional[Dict[str, Dict]]): Output of ``collect_churn``
+            (read from git if None)
+
+    Returns:
+        List[Dict]: Functions sorted by priority (highest first), with
+        file_path, fn, is_public, complexity, fan_in, commits and priority
+    """
+
+    if churn is None:
+        churn = collect_churn(repo_path)
+    root = repo_root(repo_path)
+    fan_in = function_fan_in(parsed_files)
+
+    ranking = []
+    for file_data in parsed_files:
+        rel = os.path.relpath(os.path.abspath(file_data['file_path']), root).replace(os.sep, '/')
+        commits = churn.get(rel, {}).get('commits', 0)
+
+        for fn in file_data.get('functions', []):
+            if fn.get('has_docstring'):
+                continue
+            fn_complexity = get_function_complexity(fn)
+            calls = fan_in.get(fn['name'], 0)
+            public = fn.get('is_public', not fn['name'].startswith('_'))
+            ranking.append({
+                'file_path': file_data['file_path'],
+                'fn': fn,
+                'is_public': public,
+                'complexity': fn_complexity,
+                'fan_in': calls,
+                'commits': commits,
+                'priority': (1 + calls) * fn_complexity * (1 + commits) * (PUBLIC_WEIGHT if public else 1)
+            })
+
+    ranking.sort(key=lambda r: (-r['priority'], r['file_path'], r['fn']['start_line']))
+    return ranking
+
+
+def estimate_request_tokens(fn: Dict, style: str) -> int:
+    """
+    Tokens one generation request for a function is expected to use.
+
+    Args:
+        fn (Dict): Function metadata from parser
+        style (str): Docstring style (google, numpy, rest)
+
+    Returns:
+        int: Estimated prompt plus completion tokens
+    """
+
+    return estimate_tokens(build_prompt(build_function_source(fn), style)) + COMPLETION_TOKENS
+
+
+class Checkpoint:
+    """Functions already generated (per style) and today's spending, persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = CHECKPOINT_FILE, style: str = "google"):
+        self.path = path
+        self.style = style
+        self.day = datetime.date.today().isoformat()
+        self.done_by_style: Dict[str, Dict[str, str]] = {}
+        self.tokens_spent = 0
+        self.runs = 0
+        self._load()
+        self.done = self.done_by_style.setdefault(style, {})
+
+    def _load(self):
+        """Read the checkpoint, dropping an unreadable or outdated one."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable generation checkpoint: {e}")
+            return
+        if data.get('format') != CHECKPOINT_FORMAT:
+            return
+
+        self.done_by_style = data.get('done', {})
+        self.runs = data.get('runs', 0)
+        if data.get('day') == self.day:
+            self.tokens_spent = data.get('tokens_spent', 0)
+
+    def save(self):
+        """Write the checkpoint to disk."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'format': CHECKPOINT_FORMAT,
+                'day': self.day,
+                'tokens_spent': self.tokens_spent,
+                'runs': self.runs,
+                'done': self.done_by_style
+            }, f)
+
+
+def run_budgeted(parsed_files: List[Dict], style: str = "google", token_budget: Optional[int] = None,
+                 cost_budget: Optional[float] = None, price_per_1k: float = PRICE_PER_1K_TOKENS,
+                 repo_path: str = ".", checkpoint_path: Optional[str] = CHECKPOINT_FILE,
+                 cache: Optional[GenerationCache] = None, churn: Optional[Dict[str, Dict]] = None,
+                 batch_size: int = BATCH_SIZE, progress: Optional[Callable[[int, int], None]] = None,
+                 **options) -> Dict:
+    """
+    Generate docstrings in priority order until the daily budget runs out.
+
+    Each request's estimated tokens are held against the budget while its
+    batch runs, then replaced by the usage the responses report.
+
+    Args:
+        parsed_files (List[Dict]): Output of ``parse_path``
+        style (str): Docstring style (google, numpy, rest)
+        token_budget (Optional[int]): Tokens allowed per day (None: no limit)
+        cost_budget (Optional[float]): Dollars allowed per day (None: no limit)
+        price_per_1k (float): Dollars per 1K tokens, to turn costs into tokens
+        repo_path (str): Path inside the git repository (for churn)
+        checkpoint_path (Optional[str]): JSON checkpoint, or None to disable
+        cache (Optional[GenerationCache]): Generation cache (the shared one if None)
+        churn (Optional[Dict[str, Dict]]): Output of ``collect_churn`` (read from git if None)
+        batch_size (int): Functions generated between checkpoints
+        progress (Optional[Callable[[int, int], None]]): Called with
+            (functions finished, functions ranked) after each batch
+        **options: AsyncGenerationEngine settings (concurrency, rpm, base_url, ...)
+
+    Returns:
+        Dict: ``docstrings`` ((file path, name) -> formatted docstring,
+        including ones checkpointed by earlier runs) and ``stats`` (ranked, already done, generated, free,
+        remaining, tokens and cost spent today, and why the run stopped:
+        complete, budget or backend unavailable)
+    """
+
+    limits = [token_budget] if token_budget is not None else []
+    if cost_budget is not None:
+        limits.append(int(cost_budget / price_per_1k * 1000))
+    budget = min(limits) if limits else None
+
+    cache = cache if cache is not None else get_cache()
+    checkpoint = Checkpoint(checkpoint_path, style)
+    checkpoint.runs += 1
+    ranking = rank_functions(parsed_files, repo_path, churn)
+
+    docstrings = {}
+    stats = {'ranked': len(ranking), 'already_done': 0, 'generated': 0, 'free': 0, 'failed': 0,
+             'remaining': 0, 'stopped': 'complete'}
+    scheduled = set()
+    batch: List[Dict] = []
+    # Estimated tokens of the pending batch, held against the budget until
+    # the batch reports what it actually used
+    reserved = 0
+
+    def flush() -> bool:
+        """Generate the pending batch and checkpoint it; False if the backend gave up."""
+        nonlocal reserved
+        if not batch:
+            return True
+        result = generate_concurrently([entry['fn'] for entry in batch], style, cache=cache, **options)
+        # Failed and short-circuited requests cost nothing
+        checkpoint.tokens_spent += result['stats'].get('tokens_used', 0) - reserved
+        reserved = 0
+        for index, (entry, docstring) in enumerate(zip(batch, result['docstrings'])):
+            if index in result['errors']:
+                stats['failed'] += 1
+                continue
+            docstrings[(entry['file_path'], entry['fn']['name'])] = docstring
+            checkpoint.done[function_id(entry['file_path'], entry['fn'])] = docstring
+            stats['generated'] += 1
+        batch.clear()
+        checkpoint.save()
+        if progress:
+            progress(stats['already_done'] + stats['free'] + stats['generated'] + stats['failed'], len(ranking))
+        return not result['stats']['short_circuited']
+
+    if not get_backend("groq").available() and not options.get('api_key'):
+        stats['stopped'] = 'backend unavailable'
+
+    for position, entry in enumerate(ranking):
+        if stats['stopped'] != 'complete':
+            stats['remaining'] = len(ranking) - position
+            break
+
+        fn, key = entry['fn'], function_id(entry['file_path'], entry['fn'])
+        if key in checkpoint.done:
+            docstrings[(entry['file_path'], fn['name'])] = checkpoint.done[key]
+            stats['already_done'] += 1
+            continue
+
+        # Free: local conversion or a cached docstring
+        converted = convert_function(fn, style)
+        docstring = format_content(fn, converted, style) if converted is not None else cache.get(fn, style)
+        if docstring is not None:
+            docstrings[(entry['file_path'], fn['name'])] = checkpoint.done[key] = docstring
+            stats['free'] += 1
+            continue
+
+        # Copies of a scheduled function share its request
+        cost = 0 if duplicate_key(fn) in scheduled else estimate_request_tokens(fn, style)
+        if budget is not None and checkpoint.tokens_spent + cost > budget:
+            stats['stopped'] = 'budget'
+            stats['remaining'] = len(ranking) - position
+            break
+
+        scheduled.add(duplicate_key(fn))
+        checkpoint.tokens_spent += cost
+        reserved += cost
+        batch.append(entry)
+        if len(batch) >= batch_size and not flush():
+            stats['stopped'] = 'backend unavailable'
+
+    if not flush():
+        stats['stopped'] = 'backend unavailable'
+    checkpoint.save()
+
+    stats['tokens_spent'] = checkpoint.tokens_spent
+    stats['cost_spent'] = round(checkpoint.tokens_spent / 1000 * price_per_1k, 4)
+    stats['budget_tokens'] = budget
+    stats['runs'] = checkpoint.runs
+    return {'docstrings': docstrings, 'stats': stats}
+
+
+if __name__ == '__main__':
+    import sys
+    from core.parser.python_parser import parse_path
+
+    args = sys.argv[1:]
+    target = next((a for a in args if not a.startswith('--')), '.')
+    tokens = next((int(a.split('=', 1)[1]) for a in args if a.startswith('--tokens=')), None)
+    dollars = next((float(a.split('=', 1)[1]) for a in args if a.startswith('--cost=')), None)
+    parsed = parse_path(target)
+
+    if '--rank' in args:
+        for row in rank_functions(parsed, target if os.path.isdir(target) else '.')[:20]:
+            print(f"   {row['priority']:>8}  {row['fn']['name']:<35} complexity {row['complexity']:>3}  "
+                  f"fan-in {row['fan_in']:>3}  commits {row['commits']:>3}  {os.path.basename(row['file_path'])}")
+    else:
+        result = run_budgeted(parsed, token_budget=tokens, cost_budget=dollars,
+                              repo_path=target if os.path.isdir(target) else '.')
+        stats = result['stats']
+        print(f"\n🎯 {stats['generated']} generated, {stats['free']} free, {stats['already_done']} done earlier, "
+              f"{stats['remaining']} remaining ({stats['stopped']}); "
+              f"{stats['tokens_spent']} tokens (${stats['cost_spent']}) spent today")
@@ -0,0 +1,408 @@
+"""
+Prompt Builder - Milestone 2
+
+Function source sent to the LLM, fitted to a token budget.
+
+The parser keeps each function's real source (``fn['source']``, docstring
+removed). Sources that fit the budget are sent unchanged; longer ones are
+trimmed in stages until they fit, losing as little as possible:
+
+1. Long literals: big strings become ``'...'`` and long constant
+   lists/dicts/sets keep their first items
+2. Repeated blocks: runs of same-shaped statements keep the first one
+3. Outline: the signature, every return/raise/yield and the statements
+   leading to them; everything else becomes ``...``
+4. Truncation of what is left
+
+Every request's prompt size is recorded in ``stats``.
+"""
+
+import ast
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# Body tokens allowed per function
+FUNCTION_TOKEN_BUDGET = 400
+
+# Literals longer than this (characters / items) are elided
+LITERAL_CHARS = 60
+LITERAL_ITEMS = 6
+
+# Same-shaped statements in a row before a run is collapsed
+REPEAT_RUN = 3
+
+_EXITS = (ast.Return, ast.Raise, ast.Yield, ast.YieldFrom)
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+class PromptStats:
+    """Thread-safe prompt size counters."""
+
+    def __init__(self, recent: int = 1000):
+        self._lock = threading.Lock()
+        self.recent = deque(maxlen=recent)
+        self.reset()
+
+    def reset(self):
+        """Zero every counter."""
+        with self._lock:
+            self.requests = 0
+            self.prompt_tokens = 0
+            self.max_prompt_tokens = 0
+            self.reported_requests = 0
+            self.reported_tokens = 0
+            self.functions_trimmed = 0
+            self.tokens_trimmed = 0
+            self.recent.clear()
+
+    def record_request(self, prompt: str, reported: Optional[int] = None) -> int:
+        """
+        Record the size of one prompt sent to the LLM.
+
+        Args:
+            prompt (str): Prompt text
+            reported (Optional[int]): Prompt tokens reported by the API, if any
+
+        Returns:
+            int: Estimated prompt tokens
+        """
+
+        tokens = estimate_tokens(prompt)
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += tokens
+            self.max_prompt_tokens = max(self.max_prompt_tokens, tokens)
+            if reported:
+                self.reported_requests += 1
+                self.reported_tokens += reported
+            self.recent.append((tokens, reported))
+        return tokens
+
+    def record_trim(self, before: int, after: int):
+        """Record one function source trimmed from ``before`` to ``after`` tokens."""
+        with self._lock:
+            self.functions_trimmed += 1
+            self.tokens_trimmed += before - after
+
+    def to_dict(self) -> Dict:
+        """
+        Snapshot of the counters.
+
+        Returns:
+            Dict: Requests, estimated prompt tokens (total, mean, max),
+            API-reported tokens, and functions and tokens trimmed
+        """
+
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'prompt_tokens': self.prompt_tokens,
+                'mean_prompt_tokens': round(self.prompt_tokens / self.requests, 1) if self.requests else 0.0,
+                'max_prompt_tokens': self.max_prompt_tokens,
+                'reported_prompt_tokens': self.reported_tokens,
+                'reported_requests': self.reported_requests,
+                'functions_trimmed': self.functions_trimmed,
+                'tokens_trimmed': self.tokens_trimmed
+            }
+
+
+stats = PromptStats()
+
+
+def reported_prompt_tokens(response) -> Optional[int]:
+    """Prompt tokens from a chat completion's usage block, if present."""
+    usage = getattr(response, 'usage', None)
+    return getattr(usage, 'prompt_tokens', None)
+
+
+def reported_completion_tokens(response) -> Optional[int]:
+    """Completion tokens from a chat completion's usage block, if present."""
+    usage = getattr(response, 'usage', None)
+    return getattr(usage, 'completion_tokens', None)
+
+
+def _offset(line: str, byte_offset: int) -> int:
+    """Character offset of an AST UTF-8 byte offset."""
+    if line.isascii():
+        return byte_offset
+    return len(line.encode('utf-8')[:byte_offset].decode('utf-8', errors='ignore'))
+
+
+def _replace_spans(lines: List[str], spans: List[Tuple[int, int, int, int, str]]) -> List[str]:
+    """Replace (line, col, end_line, end_col, text) spans; 1-based lines, byte columns."""
+    lines = list(lines)
+    for lineno, col, end_lineno, end_col, text in sorted(spans, reverse=True):
+        head = lines[lineno - 1][:_offset(lines[lineno - 1], col)]
+        tail = lines[end_lineno - 1][_offset(lines[end_lineno - 1], end_col):]
+        lines[lineno - 1:end_lineno] = [head + text + tail]
+    return lines
+
+
+def elide_literals(source: str, tree: ast.AST) -> str:
+    """
+    Shorten long string constants and long constant collections.
+
+    Args:
+        source (str): Function source
+        tree (ast.AST): Parsed ``source``
+
+    Returns:
+        str: Source with ``'...'`` in place of long literals
+    """
+
+    lines = source.split('\n')
+    spans = []
+    covered = []
+    # f-string parts share the position of the whole f-string before 3.12
+    formatted = {id(v) for n in ast.walk(tree) if isinstance(n, ast.JoinedStr) for v in n.values}
+
+    def inside(node) -> bool:
+        return any(s[:2] <= (node.lineno, node.col_offset) and (node.end_lineno, node.end_col_offset) <= s[2:4]
+                   for s in covered)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (str, bytes)):
+            if len(node.value) > LITERAL_CHARS and id(node) not in formatted and not inside(node):
+                spans.append((node.lineno, node.col_offset, node.end_lineno, node.end_col_offset,
+                              "b'...'" if isinstance(node.value, bytes) else "'...'"))
+                covered.append(spans[-1])
+        elif isinstance(node, (ast.List, ast.Tuple, ast.Set, ast.Dict)) and not inside(node):
+            items = node.keys if isinstance(node, ast.Dict) else node.elts
+            if len(items) <= LITERAL_ITEMS or not all(isinstance(i, ast.Constant) for i in items):
+                continue
+            keep = LITERAL_ITEMS // 2
+            if isinstance(node, ast.Dict):
+                shown = ', '.join(f"{ast.unparse(k)}: {ast.unparse(v)}"
+                                  for k, v in zip(node.keys[:keep], node.values[:keep]))
+                text = f"{{{shown}, ...}}"
+            else:
+                shown = ', '.join(ast.unparse(e) for e in node.elts[:keep])
+                text = {ast.List: '[{}, ...]', ast.Tuple: '({}, ...)', ast.Set: '{{{}, ...}}'}[type(node)].format(shown)
+            spans.append((node.lineno, node.col_offset, node.end_lineno, node.end_col_offset, text))
+            covered.append(spans[-1])
+
+    return '\n'.join(_replace_spans(lines, spans)) if spans else source
+
+
+def _shape(node: ast.AST) -> Tuple:
+    """Node types of a statement, ignoring names and values."""
+    return tuple(type(n).__name__ for n in ast.walk(node))
+
+
+def _blocks(tree: ast.AST):
+    """Every statement list in the tree."""
+    for node in ast.walk(tree):
+        for field in ('body', 'orelse', 'finalbody'):
+            block = getattr(node, field, None)
+            if isinstance(block, list) and block and isinstance(block[0], ast.stmt):
+                yield block
+        for handler in getattr(node, 'handlers', []):
+            yield handler.body
+
+
+def collapse_repeats(source: str, tree: ast.AST) -> str:
+    """
+    Keep the first statement of each run of same-shaped statements.
+
+    Args:
+        source (str): Function source
+        tree (ast.AST): Parsed ``source``
+
+    Returns:
+        str: Source with repeated runs replaced by a comment
+    """
+
+    lines = source.split('\n')
+    drops = []
+    for block in _blocks(tree):
+        start = 0
+        while start < len(block):
+            end = start + 1
+            while end < len(block) and _shape(block[end]) == _shape(block[start]):
+                end += 1
+            # Statements sharing a line cannot be dropped line by line
+            if end - start >= REPEAT_RUN and block[start + 1].lineno > block[start].end_lineno:
+                drops.append((block[start + 1].lineno, block[end - 1].end_lineno,
+                              block[start].col_offset, end - start - 1))
+            start = end
+
+    # Runs inside a dropped run go with it
+    outer = []
+    for drop in sorted(drops):
+        if not outer or drop[0] > outer[-1][1]:
+            outer.append(drop)
+
+    for first, last, indent, count in reversed(outer):
+        lines[first - 1:last] = [' ' * indent + f'# ... {count} similar statements']
+    return '\n'.join(lines)
+
+
+def _children(stmt: ast.stmt, lines: List[str]) -> List[Tuple[List[ast.stmt], range]]:
+    """
+    Statement lists inside a compound statement, with their header lines.
+
+    Args:
+        stmt (ast.stmt): Statement
+        lines (List[str]): Source split on newlines
+
+    Returns:
+        List[Tuple[List[ast.stmt], range]]: (block, 1-based header lines);
+        empty for simple statements
+    """
+
+    clauses = [(stmt.body, range(stmt.lineno, stmt.body[0].lineno))] if _is_block(getattr(stmt, 'body', None)) else []
+    for handler in getattr(stmt, 'handlers', []):
+        clauses.append((handler.body, range(handler.lineno, handler.body[0].lineno)))
+    for field, keyword in (('orelse', 'else'), ('finalbody', 'finally')):
+        block = getattr(stmt, field, None)
+        if not _is_block(block):
+            continue
+        # An elif is an If node of its own and keeps its header itself
+        if field == 'orelse' and isinstance(block[0], ast.If) and lines[block[0].lineno - 1].strip().startswith('elif'):
+            clauses.append((block, range(0)))
+            continue
+        header = next((n for n in range(block[0].lineno - 1, stmt.lineno, -1)
+                       if lines[n - 1].strip().startswith(keyword)), None)
+        clauses.append((block, range(header, header + 1) if header else range(0)))
+    return clauses
+
+
+def _is_block(block) -> bool:
+    return isinstance(block, list) and bool(block) and isinstance(block[0], ast.stmt)
+
+
+def outline(source: str, tree: ast.AST, budget: Optional[int] = None) -> str:
+    """
+    Keep the signature, exits (return/raise/yield) and the statements enclosing them.
+
+    With a budget, other statements are then added back, outermost first and
+    in source order, while the result still fits.
+
+    Args:
+        source (str): Function source
+        tree (ast.AST): Parsed ``source``
+        budget (Optional[int]): Tokens allowed
+
+    Returns:
+        str: Source with every other statement run replaced by ``...``
+    """
+
+    lines = source.split('\n')
+    fn = tree.body[0]
+    keep = set(range(1, fn.body[0].lineno))
+    candidates = []
+
+    def visit(block: List[ast.stmt], depth: int, parent: range) -> bool:
+        found = False
+        for stmt in block:
+            clauses = [] if isinstance(stmt, _SCOPES) else _children(stmt, lines)
+            if not clauses:
+                span = range(stmt.lineno, stmt.end_lineno + 1)
+                candidates.append((depth, stmt.lineno, span, parent))
+                if not isinstance(stmt, _SCOPES) and any(isinstance(n, _EXITS) for n in ast.walk(stmt)):
+                    keep.update(span)
+                    found = True
+                continue
+
+            hit = False
+            opening = range(stmt.lineno, stmt.body[0].lineno)
+            for child, header in clauses:
+                candidates.append((depth, header.start, header, parent if header == opening else opening))
+                if visit(child, depth + 1, header or opening):
+                    keep.update(header)
+                    hit = True
+            if hit:
+                keep.update(opening)
+                found = True
+        return found
+
+    visit(fn.body, 0, range(0))
+
+    if budget is not None:
+        # Characters, with room for the ``...`` markers
+        room = budget * 4 * 0.9 - sum(len(lines[n - 1]) + 1 for n in keep)
+        for _, _, span, parent in sorted(candidates, key=lambda c: c[:2]):
+            # Never show a statement without the header it sits under
+            if not keep.issuperset(parent):
+                continue
+            added = [n for n in span if n not in keep]
+            cost = sum(len(lines[n - 1]) + 1 for n in added)
+            if cost <= room:
+                keep.update(added)
+                room -= cost
+
+    out = []
+    for number, line in enumerate(lines, 1):
+        if number in keep:
+            out.append(line)
+        elif line.strip() and (not out or out[-1].strip() != '...'):
+            out.append(line[:len(line) - len(line.lstrip())] + '...')
+    return '\n'.join(out)
+
+
+def truncate(source: str, budget: int) -> str:
+    """Keep whole lines while they fit the budget."""
+    out, used = [], 0
+    for line in source.split('\n'):
+        cost = estimate_tokens(line + '\n')
+        if out and used + cost > budget:
+            out.append(line[:len(line) - len(line.lstrip())] + '...  # truncated')
+            break
+        out.append(line)
+        used += cost
+    return '\n'.join(out)
+
+
+def fit_source(source: str, budget: int = FUNCTION_TOKEN_BUDGET) -> str:
+    """
+    Trim function source to a token budget.
+
+    Args:
+        source (str): Function source (``fn['source']`` from the parser)
+        budget (int): Tokens allowed
+
+    Returns:
+        str: ``source`` unchanged if it fits, otherwise the first trimming
+        stage result that does (see module docstring)
+    """
+
+    before = estimate_tokens(source)
+    if before <= budget:
+        return source
+
+    trimmed = source
+    try:
+        for stage in (elide_literals, collapse_repeats):
+            trimmed = stage(trimmed, ast.parse(trimmed))
+            if estimate_tokens(trimmed) <= budget:
+                break
+        else:
+            trimmed = outline(trimmed, ast.parse(trimmed), budget)
+    except (SyntaxError, AttributeError, IndexError, ValueError):
+        pass
+    if estimate_tokens(trimmed) > budget:
+        trimmed = truncate(trimmed, budget)
+
+    stats.record_trim(before, estimate_tokens(trimmed))
+    return trimmed
+
+
+if __name__ == '__main__':
+    import sys
+    from core.parser.python_parser import parse_path
+
+    budget = int(sys.argv[2]) if len(sys.argv) > 2 else FUNCTION_TOKEN_BUDGET
+    for file_data in parse_path(sys.argv[1] if len(sys.argv) > 1 else '.'):
+        for fn in file_data['functions']:
+            size = estimate_tokens(fn['source'])
+            if size > budget:
+                fitted = fit_source(fn['source'], budget)
+                print(f"✂️  {file_data['file_path']}:{fn['def_line']} {fn['name']}: "
+                      f"{size} -> {estimate_tokens(fitted)} tokens")
+    print(f"\n📏 {stats.to_dict()}")
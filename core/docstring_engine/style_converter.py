@@ -0,0 +1,404 @@
+"""
+Docstring Style Converter - Milestone 2
+
+Converts existing docstrings between Google, NumPy and reST locally, so a
+documented function is never sent back to the LLM only because another
+style was selected.
+
+- ``parse_docstring`` reads summary, description, params (name, type,
+  description), returns/yields, raises and any other sections (Examples,
+  Notes, ...) from any of the three styles
+- ``render`` writes that structure in a target style through
+  ``formatter.format_docstring``
+- ``convert_project`` converts every eligible function of a scan
+"""
+
+import re
+import time
+from typing import Dict, List, Optional
+
+from core.docstring_engine.formatter import format_docstring
+from core.parser.docstring_parser import classify_style, parse_sections
+
+STYLES = ("google", "numpy", "rest")
+
+# Section title -> kind of entries it holds
+_KINDS = {
+    'args': 'params', 'arguments': 'params', 'parameters': 'params', 'params': 'params',
+    'keyword args': 'params', 'keyword arguments': 'params', 'other parameters': 'params',
+    'return': 'returns', 'returns': 'returns', 'yield': 'yields', 'yields': 'yields',
+    'raise': 'raises', 'raises': 'raises', 'exception': 'raises', 'exceptions': 'raises',
+}
+
+# Google titles kept as free-form sections (anything else ending in ':' is text)
+_OTHER_TITLES = {
+    'attributes', 'example', 'examples', 'note', 'notes', 'references', 'see also',
+    'todo', 'warning', 'warnings', 'warns', 'methods',
+}
+
+_GOOGLE_HEADER = re.compile(r'^([A-Za-z][A-Za-z ]*):\s*$')
+_UNDERLINE = re.compile(r'^-{3,}\s*$')
+_FIELD = re.compile(r'^:(\w+)([^:]*):\s*(.*)$')
+_GOOGLE_PARAM = re.compile(r'^(\*{0,2}\w+)\s*(?:\(([^)]*)\))?\s*:\s*(.*)$')
+_NUMPY_PARAM = re.compile(r'^(\*{0,2}\w+(?:\s*,\s*\*{0,2}\w+)*)\s*(?::\s*(.*))?$')
+_EXCEPTION = re.compile(r'^([A-Za-z_][\w.]*)\s*(?::\s*(.*))?$')
+_TYPE = re.compile(r'^[\w.\[\], |]+$')
+
+
+def _looks_like_type(text: str) -> bool:
+    """Whether text before a colon is a type (``Dict[str, int]``) rather than prose."""
+    bare = re.sub(r'\[.*\]', '', text)
+    return bool(text) and bool(_TYPE.match(text)) and ' ' not in bare and not text.endswith('.')
+
+
+def _join(parts: List[str]) -> str:
+    return ' '.join(p for p in parts if p).strip()
+
+
+def _entries(lines: List[str]) -> List[tuple]:
+    """Split section lines into (first line, continuation lines) at the entry indent."""
+    entries = []
+    indent = None
+    for line in lines:
+        if not line.strip():
+            continue
+        depth = len(line) - len(line.lstrip())
+        if indent is None:
+            indent = depth
+        if depth <= indent or not entries:
+            entries.append((line.strip(), []))
+        else:
+            entries[-1][1].append(line.strip())
+    return entries
+
+
+def _split(lines: List[str]) -> tuple:
+    """Free text before the first section, then sections as {title, style, lines}."""
+    head, sections = [], []
+    current = None
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        top = bool(stripped) and not line[0].isspace()
+        i += 1
+
+        if top and i < len(lines) and _UNDERLINE.match(lines[i].strip()):
+            current = {'title': stripped, 'style': 'numpy', 'lines': []}
+            sections.append(current)
+            i += 1
+            continue
+        header = _GOOGLE_HEADER.match(stripped) if top else None
+        if header and (header.group(1).lower() in _KINDS or header.group(1).lower() in _OTHER_TITLES):
+            current = {'title': header.group(1), 'style': 'google', 'lines': []}
+            sections.append(current)
+            continue
+        if top and stripped.startswith(':') and _FIELD.match(stripped):
+            current = {'title': None, 'style': 'rest', 'lines': [stripped]}
+            sections.append(current)
+            continue
+        if top and current is not None and current['style'] != 'numpy':
+            # Unindented text after a Google section or a field is plain text again
+            current = {'title': None, 'style': None, 'lines': []}
+            sections.append(current)
+
+        (current['lines'] if current is not None else head).append(line)
+
+    return head, sections
+
+
+def parse_docstring(docstring: str) -> Dict:
+    """
+    Parse a Google, NumPy or reST docstring into its parts.
+
+    Args:
+        docstring (str): Cleaned docstring text (as from ``ast.get_docstring``)
+
+    Returns:
+        Dict: ``style``, ``summary``, ``description``, ``params`` (list of
+        {name, type, description}), ``returns`` and ``yields`` ({type,
+        description} or None), ``raises`` (list of {name, description}) and
+        ``other`` (list of {title, lines}; a None title is plain text)
+    """
+
+    doc = {'style': classify_style(docstring), 'summary': '', 'description': '', 'params': [],
+           'returns': None, 'yields': None, 'raises': [], 'other': []}
+    if not docstring:
+        return doc
+
+    head, sections = _split(docstring.expandtabs().split('\n'))
+    text = '\n'.join(head).strip()
+    summary, _, description = text.partition('\n\n')
+    doc['summary'], doc['description'] = summary.strip(), description.strip()
+
+    params: Dict[str, Dict] = {}
+
+    def param(name: str) -> Dict:
+        if name not in params:
+            params[name] = {'name': name, 'type': None, 'description': ''}
+            doc['params'].append(params[name])
+        return params[name]
+
+    def value(kind: str) -> Dict:
+        if doc[kind] is None:
+            doc[kind] = {'type': None, 'description': ''}
+        return doc[kind]
+
+    for section in sections:
+        kind = _KINDS.get((section['title'] or '').lower())
+        style = section['style']
+
+        if style == 'rest':
+            field = _FIELD.match(section['lines'][0])
+            tag, words = field.group(1).lower(), field.group(2).split()
+            body = _join([field.group(3)] + [line.strip() for line in section['lines'][1:]])
+            if tag in ('param', 'parameter', 'arg', 'argument', 'key', 'keyword') and words:
+                entry = param(words[-1])
+                entry['description'] = body
+                entry['type'] = ' '.join(words[:-1]) or entry['type']
+            elif tag == 'type' and words:
+                param(words[-1])['type'] = body
+            elif tag in ('returns', 'return'):
+                value('returns')['description'] = body
+            elif tag == 'rtype':
+                value('returns')['type'] = body
+            elif tag in ('yields', 'yield'):
+                value('yields')['description'] = body
+            elif tag == 'ytype':
+                value('yields')['type'] = body
+            elif tag in ('raises', 'raise', 'except', 'exception'):
+                doc['raises'].append({'name': words[-1] if words else '', 'description': body})
+            else:
+                doc['other'].append({'title': None, 'lines': section['lines']})
+            continue
+
+        if kind is None:
+            lines = section['lines']
+            if style == 'google':
+                # Body without the Google indentation
+                lines = [line[4:] if line.startswith('    ') else line.lstrip() for line in lines]
+            doc['other'].append({'title': section['title'], 'lines': lines})
+            continue
+
+        for first, rest in _entries(section['lines']):
+            if kind == 'params':
+                if style == 'google':
+                    match = _GOOGLE_PARAM.match(first)
+                    if not match:
+                        if doc['params']:
+                            doc['params'][-1]['description'] = _join([doc['params'][-1]['description'], first] + rest)
+                        continue
+                    entry = param(match.group(1))
+                    entry['type'] = match.group(2) or entry['type']
+                    entry['description'] = _join([match.group(3)] + rest)
+                else:
+                    match = _NUMPY_PARAM.match(first)
+                    if not match:
+                        continue
+                    for name in match.group(1).split(','):
+                        entry = param(name.strip())
+                        entry['type'] = match.group(2) or entry['type']
+                        entry['description'] = _join(rest)
+            elif kind in ('returns', 'yields'):
+                entry = value(kind)
+                if style == 'google':
+                    kind_type, colon, described = first.partition(':')
+                    if colon and _looks_like_type(kind_type.strip()) and not entry['type']:
+                        entry['type'] = kind_type.strip()
+                        first = described
+                    entry['description'] = _join([entry['description'], first] + rest)
+                else:
+                    # "type" or "name : type", description below
+                    named, colon, typed = first.partition(' : ')
+                    if not entry['type']:
+                        entry['type'] = (typed if colon else named).strip()
+                        entry['description'] = _join([entry['description']] + rest)
+                    else:
+                        entry['description'] = _join([entry['description'], first] + rest)
+            else:
+                match = _EXCEPTION.match(first)
+                if match:
+                    doc['raises'].append({'name': match.group(1), 'description': _join([match.group(2)] + rest)})
+                elif doc['raises']:
+                    doc['raises'][-1]['description'] = _join([doc['raises'][-1]['description'], first] + rest)
+
+    return doc
+
+
+def _value_text(entry: Dict, style: str, rtype: str) -> str:
+    """Returns/Yields body in the format_docstring layout of a style."""
+    kind, text = entry.get('type'), entry.get('description') or ''
+    if style == "google":
+        return f"{kind}: {text}".strip() if kind else text
+    if style == "numpy":
+        if not kind:
+            return text
+        return f"{kind}\n    {text}" if text else kind
+    body = text or kind or ''
+    return f"{body}\n:{rtype}: {kind}" if kind and text else body
+
+
+def render(doc: Dict, style: str) -> str:
+    """
+    Write parsed docstring parts in a style.
+
+    Args:
+        doc (Dict): Parts as returned by ``parse_docstring``
+        style (str): Target style (google, numpy, rest)
+
+    Returns:
+        str: Docstring content (without quotes)
+
+    Raises:
+        ValueError: If the style is unknown
+    """
+
+    if style not in STYLES:
+        raise ValueError(f"Unknown style: {style}")
+
+    args = {}
+    for entry in doc['params']:
+        name, kind = entry['name'], entry.get('type')
+        if style == "google":
+            key = f"{name} ({kind})" if kind else name
+        elif style == "numpy":
+            key = f"{name} : {kind}" if kind else name
+        else:
+            # ":param type name:" only holds one-word types; others get a ":type:" line
+            key = f"{kind} {name}" if kind and ' ' not in kind else name
+            if kind and ' ' in kind:
+                args[key] = f"{entry.get('description') or ''}\n:type {name}: {kind}"
+                continue
+        args[key] = entry.get('description') or ''
+
+    returns, yields = doc.get('returns'), doc.get('yields')
+    if style == "rest" and yields and not returns:
+        # reST has no yields field (``:yields:`` would read as a Google marker)
+        returns, yields = yields, None
+
+    summary = doc['summary']
+    if doc.get('description'):
+        summary = f"{summary}\n\n{doc['description']}"
+
+    text = format_docstring({
+        'summary': summary,
+        'args': args,
+        'returns': _value_text(returns, style, 'rtype') if returns else None,
+        'raises': {r['name']: r.get('description') or '' for r in doc['raises']}
+    }, style)
+
+    blocks = []
+    if yields and style == "google":
+        blocks.append("Yields:\n    " + _value_text(yields, style, 'rtype'))
+    elif yields and style == "numpy":
+        blocks.append("Yields\n------\n" + _value_text(yields, style, 'rtype'))
+
+    for section in doc.get('other', []):
+        body = '\n'.join(section['lines']).strip('\n')
+        if section['title'] is None:
+            blocks.append(body)
+        elif style == "numpy":
+            blocks.append(f"{section['title']}\n{'-' * len(section['title'])}\n{body}")
+        else:
+            indented = '\n'.join(f"    {line}" if line.strip() else '' for line in body.split('\n'))
+            blocks.append(f"{section['title']}:\n{indented}")
+
+    return '\n\n'.join([text] + [b for b in blocks if b.strip()])
+
+
+def convert_docstring(docstring: str, style: str) -> Optional[str]:
+    """
+    Convert a docstring to another style without the LLM.
+
+    Args:
+        docstring (str): Cleaned docstring text
+        style (str): Target style (google, numpy, rest)
+
+    Returns:
+        Optional[str]: Converted content, or None if the docstring has no
+        recognisable style or its sections would not survive conversion
+    """
+
+    source_style = classify_style(docstring)
+    if source_style is None:
+        return None
+    if source_style == style:
+        return docstring
+
+    converted = render(parse_docstring(docstring), style)
+
+    # Refuse conversions that lose or rename documented entries
+    before, after = parse_sections(docstring), parse_sections(converted)
+    if ([p.lstrip('*') for p in before['params']] != [p.lstrip('*') for p in after['params']]
+            or before['returns'] != after['returns'] or before['raises'] != after['raises']
+            or classify_style(converted) != style):
+        return None
+    return converted
+
+
+def convert_function(fn: Dict, style: str) -> Optional[str]:
+    """
+    Converted docstring content of a parsed function.
+
+    Args:
+        fn (Dict): Function metadata from parser
+        style (str): Target style (google, numpy, rest)
+
+    Returns:
+        Optional[str]: Content in ``style``, or None when the function has
+        no docstring in another style or it does not match the signature
+    """
+
+    if not fn.get('has_docstring') or fn.get('docstring_style') in (None, style):
+        return None
+    check = fn.get('signature_check')
+    if check and not check['consistent']:
+        return None
+    return convert_docstring(fn['docstring'], style)
+
+
+def convert_project(parsed_files: List[Dict], style: str) -> Dict:
+    """
+    Convert every function documented in another style.
+
+    Args:
+        parsed_files (List[Dict]): Parser output
+        style (str): Target style (google, numpy, rest)
+
+    Returns:
+        Dict: ``docstrings`` ({(file_path, function name): content}) and
+        ``stats`` (converted, skipped, seconds)
+    """
+
+    started = time.perf_counter()
+    docstrings = {}
+    skipped = 0
+    for file_data in parsed_files:
+        for fn in file_data.get('functions', []):
+            if not fn.get('has_docstring') or fn.get('docstring_style') in (None, style):
+                continue
+            content = convert_function(fn, style)
+            if content is None:
+                skipped += 1
+            else:
+                docstrings[(file_data['file_path'], fn['name'])] = content
+
+    return {
+        'docstrings': docstrings,
+        'stats': {
+            'converted': len(docstrings),
+            'skipped': skipped,
+            'seconds': round(time.perf_counter() - started, 4)
+        }
+    }
+
+
+if __name__ == '__main__':
+    import sys
+    from core.parser.python_parser import parse_path
+
+    target = sys.argv[2] if len(sys.argv) > 2 else 'numpy'
+    result = convert_project(parse_path(sys.argv[1] if len(sys.argv) > 1 else '.'), target)
+    for (path, name), content in list(result['docstrings'].items())[:3]:
+        print(f"\n📄 {path}::{name}\n{content}")
+    print(f"\n🔄 {result['stats']}")
@@ -0,0 +1,281 @@
+"""
+Churn Analysis - Milestone 3
+
+Per-file change counts from a single streamed `git log --numstat` pass,
+joined with complexity and coverage into a risk ranking.
+
+The parsed log is cached by HEAD SHA, so later runs only read the commits
+added since the cached HEAD.
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional
+
+CACHE_FILE = "storage/churn_cache.json"
+
+# Marks the start of a commit header (emitted by git as %x00)
+_COMMIT_MARK = "\x00"
+
+
+def _git(repo_path: str, *args: str) -> str:
+    """Run a git command and return its stripped stdout."""
+    result = subprocess.run(
+        ['git', '-C', repo_path, *args],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return result.stdout.strip()
+
+
+def repo_root(repo_path: str = ".") -> str:
+    """
+    Get the top-level directory of the repository containing a path.
+
+    Args:
+        repo_path (str): Path inside a git repository
+
+    Returns:
+        str: Absolute path (``repo_path`` itself outside a repository)
+    """
+
+    try:
+        return os.path.abspath(_git(repo_path, 'rev-parse', '--show-toplevel'))
+    except (OSError, subprocess.CalledProcessError):
+        return os.path.abspath(repo_path)
+
+
+def get_head_sha(repo_path: str = ".") -> str:
+    """
+    Get the commit SHA that HEAD points to.
+
+    Args:
+        repo_path (str): Path inside a git repository
+
+    Returns:
+        str: Full HEAD SHA
+    """
+
+    return _git(repo_path, 'rev-parse', 'HEAD')
+
+
+def iter_git_log(repo_path: str = ".", rev_range: str = "HEAD") -> Iterator[Dict]:
+    """
+    Stream commits with per-file line counts from `git log --numstat`.
+
+    Output is read line by line from the git process, so memory does not
+    grow with history length. Paths are reported unquoted (non-ASCII names
+    match the scanned files), and stderr goes to a temporary file so a
+    chatty git cannot block on a full pipe.
+
+    Args:
+        repo_path (str): Path inside a git repository
+        rev_range (str): Revision range to log (e.g. ``abc123..HEAD``)
+
+    Yields:
+        Dict: Commit with sha, timestamp and [path, added, deleted] rows
+
+    Raises:
+        subprocess.CalledProcessError: If git exits with a non-zero status
+            (after the commits it did print have been yielded)
+    """
+
+    command = ['git', '-C', repo_path, '-c', 'core.quotepath=off', 'log', '--numstat', '--no-renames',
+               '--format=%x00%H %ct', rev_range]
+    stderr_file = tempfile.TemporaryFile(mode='w+', encoding='utf-8', errors='replace')
+    proc = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=stderr_file,
+        text=True,
+        encoding='utf-8',
+        errors='replace'
+    )
+
+    commit = None
+    try:
+        for line in proc.stdout:
+            line = line.rstrip('\n')
+            if line.startswith(_COMMIT_MARK):
+                if commit:
+                    yield commit
+                sha, timestamp = line[1:].split(' ', 1)
+                commit = {'sha': sha, 'timestamp': int(timestamp), 'files': []}
+            elif line and commit is not None:
+                added, deleted, path = line.split('\t', 2)
+                # Binary files report '-' instead of line counts
+                commit['files'].append([
+                    path,
+                    int(added) if added.isdigit() else 0,
+                    int(deleted) if deleted.isdigit() else 0
+                ])
+        if commit:
+            yield commit
+
+        # Drained: a failed log (bad range, not a repository) must not pass
+        # for an empty history
+        if proc.wait() != 0:
+            stderr_file.seek(0)
+            raise subprocess.CalledProcessError(proc.returncode, command, stderr=stderr_file.read())
+    finally:
+        proc.stdout.close()
+        proc.wait()
+        stderr_file.close()
+
+
+def load_commits(repo_path: str = ".", cache_path: Optional[str] = CACHE_FILE) -> List[Dict]:
+    """
+    Load the parsed commit log, reusing and extending the cache.
+
+    Args:
+        repo_path (str): Path inside a git repository
+        cache_path (Optional[str]): JSON cache file, or None to disable
+
+    Returns:
+        List[Dict]: Commits, newest first
+    """
+
+    head = get_head_sha(repo_path)
+    root = os.path.abspath(_git(repo_path, 'rev-parse', '--show-toplevel'))
+
+    cache = None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('repo') != root:
+                cache = None
+        except (OSError, ValueError):
+            cache = None
+
+    if cache and cache['head'] == head:
+        return cache['commits']
+
+    commits = None
+    if cache:
+        is_ancestor = subprocess.run(
+            ['git', '-C', repo_path, 'merge-base', '--is-ancestor', cache['head'], head],
+            capture_output=True
+        ).returncode == 0
+        if is_ancestor:
+            commits = list(iter_git_log(repo_path, f"{cache['head']}..{head}")) + cache['commits']
+
+    if commits is None:
+        # No usable cache (first run or rewritten history): full pass
+        commits = list(iter_git_log(repo_path, head))
+
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'repo': root, 'head': head, 'commits': commits}, f)
+
+    return commits
+
+
+def collect_churn(repo_path: str = ".", days: Optional[int] = 90,
+                  cache_path: Optional[str] = CACHE_FILE) -> Dict[str, Dict]:
+    """
+    Count changes per file over a time window.
+
+    Args:
+        repo_path (str): Path inside a git repository
+        days (Optional[int]): Window length in days; None for all history
+        cache_path (Optional[str]): JSON cache file, or None to disable
+
+    Returns:
+        Dict[str, Dict]: Repo-relative path -> commits, added, deleted, last_change
+    """
+
+    try:
+        commits = load_commits(repo_path, cache_path)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️  Could not read git history: {e}")
+        return {}
+
+    cutoff = time.time() - days * 86400 if days is not None else 0
+    churn: Dict[str, Dict] = {}
+
+    for commit in commits:
+        if commit['timestamp'] < cutoff:
+            continue
+        for path, added, deleted in commit['files']:
+            entry = churn.setdefault(path, {
+                'commits': 0,
+                'added': 0,
+                'deleted': 0,
+                'last_change': commit['timestamp']
+            })
+            entry['commits'] += 1
+            entry['added'] += added
+            entry['deleted'] += deleted
+            entry['last_change'] = max(entry['last_change'], commit['timestamp'])
+
+    return churn
+
+
+def rank_risk(churn: Dict[str, Dict], complexity_by_file: Dict[str, Dict],
+              coverage: Dict, repo_path: str = ".", limit: int = 20) -> List[Dict]:
+    """
+    Rank files by churn x complexity, weighted up by missing docstrings.
+
+    Args:
+        churn (Dict[str, Dict]): Output of ``collect_churn``
+        complexity_by_file (Dict[str, Dict]): File path -> ``get_complexity_metrics`` output
+        coverage (Dict): Output of ``compute_coverage``
+        repo_path (str): Path inside the git repository churn was read from
+        limit (int): Maximum number of files returned
+
+    Returns:
+        List[Dict]: Files sorted by risk (highest first)
+    """
+
+    root = repo_root(repo_path)
+
+    file_coverage = {f['file_path']: f['coverage_percent'] for f in coverage.get('files', [])}
+
+    ranking = []
+    for file_path, complexity in complexity_by_file.items():
+        rel = os.path.relpath(os.path.abspath(file_path), root).replace(os.sep, '/')
+        changes = churn.get(rel, {}).get('commits', 0)
+        if not changes:
+            continue
+
+        total_complexity = sum(fn['complexity'] for fn in complexity.get('functions', []))
+        percent = file_coverage.get(file_path, 100)
+
+        ranking.append({
+            'file_path': file_path,
+            'commits': changes,
+            'total_complexity': total_complexity,
+            'max_complexity': complexity.get('max_complexity', 0),
+            'coverage_percent': percent,
+            'risk': round(changes * total_complexity * (2 - percent / 100), 2)
+        })
+
+    ranking.sort(key=lambda r: r['risk'], reverse=True)
+    return ranking[:limit]
+
+
+if __name__ == '__main__':
+    import sys
+    from core.parser.python_parser import parse_path
+    from core.reporter.coverage_reporter import compute_coverage
+    from core.metrics.code_metrics import get_complexity_metrics
+
+    target = sys.argv[1] if len(sys.argv) > 1 else '.'
+    parsed = parse_path(target)
+
+    complexity = {}
+    for file_data in parsed:
+        with open(file_data['file_path'], 'r', encoding='utf-8') as f:
+            complexity[file_data['file_path']] = get_complexity_metrics(f.read())
+
+    churn = collect_churn(target)
+    print("\n🔥 Risk ranking (churn x complexity):")
+    for row in rank_risk(churn, complexity, compute_coverage(parsed), target):
+        print(f"   {row['file_path']:<50} commits {row['commits']:>3}  "
+              f"complexity {row['total_complexity']:>4}  risk {row['risk']}")
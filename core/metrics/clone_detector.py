@@ -0,0 +1,417 @@
+"""
+Clone Detector - Milestone 3
+
+Find copy-pasted functions using AST fingerprints.
+
+Each function is reduced to a stream of normalized AST node labels
+(identifiers, literals and docstrings abstracted away). From that stream:
+- a subtree hash groups exact structural clones
+- winnowed k-gram fingerprints catch near-duplicates
+Fingerprints live in an inverted index (fingerprint -> function ids), so
+finding candidates never compares every pair of functions.
+
+``detect_clones`` indexes the parser's records (each function's own source),
+so files are not read or parsed again.
+"""
+
+import ast
+import hashlib
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# k-gram length and winnowing window (in normalized AST nodes)
+KGRAM_SIZE = 5
+WINDOW_SIZE = 4
+
+# Functions smaller than this are too trivial to report as clones
+MIN_NODES = 30
+
+# Fingerprints shared by more functions than this carry no signal
+MAX_POSTINGS = 1000
+
+_MOD = (1 << 61) - 1
+_BASE = 1_000_003
+
+
+def iter_node_labels(node: ast.AST) -> Iterator[str]:
+    """
+    Yield normalized labels for a subtree in pre-order.
+
+    Identifiers become ``ID`` and literals become their type name, so
+    renamed copies of a function produce the same stream. A leading
+    docstring is skipped.
+
+    Args:
+        node (ast.AST): Root node (usually a FunctionDef)
+
+    Yields:
+        str: Normalized node label
+    """
+
+    stack = [node]
+
+    while stack:
+        current = stack.pop()
+
+        if isinstance(current, (ast.Name, ast.arg, ast.alias)):
+            yield 'ID'
+            continue
+        if isinstance(current, ast.Constant):
+            yield f'C:{type(current.value).__name__}'
+            continue
+        if isinstance(current, ast.Attribute):
+            yield 'Attr'
+            stack.append(current.value)
+            continue
+
+        yield type(current).__name__
+
+        children = list(ast.iter_child_nodes(current))
+        if children and _has_docstring(current):
+            children = [c for c in children if c is not current.body[0]]
+
+        # Reverse so children are visited left to right
+        stack.extend(reversed(children))
+
+
+def _has_docstring(node: ast.AST) -> bool:
+    """Check whether a node's body starts with a docstring expression."""
+    body = getattr(node, 'body', None)
+    return (
+        isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        and bool(body)
+        and isinstance(body[0], ast.Expr)
+        and isinstance(body[0].value, ast.Constant)
+        and isinstance(body[0].value.value, str)
+    )
+
+
+def subtree_hash(labels: List[str]) -> int:
+    """
+    Hash a normalized label stream into a 64-bit integer.
+
+    Args:
+        labels (List[str]): Normalized node labels
+
+    Returns:
+        int: Stable hash of the whole subtree
+    """
+
+    digest = hashlib.blake2b('\x1f'.join(labels).encode('utf-8'), digest_size=8)
+    return int.from_bytes(digest.digest(), 'big')
+
+
+def winnow(labels: List[str], k: int = KGRAM_SIZE, window: int = WINDOW_SIZE) -> Tuple[int, ...]:
+    """
+    Compute winnowed k-gram fingerprints for a label stream.
+
+    K-gram hashes are computed with a rolling hash, then the minimum hash of
+    every window of ``window`` consecutive k-grams is kept.
+
+    Args:
+        labels (List[str]): Normalized node labels
+        k (int): K-gram length
+        window (int): Winnowing window size
+
+    Returns:
+        Tuple[int, ...]: Sorted, de-duplicated fingerprints
+    """
+
+    if len(labels) < k:
+        return ()
+
+    tokens = [zlib.crc32(label.encode('utf-8')) for label in labels]
+    high = pow(_BASE, k - 1, _MOD)
+
+    h = 0
+    for token in tokens[:k]:
+        h = (h * _BASE + token) % _MOD
+    grams = [h]
+    for i in range(k, len(tokens)):
+        h = ((h - tokens[i - k] * high) * _BASE + tokens[i]) % _MOD
+        grams.append(h)
+
+    if len(grams) <= window:
+        return (min(grams),)
+
+    selected = set()
+    for start in range(len(grams) - window + 1):
+        selected.add(min(grams[start:start + window]))
+
+    return tuple(sorted(selected))
+
+
+class CloneIndex:
+    """
+    Inverted index of function fingerprints.
+
+    Functions are stored as compact tuples and referenced by integer id.
+    Exact clones are bucketed by subtree hash; only one representative per
+    bucket enters the k-gram index, so heavily copied helpers do not blow
+    up candidate lookup.
+    """
+
+    def __init__(self, min_nodes: int = MIN_NODES):
+        self.min_nodes = min_nodes
+        self.files: List[str] = []
+        self.file_lines: List[int] = []
+        # (file index, name, start_line, end_line, fingerprints)
+        self.functions: List[Tuple[int, str, int, int, Tuple[int, ...]]] = []
+        self.exact: Dict[int, List[int]] = defaultdict(list)
+        self.postings: Dict[int, List[int]] = defaultdict(list)
+        self.representative = bytearray()
+
+    def add_file(self, file_path: str) -> int:
+        """
+        Read, parse and index a Python file.
+
+        Args:
+            file_path (str): Path to Python file
+
+        Returns:
+            int: Number of functions indexed
+        """
+
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                source = f.read()
+            return self.add_source(file_path, source)
+        except (OSError, SyntaxError, UnicodeDecodeError) as e:
+            print(f"⚠️  Clone index skipped {file_path}: {e}")
+            return 0
+
+    def add_source(self, file_path: str, source: str) -> int:
+        """
+        Index every function in a source string.
+
+        Args:
+            file_path (str): Path reported in clone groups
+            source (str): Python source code
+
+        Returns:
+            int: Number of functions indexed
+        """
+
+        tree = ast.parse(source, filename=file_path)
+        file_index = self._add_path(file_path, source.count('\n') + 1 if source else 0)
+
+        added = 0
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                added += self._add_function(file_index, node.name, node.lineno, node.end_lineno,
+                                            list(iter_node_labels(node)))
+
+        return added
+
+    def add_parsed(self, file_data: Dict) -> int:
+        """
+        Index the functions of a parsed file from their recorded source.
+
+        Only each function's own (dedented, docstring-free) source is parsed,
+        never the whole file.
+
+        Args:
+            file_data (Dict): Output of ``parse_source`` / ``parse_file``
+
+        Returns:
+            int: Number of functions indexed
+        """
+
+        file_index = self._add_path(file_data['file_path'], file_data.get('line_count', 0))
+
+        added = 0
+        for fn in file_data.get('functions', []):
+            try:
+                node = ast.parse(fn['source']).body[0]
+            except (SyntaxError, IndexError):
+                # A body that was only a docstring is too small to matter
+                continue
+            added += self._add_function(file_index, fn['name'], fn['def_line'], fn['end_line'],
+                                        list(iter_node_labels(node)))
+
+        return added
+
+    def _add_path(self, file_path: str, total_lines: int) -> int:
+        """Register a file and return its index."""
+        self.files.append(file_path)
+        self.file_lines.append(total_lines)
+        return len(self.files) - 1
+
+    def _add_function(self, file_index: int, name: str, start: int, end: int, labels: List[str]) -> int:
+        """Index one function's label stream; 1 if indexed, 0 if too small."""
+        if len(labels) < self.min_nodes:
+            return 0
+
+        fn_id = len(self.functions)
+        fingerprints = winnow(labels)
+        self.functions.append((file_index, name, start, end, fingerprints))
+
+        bucket = self.exact[subtree_hash(labels)]
+        bucket.append(fn_id)
+        self.representative.append(len(bucket) == 1)
+        if len(bucket) == 1:
+            for fp in fingerprints:
+                self.postings[fp].append(fn_id)
+        return 1
+
+    def _near_pairs(self, threshold: float) -> Iterator[Tuple[int, int, float]]:
+        """Yield (id, id, similarity) for near-duplicate representatives."""
+        for fn_id, (_, _, _, _, fingerprints) in enumerate(self.functions):
+            if not self.representative[fn_id]:
+                continue
+            shared: Dict[int, int] = defaultdict(int)
+            for fp in fingerprints:
+                posting = self.postings[fp]
+                if len(posting) > MAX_POSTINGS:
+                    continue
+                for other in posting:
+                    if other > fn_id:
+                        shared[other] += 1
+
+            for other, common in shared.items():
+                other_fps = self.functions[other][4]
+                union = len(fingerprints) + len(other_fps) - common
+                similarity = common / union if union else 0.0
+                if similarity >= threshold:
+                    yield fn_id, other, similarity
+
+    def clone_groups(self, threshold: float = 0.8) -> List[Dict]:
+        """
+        Build clone groups from exact and near-duplicate matches.
+
+        Args:
+            threshold (float): Minimum Jaccard similarity of fingerprints
+                for a near-duplicate match
+
+        Returns:
+            List[Dict]: Clone groups, largest first
+        """
+
+        parent = list(range(len(self.functions)))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        def union(a: int, b: int):
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+
+        for bucket in self.exact.values():
+            for member in bucket[1:]:
+                union(bucket[0], member)
+
+        lowest: Dict[int, float] = {}
+        near_edges = list(self._near_pairs(threshold))
+        for a, b, _ in near_edges:
+            union(a, b)
+        for a, b, similarity in near_edges:
+            root = find(a)
+            lowest[root] = min(lowest.get(root, 1.0), similarity)
+
+        members: Dict[int, List[int]] = defaultdict(list)
+        for fn_id in range(len(self.functions)):
+            members[find(fn_id)].append(fn_id)
+
+        groups = []
+        for root, ids in members.items():
+            if len(ids) < 2:
+                continue
+            groups.append({
+                'kind': 'near' if root in lowest else 'exact',
+                'similarity': round(lowest.get(root, 1.0), 3),
+                'members': [self._describe(fn_id) for fn_id in ids]
+            })
+
+        groups.sort(key=lambda g: len(g['members']), reverse=True)
+        return groups
+
+    def _describe(self, fn_id: int) -> Dict:
+        """Convert a compact function record to a report dict."""
+        file_index, name, start, end, _ = self.functions[fn_id]
+        return {
+            'file_path': self.files[file_index],
+            'name': name,
+            'start_line': start,
+            'end_line': end
+        }
+
+    def duplication_by_file(self, groups: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Compute the share of each file's lines that sit inside clones.
+
+        Args:
+            groups (Optional[List[Dict]]): Output of ``clone_groups``;
+                computed with the default threshold if omitted
+
+        Returns:
+            List[Dict]: Per-file duplication metrics
+        """
+
+        if groups is None:
+            groups = self.clone_groups()
+
+        duplicated: Dict[str, set] = defaultdict(set)
+        for group in groups:
+            for member in group['members']:
+                duplicated[member['file_path']].update(
+                    range(member['start_line'], member['end_line'] + 1)
+                )
+
+        report = []
+        for file_path, total in zip(self.files, self.file_lines):
+            dup = len(duplicated.get(file_path, ()))
+            report.append({
+                'file_path': file_path,
+                'total_lines': total,
+                'duplicated_lines': dup,
+                'duplication_percent': round(dup / total * 100, 2) if total else 0.0
+            })
+
+        return report
+
+
+def detect_clones(parsed_files: List[Dict], threshold: float = 0.8) -> Dict:
+    """
+    Run clone detection over the output of ``parse_path``.
+
+    Functions are indexed from the parsed records; no file is re-read.
+
+    Args:
+        parsed_files (List[Dict]): List of parsed file data
+        threshold (float): Minimum similarity for near-duplicates
+
+    Returns:
+        Dict: Clone groups and per-file duplication
+    """
+
+    index = CloneIndex()
+    for file_data in parsed_files:
+        index.add_parsed(file_data)
+
+    groups = index.clone_groups(threshold)
+
+    return {
+        'total_functions': len(index.functions),
+        'groups': groups,
+        'files': index.duplication_by_file(groups)
+    }
+
+
+if __name__ == '__main__':
+    import sys
+    from core.parser.python_parser import parse_path
+
+    target = sys.argv[1] if len(sys.argv) > 1 else 'examples'
+    result = detect_clones(parse_path(target))
+
+    print(f"\n🔁 Clone groups: {len(result['groups'])}")
+    for group in result['groups']:
+        print(f"\n   [{group['kind']}] similarity {group['similarity']}")
+        for m in group['members']:
+            print(f"   - {m['file_path']}:{m['start_line']}-{m['end_line']} {m['name']}()")
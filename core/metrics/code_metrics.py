@@ -4,10 +4,24 @@ Code Metrics - Milestone 3
 Calculate complexity and maintainability metrics.
 """
 
+import io
+import keyword
+import math
+import tokenize
+from bisect import bisect_left, bisect_right
 from radon.complexity import cc_visit, average_complexity
-from radon.metrics import mi_visit, mi_parameters
+from radon.metrics import mi_visit, mi_compute
 from radon.raw import analyze
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+# Tokens counted as Halstead operators in per-function metrics
+HALSTEAD_OPERATORS = {
+    '+', '-', '*', '/', '//', '%', '**', '@', '<<', '>>', '&', '|', '^', '~',
+    '<', '>', '<=', '>=', '==', '!=',
+    '+=', '-=', '*=', '/=', '//=', '%=', '**=', '@=', '<<=', '>>=', '&=', '|=', '^=',
+    'and', 'or', 'not', 'in', 'is'
+}
 
 
 def get_complexity_metrics(source_code: str) -> Dict:
@@ -140,12 +154,176 @@ def get_raw_metrics(source_code: str) -> Dict:
         }
 
 
-def get_comprehensive_metrics(file_path: str) -> Dict:
+def _classify_lines(tokens: List[tokenize.TokenInfo], line_count: int) -> List[str]:
+    """
+    Classify every line as 'code', 'comment', 'multi' or 'blank' in one pass.
+    
+    Lines holding only a standalone string statement (docstrings) are
+    'multi', matching radon's raw metrics.
+    
+    Args:
+        tokens (List[tokenize.TokenInfo]): Token stream of the file
+        line_count (int): Number of lines in the file
+        
+    Returns:
+        List[str]: Kind per line, index 0 unused (lines are 1-based)
+    """
+    
+    kinds = ['blank'] * (line_count + 2)
+    statement_start = True
+    
+    for tok in tokens:
+        if tok.type in (tokenize.NL, tokenize.NEWLINE, tokenize.INDENT,
+                        tokenize.DEDENT, tokenize.ENDMARKER, tokenize.ENCODING):
+            if tok.type == tokenize.NEWLINE:
+                statement_start = True
+            continue
+        
+        if tok.type == tokenize.COMMENT:
+            if kinds[tok.start[0]] == 'blank':
+                kinds[tok.start[0]] = 'comment'
+            continue
+        
+        if tok.type == tokenize.STRING and statement_start:
+            # Blank lines inside a docstring stay blank
+            for offset, text in enumerate(tok.string.split('\n')):
+                line = tok.start[0] + offset
+                if text.strip() and kinds[line] != 'code':
+                    kinds[line] = 'multi'
+        else:
+            for line in range(tok.start[0], tok.end[0] + 1):
+                kinds[line] = 'code'
+        statement_start = False
+    
+    return kinds
+
+
+def get_function_metrics(source_code: str, functions: List[Dict]) -> List[Dict]:
+    """
+    Compute raw metrics and maintainability index per function.
+    
+    The file is tokenized once; each function's numbers come from the
+    slice of that token stream inside its parser span (``start_line`` is
+    the 0-based def line, ``end_line`` the 1-based last line), so the
+    cost stays linear in file size. Halstead volume is approximated from
+    operator/operand tokens; complexity comes from a single radon pass.
+    
+    Args:
+        source_code (str): Python source code
+        functions (List[Dict]): Function records from the parser
+        
+    Returns:
+        List[Dict]: Per-function metrics in the order given
+    """
+    
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(source_code).readline))
+    except (tokenize.TokenError, IndentationError, SyntaxError) as e:
+        print(f"⚠️  Error tokenizing source: {e}")
+        return []
+    
+    line_count = source_code.count('\n') + 1
+    kinds = _classify_lines(tokens, line_count)
+    
+    # Prefix sums so every span's line counts are O(1)
+    prefix = {kind: [0] * (line_count + 2) for kind in ('code', 'comment', 'multi', 'blank')}
+    for line in range(1, line_count + 1):
+        for kind, counts in prefix.items():
+            counts[line] = counts[line - 1] + (kinds[line] == kind)
+    
+    token_lines = [tok.start[0] for tok in tokens]
+    
+    complexity_by_line = {}
+    try:
+        pending = list(cc_visit(source_code))
+        while pending:
+            block = pending.pop()
+            complexity_by_line[block.lineno] = block.complexity
+            pending.extend(getattr(block, 'closures', []) or [])
+    except Exception as e:
+        print(f"⚠️  Error calculating complexity: {e}")
+    
+    results = []
+    for fn in functions:
+        first = fn['start_line'] + 1
+        last = min(fn['end_line'], line_count)
+        
+        def span(kind):
+            return prefix[kind][last] - prefix[kind][first - 1]
+        
+        sloc = span('code')
+        comments = span('comment')
+        multi = span('multi')
+        
+        operators, operands = [], []
+        lloc = 0
+        for tok in tokens[bisect_left(token_lines, first):bisect_right(token_lines, last)]:
+            if tok.type == tokenize.NEWLINE:
+                lloc += 1
+            elif tok.string in HALSTEAD_OPERATORS and tok.type in (tokenize.OP, tokenize.NAME):
+                operators.append(tok.string)
+            elif tok.type == tokenize.NAME and not keyword.iskeyword(tok.string):
+                operands.append(tok.string)
+            elif tok.type in (tokenize.NUMBER, tokenize.STRING):
+                operands.append(tok.string)
+        
+        vocabulary = len(set(operators)) + len(set(operands))
+        length = len(operators) + len(operands)
+        volume = length * math.log2(vocabulary) if vocabulary > 1 else 0.0
+        
+        complexity = complexity_by_line.get(fn['start_line'] + 1, 1)
+        comment_percent = (comments + multi) / sloc * 100 if sloc else 0.0
+        mi = mi_compute(volume, complexity, lloc, comment_percent)
+        
+        results.append({
+            'name': fn['name'],
+            'start_line': first,
+            'end_line': last,
+            'loc': last - first + 1,
+            'sloc': sloc,
+            'lloc': lloc,
+            'comments': comments,
+            'multi': multi,
+            'blank': span('blank'),
+            'comment_ratio': round((comments + multi) / (last - first + 1) * 100, 2),
+            'halstead_volume': round(volume, 2),
+            'complexity': complexity,
+            'maintainability_index': round(mi, 2)
+        })
+    
+    return results
+
+
+def get_function_complexity(fn: Dict) -> int:
+    """
+    Cyclomatic complexity of one function from its parser record.
+    
+    Only the function's own source (``fn['source']``) is analysed, so the
+    file is not read again.
+    
+    Args:
+        fn (Dict): Function record from the parser
+        
+    Returns:
+        int: Cyclomatic complexity (1 if it cannot be computed)
+    """
+    
+    try:
+        blocks = cc_visit(fn['source'])
+    except Exception as e:
+        print(f"⚠️  Error calculating complexity of {fn['name']}: {e}")
+        return 1
+    return blocks[0].complexity if blocks else 1
+
+
+def get_comprehensive_metrics(file_path: str, functions: Optional[List[Dict]] = None) -> Dict:
     """
     Get all metrics for a file.
     
     Args:
         file_path (str): Path to Python file
+        functions (Optional[List[Dict]]): Parser function records; when
+            given, per-function metrics are included
         
     Returns:
         Dict: Complete metrics
@@ -162,7 +340,7 @@ def get_comprehensive_metrics(file_path: str) -> Dict:
         # Calculate quality score
         score = calculate_quality_score(complexity, maintainability, raw)
         
-        return {
+        metrics = {
             'file_path': file_path,
             'complexity': complexity,
             'maintainability_index': maintainability,
@@ -171,6 +349,11 @@ def get_comprehensive_metrics(file_path: str) -> Dict:
             'grade': score_to_grade(score)
         }
         
+        if functions is not None:
+            metrics['function_metrics'] = get_function_metrics(source, functions)
+        
+        return metrics
+        
     except Exception as e:
         print(f"⚠️  Error getting metrics for {file_path}: {e}")
         return {
@@ -179,6 +362,40 @@ def get_comprehensive_metrics(file_path: str) -> Dict:
         }
 
 
+def iter_complexity_findings(file_paths: Iterable[str], max_complexity: int = 10) -> Iterator[Dict]:
+    """
+    Yield a finding for every function above a complexity threshold.
+    
+    Files are read one at a time, so findings can be streamed to a
+    writer without holding metrics for the whole tree.
+    
+    Args:
+        file_paths (Iterable[str]): Paths to Python files (consumed lazily)
+        max_complexity (int): Highest complexity that is not reported
+        
+    Yields:
+        Dict: Finding with file, line, code 'C901' and message
+    """
+    
+    for file_path in file_paths:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                blocks = cc_visit(f.read())
+        except Exception as e:
+            yield {'file': file_path, 'line': '-', 'code': 'ERROR', 'message': str(e)}
+            continue
+        
+        for block in blocks:
+            if block.complexity > max_complexity:
+                yield {
+                    'file': file_path,
+                    'line': block.lineno,
+                    'code': 'C901',
+                    'message': (f"'{block.name}' is too complex ({block.complexity}, "
+                                f"rank {get_complexity_rank(block.complexity)})")
+                }
+
+
 def calculate_quality_score(complexity: Dict, maintainability: float, raw: Dict) -> float:
     """
     Calculate overall quality score.
@@ -0,0 +1,266 @@
+"""
+Import Graph - Milestone 3
+
+Repository-level dependency metrics built from the parser's import records.
+
+- Resolves `import` / `from` statements to files in the scanned tree
+- Fan-in / fan-out per module
+- Strongly connected components (import cycles), computed iteratively
+- Call-site fan-in per function name
+- "Most depended-on but least documented" ranking
+"""
+
+import os
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+def module_name_for(file_path: str, root: str) -> str:
+    """
+    Convert a file path to a dotted module name relative to root.
+
+    Args:
+        file_path (str): Path to Python file
+        root (str): Directory the scan started from
+
+    Returns:
+        str: Dotted module name (packages map to their __init__.py)
+    """
+
+    rel = os.path.relpath(file_path, root)
+    rel = os.path.splitext(rel)[0]
+    parts = [p for p in rel.replace('\\', '/').split('/') if p not in ('', '.')]
+
+    if parts and parts[-1] == '__init__':
+        parts.pop()
+
+    return '.'.join(parts)
+
+
+def _resolve(record: Dict, module: str, is_package: bool, modules: Dict[str, int]) -> List[int]:
+    """Resolve one import record to indices of scanned modules."""
+    name = record['module']
+
+    if record['level']:
+        # Relative import: climb from the importing module's package
+        package = module.split('.') if is_package else module.split('.')[:-1]
+        up = record['level'] - 1
+        if up > len(package):
+            return []
+        base = package[:len(package) - up]
+        name = '.'.join(base + ([name] if name else []))
+
+    targets = []
+
+    # `from pkg import submodule` refers to the submodule file
+    found_submodule = False
+    for imported in record['names']:
+        candidate = f"{name}.{imported}" if name else imported
+        if candidate in modules:
+            targets.append(modules[candidate])
+            found_submodule = True
+
+    if found_submodule and name not in modules:
+        return targets
+
+    # Longest existing prefix: `import a.b.c` depends on a/b/c.py
+    parts = name.split('.') if name else []
+    while parts:
+        candidate = '.'.join(parts)
+        if candidate in modules:
+            targets.append(modules[candidate])
+            break
+        parts.pop()
+
+    return targets
+
+
+def strongly_connected_components(adjacency: List[List[int]]) -> List[List[int]]:
+    """
+    Find strongly connected components with an iterative Tarjan search.
+
+    Args:
+        adjacency (List[List[int]]): Outgoing edges per node
+
+    Returns:
+        List[List[int]]: Components in reverse topological order
+    """
+
+    n = len(adjacency)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    components = []
+    counter = 0
+
+    for start in range(n):
+        if index[start] != -1:
+            continue
+
+        # Each frame is (node, position in its adjacency list)
+        work = [(start, 0)]
+        index[start] = low[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack[start] = True
+
+        while work:
+            node, pos = work[-1]
+            edges = adjacency[node]
+
+            if pos < len(edges):
+                work[-1] = (node, pos + 1)
+                nxt = edges[pos]
+                if index[nxt] == -1:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack[nxt] = True
+                    work.append((nxt, 0))
+                elif on_stack[nxt]:
+                    low[node] = min(low[node], index[nxt])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def build_import_graph(parsed_files: List[Dict], root: Optional[str] = None) -> Dict:
+    """
+    Build the module import graph for a scanned tree.
+
+    Args:
+        parsed_files (List[Dict]): Output of ``parse_path``
+        root (Optional[str]): Scan root; defaults to the files' common directory
+
+    Returns:
+        Dict: Modules with fan-in/fan-out, edges and import cycles
+    """
+
+    paths = [f['file_path'] for f in parsed_files]
+    if root is None:
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths]) if paths else '.'
+
+    names = [module_name_for(os.path.abspath(p), os.path.abspath(root)) for p in paths]
+    modules = {name: i for i, name in enumerate(names)}
+
+    adjacency: List[List[int]] = []
+    for i, file_data in enumerate(parsed_files):
+        is_package = os.path.basename(paths[i]) == '__init__.py'
+        targets = set()
+        for record in file_data.get('imports', []):
+            targets.update(_resolve(record, names[i], is_package, modules))
+        targets.discard(i)
+        adjacency.append(sorted(targets))
+
+    fan_in = [0] * len(paths)
+    for targets in adjacency:
+        for t in targets:
+            fan_in[t] += 1
+
+    cycles = [
+        sorted(names[m] for m in component)
+        for component in strongly_connected_components(adjacency)
+        if len(component) > 1
+    ]
+
+    return {
+        'root': root,
+        'modules': [
+            {
+                'module': names[i],
+                'file_path': paths[i],
+                'fan_in': fan_in[i],
+                'fan_out': len(adjacency[i])
+            }
+            for i in range(len(paths))
+        ],
+        'edges': [(names[i], names[t]) for i, targets in enumerate(adjacency) for t in targets],
+        'cycles': cycles
+    }
+
+
+def function_fan_in(parsed_files: List[Dict]) -> Dict[str, int]:
+    """
+    Count call sites per function name across a scanned tree.
+
+    Calls are matched by name (``f(...)`` and ``obj.f(...)``), so functions
+    sharing a name share a count. The parser collects them in one map per
+    parsed file (``file_data['calls']``), so no file is read again.
+
+    Args:
+        parsed_files (List[Dict]): Output of ``parse_path``
+
+    Returns:
+        Dict[str, int]: Function name -> number of calls to it
+    """
+
+    calls = Counter()
+    for file_data in parsed_files:
+        calls.update(file_data.get('calls', {}))
+    return dict(calls)
+
+
+def rank_documentation_priority(graph: Dict, coverage: Dict, limit: int = 20) -> List[Dict]:
+    """
+    Rank modules that many others depend on but are poorly documented.
+
+    Args:
+        graph (Dict): Output of ``build_import_graph``
+        coverage (Dict): Output of ``compute_coverage``
+        limit (int): Maximum number of modules returned
+
+    Returns:
+        List[Dict]: Modules sorted by priority (highest first)
+    """
+
+    file_coverage = {f['file_path']: f for f in coverage.get('files', [])}
+
+    ranking = []
+    for module in graph['modules']:
+        details = file_coverage.get(module['file_path'])
+        if not details or details['total_functions'] == 0:
+            continue
+
+        undocumented = 1 - details['coverage_percent'] / 100
+        ranking.append({
+            'module': module['module'],
+            'file_path': module['file_path'],
+            'fan_in': module['fan_in'],
+            'coverage_percent': details['coverage_percent'],
+            'priority': round(module['fan_in'] * undocumented, 2)
+        })
+
+    ranking.sort(key=lambda r: (-r['priority'], -r['fan_in'], r['coverage_percent']))
+    return [r for r in ranking if r['priority'] > 0][:limit]
+
+
+if __name__ == '__main__':
+    import sys
+    from core.parser.python_parser import parse_path
+    from core.reporter.coverage_reporter import compute_coverage
+
+    target = sys.argv[1] if len(sys.argv) > 1 else '.'
+    parsed = parse_path(target)
+    graph = build_import_graph(parsed, target if os.path.isdir(target) else None)
+
+    print(f"\n🕸️  Modules: {len(graph['modules'])}  Edges: {len(graph['edges'])}  Cycles: {len(graph['cycles'])}")
+
+    print("\n📌 Most depended-on, least documented:")
+    for row in rank_documentation_priority(graph, compute_coverage(parsed)):
+        print(f"   {row['module']:<45} fan-in {row['fan_in']:>3}  coverage {row['coverage_percent']:>6}%")
@@ -0,0 +1,285 @@
+"""
+Docstring Parser - Milestone 1
+
+Reads the documented parameters, return and raised exceptions out of a
+docstring and compares them with the function signature.
+
+Supported sections:
+- Google: Args / Arguments / Parameters / Keyword Args, Returns / Yields, Raises
+- NumPy: underlined Parameters / Returns / Yields / Raises
+- reST: :param:, :returns: / :rtype:, :raises:
+
+``classify_style`` gives the coarse style label the UI filters on; the
+parser stores it on each record so it is computed once per docstring.
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+
+_GOOGLE_HEADER = re.compile(
+    r'^(args|arguments|parameters|params|keyword args|keyword arguments|'
+    r'other parameters|returns?|yields?|raises|exceptions?)\s*:\s*$',
+    re.IGNORECASE
+)
+_NUMPY_HEADER = re.compile(
+    r'^(parameters|other parameters|returns?|yields?|raises)\s*$',
+    re.IGNORECASE
+)
+_UNDERLINE = re.compile(r'^-{3,}\s*$')
+_GOOGLE_PARAM = re.compile(r'^(\*{0,2}\w+)\s*(?:\([^)]*\))?\s*:')
+_NUMPY_PARAM = re.compile(r'^(\*{0,2}\w+(?:\s*,\s*\*{0,2}\w+)*)\s*(?::.*)?$')
+_EXCEPTION = re.compile(r'^([A-Za-z_][\w.]*)\s*(?::.*)?$')
+_REST_FIELD = re.compile(r'^:(param|parameter|arg|argument|key|keyword|returns?|rtype|raises?|except|exception)\b([^:]*):')
+
+# Section header -> kind of entries it holds
+_SECTION_KINDS = {
+    'args': 'params', 'arguments': 'params', 'parameters': 'params', 'params': 'params',
+    'keyword args': 'params', 'keyword arguments': 'params', 'other parameters': 'params',
+    'return': 'returns', 'returns': 'returns', 'yield': 'returns', 'yields': 'returns',
+    'raises': 'raises', 'exception': 'raises', 'exceptions': 'raises',
+}
+
+# Style markers, matched against the lowercased docstring
+_GOOGLE_MARKERS = ('args:', 'returns:', 'raises:', 'yields:')
+_REST_MARKERS = (':param', ':type', ':return', ':rtype', ':raises')
+
+
+def classify_style(docstring: str) -> Optional[str]:
+    """
+    Label a docstring as Google, NumPy or reST in one pass over its text.
+
+    Google markers win over NumPy underlines, which win over reST fields.
+    Docstrings without a colon or a dashed underline (most one-liners) are
+    rejected after a single scan.
+
+    Args:
+        docstring (str): Docstring text
+
+    Returns:
+        Optional[str]: 'google', 'numpy', 'rest', or None if no style markers
+    """
+
+    if not docstring:
+        return None
+
+    doc = docstring.lower()
+    has_colon = ':' in doc
+    if has_colon and any(marker in doc for marker in _GOOGLE_MARKERS):
+        return 'google'
+    if '-------' in doc and ('returns' in doc or ('parameters' in doc and '----------' in doc)):
+        return 'numpy'
+    if has_colon and any(marker in doc for marker in _REST_MARKERS):
+        return 'rest'
+    return None
+
+
+def _indent(line: str) -> int:
+    """Number of leading whitespace characters."""
+    return len(line) - len(line.lstrip())
+
+
+def parse_sections(docstring: str) -> Dict:
+    """
+    Parse the structured sections of a docstring in one pass.
+
+    Args:
+        docstring (str): Cleaned docstring text (as from ``ast.get_docstring``)
+
+    Returns:
+        Dict: Detected style, documented params (in order), whether a
+        return value is documented, and documented exceptions
+    """
+
+    result = {'style': None, 'params': [], 'returns': False, 'raises': []}
+    if not docstring:
+        return result
+
+    lines = docstring.expandtabs().split('\n')
+    section = None
+    section_style = None
+    entry_indent = None
+    header_indent = 0
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        i += 1
+
+        if not stripped:
+            continue
+
+        # reST field lists can appear anywhere
+        field = _REST_FIELD.match(stripped) if stripped[0] == ':' else None
+        if field:
+            result['style'] = result['style'] or 'rest'
+            tag, rest = field.group(1).lower(), field.group(2).split()
+            if tag in ('returns', 'return', 'rtype'):
+                result['returns'] = True
+            elif tag in ('raises', 'raise', 'except', 'exception'):
+                result['raises'].extend(rest[-1:])
+            elif rest:
+                # ":param type name:" -> last word is the name
+                result['params'].append(rest[-1])
+            section = None
+            continue
+
+        # NumPy header: title followed by a dashed underline. Unknown
+        # titles (Notes, Examples, ...) still end the previous section.
+        if i < len(lines) and lines[i].lstrip().startswith('---') and _UNDERLINE.match(lines[i].strip()):
+            i += 1
+            section = None
+            if _NUMPY_HEADER.match(stripped):
+                result['style'] = result['style'] or 'numpy'
+                section, section_style = _SECTION_KINDS[stripped.lower()], 'numpy'
+                header_indent, entry_indent = _indent(line), _indent(line)
+                if section == 'returns':
+                    result['returns'] = True
+            continue
+
+        header = _GOOGLE_HEADER.match(stripped) if stripped[-1] == ':' else None
+        if header:
+            result['style'] = result['style'] or 'google'
+            section, section_style = _SECTION_KINDS[header.group(1).lower()], 'google'
+            header_indent, entry_indent = _indent(line), None
+            if section == 'returns':
+                result['returns'] = True
+            continue
+
+        if section is None:
+            continue
+
+        indent = _indent(line)
+        if section_style == 'google' and indent <= header_indent:
+            # Dedent back to the header's level ends the section
+            section = None
+            continue
+        if entry_indent is None:
+            entry_indent = indent
+        if indent != entry_indent:
+            # Continuation line of the previous entry
+            continue
+
+        if section == 'params':
+            if section_style == 'numpy':
+                match = _NUMPY_PARAM.match(stripped)
+                if match:
+                    result['params'].extend(n.strip() for n in match.group(1).split(','))
+            else:
+                match = _GOOGLE_PARAM.match(stripped)
+                if match:
+                    result['params'].append(match.group(1))
+        elif section == 'raises':
+            match = _EXCEPTION.match(stripped)
+            if match:
+                result['raises'].append(match.group(1))
+
+    return result
+
+
+def _bare(name: str) -> str:
+    """Strip the * / ** prefix of a variadic parameter."""
+    return name.lstrip('*')
+
+
+def _similar(a: str, b: str) -> bool:
+    """Loose name match used for rename detection (abbreviations, typos)."""
+    a, b = _bare(a).lower(), _bare(b).lower()
+    return a in b or b in a or SequenceMatcher(None, a, b).ratio() >= 0.6
+
+
+def check_signature(record: Dict, sections: Optional[Dict] = None) -> Dict:
+    """
+    Compare a function's docstring with its signature.
+
+    A documented name that takes the place of an undocumented parameter
+    (same position and a similar name, or the only mismatch on each side)
+    is reported as a rename instead of one missing plus one extra entry. ``self``/``cls``
+    of methods never need documenting.
+
+    Args:
+        record (Dict): Function record from the parser (uses ``docstring``,
+            ``params``/``args``, ``returns``, ``raises``, ``kind``, ``decorators``)
+        sections (Optional[Dict]): Output of ``parse_sections`` if already parsed
+
+    Returns:
+        Dict: Missing, extra and renamed params, return/raises mismatches
+        and an overall ``consistent`` flag
+    """
+
+    if sections is None:
+        sections = parse_sections(record.get('docstring', ''))
+
+    params = list(record.get('params') or [a['name'] for a in record.get('args', [])])
+    decorators = record.get('decorators', [])
+    if record.get('kind') == 'method' and 'staticmethod' not in decorators and params:
+        if params[0] in ('self', 'cls') or 'classmethod' in decorators:
+            params = params[1:]
+
+    documented = sections['params']
+    actual = {_bare(p) for p in params}
+    named = {_bare(d) for d in documented}
+
+    missing = [p for p in params if _bare(p) not in named]
+    extra = [d for d in documented if _bare(d) not in actual]
+
+    renamed = []
+    for index, name in enumerate(documented):
+        if (name in extra and index < len(params) and params[index] in missing
+                and _similar(name, params[index])):
+            renamed.append({'documented': name, 'actual': params[index]})
+    if not renamed and len(missing) == 1 and len(extra) == 1:
+        renamed.append({'documented': extra[0], 'actual': missing[0]})
+    for pair in renamed:
+        missing.remove(pair['actual'])
+        extra.remove(pair['documented'])
+
+    returns = record.get('returns')
+    missing_returns = bool(
+        sections['style'] and returns and returns != 'None' and not sections['returns']
+    )
+    extra_returns = returns == 'None' and sections['returns']
+
+    documented_raises = {r.split('.')[-1] for r in sections['raises']}
+    missing_raises = sorted(
+        r for r in record.get('raises', []) if sections['style'] and r not in documented_raises
+    )
+
+    return {
+        'style': sections['style'],
+        'missing': missing,
+        'extra': extra,
+        'renamed': renamed,
+        'missing_returns': missing_returns,
+        'extra_returns': extra_returns,
+        'missing_raises': missing_raises,
+        'consistent': not (missing or extra or renamed or missing_returns
+                           or extra_returns or missing_raises)
+    }
+
+
+def describe_issues(check: Dict) -> List[str]:
+    """
+    Turn a ``check_signature`` result into readable messages.
+
+    Args:
+        check (Dict): Output of ``check_signature``
+
+    Returns:
+        List[str]: One message per problem
+    """
+
+    messages = [f"Parameter '{p}' is not documented" for p in check['missing']]
+    messages += [f"Documented parameter '{p}' is not in the signature" for p in check['extra']]
+    messages += [
+        f"Documented parameter '{r['documented']}' looks renamed to '{r['actual']}'"
+        for r in check['renamed']
+    ]
+    if check['missing_returns']:
+        messages.append("Return value is not documented")
+    if check['extra_returns']:
+        messages.append("Return value is documented but the function returns None")
+    messages += [f"Raised exception '{e}' is not documented" for e in check['missing_raises']]
+    return messages
@@ -2,18 +2,31 @@
 Python AST Parser - Milestone 1
 
 Extracts:
-- Functions (top-level, class methods, nested)
+- Functions (top-level, class methods, nested; sync and async)
 - Docstrings
 - Arguments with type hints
 - Return types
 - Decorators
 - Line numbers
+- Import statements
+- Call sites by callee name (function fan-in)
+- Class/module docstrings and publicity
+- Docstring/signature consistency
+- Docstring-independent source hashes (generation cache keys)
 """
 
 import ast
+import hashlib
 import os
+from collections import Counter, deque
 from typing import List, Dict, Optional
 
+from core.parser.docstring_parser import check_signature, classify_style
+
+
+# Dunder methods pydocstyle treats as regular (non-magic) methods
+VARIADIC_MAGIC_METHODS = ('__init__', '__call__', '__new__')
+
 
 def parse_file(file_path: str) -> Optional[Dict]:
     """
@@ -30,21 +43,7 @@ def parse_file(file_path: str) -> Optional[Dict]:
         with open(file_path, 'r', encoding='utf-8') as f:
             source = f.read()
         
-        tree = ast.parse(source, filename=file_path)
-        
-        result = {
-            'file_path': file_path,
-            'functions': []
-        }
-        
-        # Extract all functions
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                func_info = extract_function_info(node, source)
-                if func_info:
-                    result['functions'].append(func_info)
-        
-        return result
+        return parse_source(source, file_path)
         
     except SyntaxError as e:
         print(f"⚠️  Syntax error in {file_path}: {e}")
@@ -54,18 +53,366 @@ def parse_file(file_path: str) -> Optional[Dict]:
         return None
 
 
-def extract_function_info(node: ast.FunctionDef, source: str) -> Dict:
+def parse_source(source: str, file_path: str = '<string>') -> Dict:
+    """
+    Parse source code that is already in memory.
+    
+    Walks the tree in the same breadth-first order as ``ast.walk`` while
+    tracking each node's enclosing class or function, so methods, nested
+    definitions and publicity are known without a second pass.
+    
+    Args:
+        source (str): Python source code
+        file_path (str): Path reported in the result
+        
+    Returns:
+        Dict: Parsed metadata
+        
+    Raises:
+        SyntaxError: If the source cannot be parsed
+    """
+    
+    tree = ast.parse(source, filename=file_path)
+    lines = source.split('\n')
+    dunder_all = extract_dunder_all(tree)
+    
+    result = {
+        'file_path': file_path,
+        'content_hash': content_hash(source),
+        'line_count': len(lines) if source else 0,
+        'module': extract_module_info(tree, file_path, lines, dunder_all),
+        'functions': [],
+        'classes': [],
+        'imports': [],
+        'calls': {}
+    }
+    
+    # Publicity of already visited classes/functions, by node id
+    public = {}
+    calls = Counter()
+    
+    # Extract all functions, classes and imports
+    queue = deque([(tree, None)])
+    while queue:
+        node, owner = queue.popleft()
+        child_owner = owner
+        
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            func_info = extract_function_info(node, source, owner, public, dunder_all, lines)
+            if func_info:
+                result['functions'].append(func_info)
+            public[id(node)] = func_info['is_public']
+            child_owner = node
+        elif isinstance(node, ast.ClassDef):
+            class_info = extract_class_info(node, owner, public, dunder_all, lines)
+            result['classes'].append(class_info)
+            public[id(node)] = class_info['is_public']
+            child_owner = node
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            result['imports'].extend(extract_imports(node))
+        elif isinstance(node, ast.Call):
+            # f(...) and obj.f(...) both count as calls to f
+            if isinstance(node.func, ast.Name):
+                calls[node.func.id] += 1
+            elif isinstance(node.func, ast.Attribute):
+                calls[node.func.attr] += 1
+        
+        queue.extend((child, child_owner) for child in ast.iter_child_nodes(node))
+    
+    result['calls'] = dict(calls)
+    return result
+
+
+def extract_docstring_info(node, lines: List[str]) -> Dict:
+    """
+    Locate the raw docstring literal of a module, class or function.
+    
+    Args:
+        node (ast.AST): Module, ClassDef or FunctionDef node
+        lines (List[str]): Source split on newlines
+        
+    Returns:
+        Dict: Raw literal (quotes and prefix included) and its line span
+    """
+    
+    body = getattr(node, 'body', None)
+    if (
+        body
+        and isinstance(body[0], ast.Expr)
+        and isinstance(body[0].value, ast.Constant)
+        and isinstance(body[0].value.value, str)
+    ):
+        literal = body[0].value
+        return {
+            'docstring_raw': get_source_segment(lines, literal),
+            'docstring_line': literal.lineno,
+            'docstring_end_line': literal.end_lineno
+        }
+    
+    return {
+        'docstring_raw': None,
+        'docstring_line': None,
+        'docstring_end_line': None
+    }
+
+
+def content_hash(source: str) -> str:
+    """
+    Hash of a file's exact text (tells whether parse records are stale).
+    
+    Args:
+        source (str): Python source code
+        
+    Returns:
+        str: Hex digest
+    """
+    
+    return hashlib.blake2b(source.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def normalized_source_hash(node, lines: List[str], docstring_line: Optional[int] = None,
+                           docstring_end_line: Optional[int] = None) -> str:
+    """
+    Hash a definition's source, ignoring its docstring, comments and indentation.
+    
+    Adding or rewriting the docstring, re-indenting the whole definition or
+    editing comments keeps the hash; any code change alters it.
+    
+    Args:
+        node (ast.AST): FunctionDef or ClassDef node
+        lines (List[str]): Source split on newlines
+        docstring_line (Optional[int]): First line of the docstring literal
+        docstring_end_line (Optional[int]): Last line of the docstring literal
+        
+    Returns:
+        str: Hex digest
+    """
+    
+    first = min([d.lineno for d in node.decorator_list] + [node.lineno]) - 1
+    skip = range(0)
+    if docstring_line and docstring_line != node.lineno:
+        skip = range(docstring_line - 1, docstring_end_line)
+    
+    indent = node.col_offset
+    parts = []
+    for number in range(first, node.end_lineno):
+        if number in skip:
+            continue
+        text = lines[number][indent:].rstrip()
+        if text and not text.lstrip().startswith('#'):
+            parts.append(text)
+    
+    return hashlib.blake2b('\n'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def function_source(node, lines: List[str], docstring_line: Optional[int] = None,
+                    docstring_end_line: Optional[int] = None) -> str:
+    """
+    Source of a definition (decorators included), dedented and without its docstring.
+    
+    Args:
+        node (ast.AST): FunctionDef or ClassDef node
+        lines (List[str]): Source split on newlines
+        docstring_line (Optional[int]): First line of the docstring literal
+        docstring_end_line (Optional[int]): Last line of the docstring literal
+        
+    Returns:
+        str: Source text sent to the LLM as context
+    """
+    
+    first = min([d.lineno for d in node.decorator_list] + [node.lineno]) - 1
+    skip = range(0)
+    if docstring_line and docstring_line != node.lineno:
+        skip = range(docstring_line - 1, docstring_end_line)
+    
+    indent = node.col_offset
+    kept = []
+    for number in range(first, node.end_lineno):
+        if number in skip:
+            continue
+        line = lines[number]
+        # Continuation lines of strings may sit left of the definition
+        kept.append(line[indent:] if not line[:indent].strip() else line)
+    
+    return '\n'.join(kept)
+
+
+def get_source_segment(lines: List[str], node) -> str:
+    """Get the source text of a node from pre-split lines."""
+    first, last = node.lineno - 1, node.end_lineno - 1
+    start = _char_offset(lines[first], node.col_offset)
+    end = _char_offset(lines[last], node.end_col_offset)
+    
+    if first == last:
+        return lines[first][start:end]
+    
+    return '\n'.join([lines[first][start:]] + lines[first + 1:last] + [lines[last][:end]])
+
+
+def _char_offset(line: str, byte_offset: int) -> int:
+    """Convert an AST UTF-8 byte offset into a character offset."""
+    if line.isascii():
+        return byte_offset
+    return len(line.encode('utf-8')[:byte_offset].decode('utf-8', 'replace'))
+
+
+# Statement fields holding indented blocks (not scanned for ``__all__``)
+_BLOCK_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
+
+def _dunder_all_mentions(node) -> int:
+    """Count ``__all__`` names in the unindented part of a module-level statement."""
+    parts = [value for field, value in ast.iter_fields(node) if field not in _BLOCK_FIELDS]
+    count = 0
+    for part in parts:
+        for child in (part if isinstance(part, list) else [part]):
+            if not isinstance(child, ast.AST):
+                continue
+            for inner in ast.walk(child):
+                if (isinstance(inner, ast.Name) and inner.id == '__all__') or (
+                    isinstance(inner, ast.Attribute) and inner.attr == '__all__'
+                ):
+                    count += 1
+    return count
+
+
+def extract_dunder_all(tree: ast.Module) -> Optional[List[str]]:
+    """
+    Get the names in a module-level ``__all__``, as pydocstyle reads it.
+    
+    Only a single assignment of a literal list or tuple of strings counts.
+    If ``__all__`` is touched again at module level (``+=``, ``.extend()``,
+    reassignment) or is not a literal, it is dynamic and None is returned.
+    
+    Args:
+        tree (ast.Module): Parsed module
+        
+    Returns:
+        Optional[List[str]]: Names, or None if undefined or dynamic
+    """
+    
+    names = None
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        mentions = _dunder_all_mentions(node)
+        if not mentions:
+            continue
+        is_literal = (
+            names is None
+            and mentions == 1
+            and isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and isinstance(node.value, (ast.List, ast.Tuple))
+            and all(isinstance(elt, ast.Constant) and isinstance(elt.value, str) for elt in node.value.elts)
+        )
+        if not is_literal:
+            return None
+        names = [elt.value for elt in node.value.elts]
+    return names
+
+
+def extract_module_info(tree: ast.Module, file_path: str, lines: List[str],
+                        dunder_all: Optional[List[str]]) -> Dict:
+    """
+    Extract module-level docstring metadata.
+    
+    Args:
+        tree (ast.Module): Parsed module
+        file_path (str): Path to Python file
+        lines (List[str]): Source split on newlines
+        dunder_all (Optional[List[str]]): Names in ``__all__``
+        
+    Returns:
+        Dict: Module metadata
+    """
+    
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    docstring = ast.get_docstring(tree)
+    
+    return {
+        'name': name,
+        'is_package': name == '__init__',
+        'is_public': not name.startswith('_') or (name.startswith('__') and name.endswith('__')),
+        'has_docstring': docstring is not None and len(docstring.strip()) > 0,
+        'docstring': docstring or '',
+        'dunder_all': dunder_all,
+        **extract_docstring_info(tree, lines)
+    }
+
+
+def _is_public_name(name: str, dunder_all: Optional[List[str]]) -> bool:
+    """Apply pydocstyle's module-level publicity rule."""
+    if dunder_all is not None:
+        return name in dunder_all
+    return not name.startswith('_')
+
+
+def extract_class_info(node: ast.ClassDef, owner, public: Dict, dunder_all: Optional[List[str]],
+                       lines: List[str]) -> Dict:
+    """
+    Extract docstring metadata from a class node.
+    
+    Args:
+        node (ast.ClassDef): AST class node
+        owner (Optional[ast.AST]): Enclosing class or function, if any
+        public (Dict): Publicity of visited definitions, by node id
+        dunder_all (Optional[List[str]]): Names in ``__all__``
+        lines (List[str]): Source split on newlines
+        
+    Returns:
+        Dict: Class metadata
+    """
+    
+    if owner is None:
+        kind = 'class'
+        is_public = _is_public_name(node.name, dunder_all)
+    else:
+        kind = 'nested_class'
+        is_public = (
+            not node.name.startswith('_')
+            and isinstance(owner, ast.ClassDef)
+            and public.get(id(owner), False)
+        )
+    
+    docstring = ast.get_docstring(node)
+    
+    return {
+        'name': node.name,
+        'kind': kind,
+        'is_public': is_public,
+        'has_docstring': docstring is not None and len(docstring.strip()) > 0,
+        'docstring': docstring or '',
+        'decorators': [get_decorator_name(dec) for dec in node.decorator_list],
+        'start_line': node.lineno - 1,
+        'def_line': node.lineno,
+        'end_line': node.end_lineno,
+        'indent': node.col_offset,
+        **extract_docstring_info(node, lines)
+    }
+
+
+def extract_function_info(node, source: str, owner=None, public: Optional[Dict] = None,
+                          dunder_all: Optional[List[str]] = None, lines: Optional[List[str]] = None) -> Dict:
     """
     Extract detailed information from a function node.
     
     Args:
-        node (ast.FunctionDef): AST function node
+        node (ast.FunctionDef): AST function node (or AsyncFunctionDef)
         source (str): Source code
+        owner (Optional[ast.AST]): Enclosing class or function, if any
+        public (Optional[Dict]): Publicity of visited definitions, by node id
+        dunder_all (Optional[List[str]]): Names in ``__all__``
+        lines (Optional[List[str]]): Source split on newlines
         
     Returns:
         Dict: Function metadata
     """
     
+    if lines is None:
+        lines = source.split('\n')
+    
     # Get docstring
     docstring = ast.get_docstring(node)
     has_docstring = docstring is not None and len(docstring.strip()) > 0
@@ -79,6 +426,14 @@ def extract_function_info(node: ast.FunctionDef, source: str) -> Dict:
         }
         args.append(arg_info)
     
+    # Every parameter name in signature order (variadics keep their stars)
+    params = [a.arg for a in node.args.posonlyargs + node.args.args]
+    if node.args.vararg:
+        params.append(f"*{node.args.vararg.arg}")
+    params += [a.arg for a in node.args.kwonlyargs]
+    if node.args.kwarg:
+        params.append(f"**{node.args.kwarg.arg}")
+    
     # Get return type
     returns = get_annotation(node.returns)
     
@@ -86,23 +441,57 @@ def extract_function_info(node: ast.FunctionDef, source: str) -> Dict:
     decorators = [get_decorator_name(dec) for dec in node.decorator_list]
     
     # Calculate indentation
-    indent = get_indentation(node, source)
+    indent = get_indentation(node, lines)
     
     # Get exceptions raised (if any)
     raises = extract_raises(node)
     
-    return {
+    # Kind and publicity (pydocstyle rules)
+    if owner is None:
+        kind = 'function'
+        is_public = _is_public_name(node.name, dunder_all)
+    elif isinstance(owner, ast.ClassDef):
+        kind = 'method'
+        is_magic = (
+            node.name.startswith('__') and node.name.endswith('__')
+            and node.name not in VARIADIC_MAGIC_METHODS
+        )
+        is_setter = any(dec.startswith(f"{node.name}.") for dec in decorators)
+        is_public = (
+            not is_setter
+            and (not node.name.startswith('_') or node.name in VARIADIC_MAGIC_METHODS or is_magic)
+            and (public or {}).get(id(owner), False)
+        )
+    else:
+        kind = 'nested_function'
+        is_public = False
+    
+    info = {
         'name': node.name,
         'has_docstring': has_docstring,
         'docstring': docstring or '',
+        'docstring_style': classify_style(docstring),
         'args': args,
+        'params': params,
         'returns': returns,
         'decorators': decorators,
         'start_line': node.lineno - 1,  # Line after 'def'
         'end_line': node.end_lineno,
         'indent': indent,
-        'raises': raises
+        'raises': raises,
+        'kind': kind,
+        'is_async': isinstance(node, ast.AsyncFunctionDef),
+        'is_public': is_public,
+        'def_line': node.lineno,
+        **extract_docstring_info(node, lines)
     }
+    info['source_hash'] = normalized_source_hash(node, lines, info['docstring_line'], info['docstring_end_line'])
+    info['source'] = function_source(node, lines, info['docstring_line'], info['docstring_end_line'])
+    
+    # Compare documented params/returns/raises with the signature
+    info['signature_check'] = check_signature(info) if has_docstring else None
+    
+    return info
 
 
 def get_annotation(annotation) -> Optional[str]:
@@ -134,9 +523,8 @@ def get_decorator_name(decorator) -> str:
     return ast.unparse(decorator)
 
 
-def get_indentation(node: ast.FunctionDef, source: str) -> int:
+def get_indentation(node: ast.FunctionDef, lines: List[str]) -> int:
     """Calculate indentation level of function."""
-    lines = source.split('\n')
     if node.lineno <= len(lines):
         line = lines[node.lineno - 1]
         return len(line) - len(line.lstrip())
@@ -159,6 +547,36 @@ def extract_raises(node: ast.FunctionDef) -> List[str]:
     return list(set(raises))  # Remove duplicates
 
 
+def extract_imports(node) -> List[Dict]:
+    """
+    Extract import records from an Import or ImportFrom node.
+    
+    Args:
+        node (ast.Import | ast.ImportFrom): AST import node
+        
+    Returns:
+        List[Dict]: One record per imported module
+    """
+    
+    if isinstance(node, ast.Import):
+        return [
+            {
+                'module': alias.name,
+                'names': [],
+                'level': 0,
+                'line': node.lineno
+            }
+            for alias in node.names
+        ]
+    
+    return [{
+        'module': node.module or '',
+        'names': [alias.name for alias in node.names],
+        'level': node.level,
+        'line': node.lineno
+    }]
+
+
 def parse_path(path: str) -> List[Dict]:
     """
     Parse all Python files in a directory or single file.
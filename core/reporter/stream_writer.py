@@ -0,0 +1,249 @@
+"""
+Streaming Finding Writers - Milestone 3
+
+Writes violations and metric findings one at a time, so memory stays flat
+no matter how many findings there are.
+
+- JsonlWriter: one JSON object per line
+- SarifWriter: SARIF 2.1.0 log for code-scanning tools. Results are written
+  as they arrive; the rule table (bounded by the number of distinct codes)
+  is written after them when the file is closed.
+
+A finding is a dict with ``file``, ``line``, ``code`` and ``message``, the
+same shape the validators return.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, TextIO, Union
+from urllib.parse import quote
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+TOOL_NAME = "ai-code-reviewer"
+TOOL_URI = "https://github.com/FlashyAdi/ai-code-reviewer"
+
+
+def sarif_level(code: str) -> str:
+    """
+    Map a finding code to a SARIF result level.
+
+    Args:
+        code (str): Violation or metric code
+
+    Returns:
+        str: 'error', 'warning' or 'note'
+    """
+
+    if code == 'ERROR':
+        return 'error'
+    if code.startswith('D'):
+        return 'warning'
+    return 'note'
+
+
+class _FindingWriter(ABC):
+    """Shared file handling: writers accept a path or an open text stream."""
+
+    def __init__(self, target: Union[str, TextIO]):
+        if isinstance(target, str):
+            os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+            self._stream = open(target, 'w', encoding='utf-8')
+            self._owns_stream = True
+        else:
+            self._stream = target
+            self._owns_stream = False
+        self.count = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write_all(self, findings: Iterable[Dict]) -> int:
+        """
+        Write every finding from an iterable (consumed lazily).
+
+        Args:
+            findings (Iterable[Dict]): Findings to write
+
+        Returns:
+            int: Total findings written so far
+        """
+
+        for finding in findings:
+            self.write(finding)
+        return self.count
+
+    @abstractmethod
+    def write(self, finding: Dict):
+        """Write one finding."""
+
+    def _finish(self):
+        """Write any trailer; called once by close()."""
+
+    def close(self):
+        """Finish the document and release the stream."""
+        if self._closed:
+            return
+        self._closed = True
+        self._finish()
+        self._stream.flush()
+        if self._owns_stream:
+            self._stream.close()
+
+
+class JsonlWriter(_FindingWriter):
+    """Write findings as JSON Lines."""
+
+    def write(self, finding: Dict):
+        """
+        Append one finding as a line of JSON.
+
+        Args:
+            finding (Dict): Finding to write
+        """
+
+        self._stream.write(json.dumps(finding, ensure_ascii=False))
+        self._stream.write('\n')
+        self.count += 1
+
+
+class SarifWriter(_FindingWriter):
+    """Write findings as a single-run SARIF 2.1.0 log."""
+
+    def __init__(self, target: Union[str, TextIO], base_dir: Optional[str] = None,
+                 rule_descriptions: Optional[Dict[str, str]] = None):
+        super().__init__(target)
+        self.base_dir = os.path.abspath(base_dir) if base_dir else None
+        self.rule_descriptions = dict(rule_descriptions or {})
+        # code -> index in the rule table written at close()
+        self.rules: Dict[str, int] = {}
+        self._rule_messages: Dict[str, str] = {}
+
+        self._stream.write(
+            '{"version": "2.1.0", "$schema": ' + json.dumps(SARIF_SCHEMA)
+            + ', "runs": [{"results": ['
+        )
+
+    def _uri(self, file_path: str) -> Dict:
+        """Artifact location for a file, relative to base_dir when set."""
+        if self.base_dir:
+            rel = os.path.relpath(os.path.abspath(file_path), self.base_dir)
+            return {'uri': quote(rel.replace(os.sep, '/')), 'uriBaseId': 'SRCROOT'}
+        return {'uri': quote(file_path.replace(os.sep, '/'))}
+
+    def write(self, finding: Dict):
+        """
+        Append one finding as a SARIF result.
+
+        Args:
+            finding (Dict): Finding to write
+        """
+
+        code = finding.get('code', 'ERROR')
+        if code not in self.rules:
+            self.rules[code] = len(self.rules)
+            self._rule_messages[code] = finding.get('message', '')
+
+        location = {'artifactLocation': self._uri(finding.get('file', ''))}
+        line = finding.get('line')
+        if isinstance(line, int) and line > 0:
+            location['region'] = {'startLine': line}
+
+        result = {
+            'ruleId': code,
+            'ruleIndex': self.rules[code],
+            'level': sarif_level(code),
+            'message': {'text': finding.get('message', '')},
+            'locations': [{'physicalLocation': location}]
+        }
+
+        if self.count:
+            self._stream.write(', ')
+        self._stream.write(json.dumps(result, ensure_ascii=False))
+        self.count += 1
+
+    def _finish(self):
+        """Close the results array and write the tool's rule table."""
+        rules = [
+            {
+                'id': code,
+                'shortDescription': {
+                    'text': self.rule_descriptions.get(code) or self._rule_messages[code]
+                }
+            }
+            for code in self.rules
+        ]
+        tool = {'driver': {'name': TOOL_NAME, 'informationUri': TOOL_URI, 'rules': rules}}
+        run_tail = {'tool': tool}
+        if self.base_dir:
+            run_tail['originalUriBaseIds'] = {
+                'SRCROOT': {'uri': 'file://' + quote(self.base_dir.replace(os.sep, '/')) + '/'}
+            }
+
+        # Splice the remaining run properties in after "results"
+        tail = json.dumps(run_tail, ensure_ascii=False)
+        self._stream.write('], ' + tail[1:] + ']}\n')
+
+
+def open_writer(path: str, base_dir: Optional[str] = None,
+                rule_descriptions: Optional[Dict[str, str]] = None) -> _FindingWriter:
+    """
+    Open a writer chosen by file extension (.sarif / .sarif.json -> SARIF, else JSONL).
+
+    Args:
+        path (str): Output path
+        base_dir (Optional[str]): Root that SARIF URIs are made relative to
+        rule_descriptions (Optional[Dict[str, str]]): Code -> rule description
+
+    Returns:
+        _FindingWriter: Writer to use as a context manager
+    """
+
+    if path.endswith(('.sarif', '.sarif.json')):
+        return SarifWriter(path, base_dir, rule_descriptions)
+    return JsonlWriter(path)
+
+
+def write_findings(findings: Iterable[Dict], path: str, base_dir: Optional[str] = None,
+                   rule_descriptions: Optional[Dict[str, str]] = None) -> int:
+    """
+    Stream findings into a SARIF or JSONL file.
+
+    Args:
+        findings (Iterable[Dict]): Findings (a generator keeps memory flat)
+        path (str): Output path; the extension selects the format
+        base_dir (Optional[str]): Root that SARIF URIs are made relative to
+        rule_descriptions (Optional[Dict[str, str]]): Code -> rule description
+
+    Returns:
+        int: Number of findings written
+    """
+
+    with open_writer(path, base_dir, rule_descriptions) as writer:
+        writer.write_all(findings)
+    print(f"✅ {writer.count} findings written to: {path}")
+    return writer.count
+
+
+if __name__ == '__main__':
+    import sys
+    from itertools import chain
+    from core.parser.python_parser import parse_path
+    from core.validator.validator import iter_violations
+    from core.validator.native_rules import MESSAGES
+    from core.metrics.code_metrics import iter_complexity_findings
+
+    target = sys.argv[1] if len(sys.argv) > 1 else '.'
+    output = sys.argv[2] if len(sys.argv) > 2 else 'storage/findings.sarif'
+
+    paths = [f['file_path'] for f in parse_path(target)]
+    descriptions = {code: text for code, (text, _) in MESSAGES.items()}
+    descriptions['C901'] = 'Function is too complex'
+
+    findings = chain(iter_violations(paths, backend='native'), iter_complexity_findings(paths))
+    write_findings(findings, output, base_dir=target if os.path.isdir(target) else None,
+                   rule_descriptions=descriptions)
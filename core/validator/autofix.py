@@ -0,0 +1,346 @@
+"""
+Docstring Auto-Fixer - Milestone 2
+
+Fixes mechanical PEP-257 violations locally instead of regenerating the
+whole docstring through the LLM.
+
+Violations come from the native rules, so every docstring's exact source
+span is already known. Fixes rewrite just that literal, and all edits for a
+file are applied in one write:
+- D200 one-liner spread over several lines
+- D205 missing/extra blank line after the summary
+- D209 closing quotes not on their own line
+- D210 whitespace around the text
+- D400 summary without a trailing period
+- D403 uncapitalized first word
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from core.parser.python_parser import parse_source
+from core.validator import native_rules
+
+FIXABLE_CODES = ('D200', 'D205', 'D209', 'D210', 'D400', 'D403')
+
+_LITERAL = re.compile(r'^([rRuU]*)("""|\'\'\')(.*)\2$', re.DOTALL)
+
+# Summary endings that suggest a sentence continues, so adding a period
+# would be a guess
+_OPEN_ENDINGS = (':', ',', ';', '\\', '-', '(')
+
+
+def _summary_index(lines: List[str]) -> int:
+    """Index of the first non-blank line."""
+    for i, line in enumerate(lines):
+        if line.strip():
+            return i
+    return 0
+
+
+def _fix_one_liner(content: str, indent: str, params: tuple) -> str:
+    """D200: put the only line of text next to the quotes."""
+    return content.strip()
+
+
+def _fix_whitespace(content: str, indent: str, params: tuple) -> str:
+    """D210: drop spaces between the quotes and the text."""
+    content = content.lstrip(' ')
+    if '\n' not in content:
+        content = content.rstrip(' ')
+    return content
+
+
+def _fix_capitalized(content: str, indent: str, params: tuple) -> str:
+    """D403: capitalize the first word."""
+    capitalized, original = params
+    match = re.match(r'\s*', content)
+    start = match.end()
+    if content[start:start + len(original)] == original:
+        return content[:start] + capitalized + content[start + len(original):]
+    return content
+
+
+def _fix_period(content: str, indent: str, params: tuple) -> str:
+    """D400: end the summary line with a period."""
+    lines = content.split('\n')
+    i = _summary_index(lines)
+    summary = lines[i].rstrip()
+    if not summary or summary.endswith(_OPEN_ENDINGS):
+        return content
+    lines[i] = summary + '.' + lines[i][len(summary):]
+    return '\n'.join(lines)
+
+
+def _fix_blank_after_summary(content: str, indent: str, params: tuple) -> str:
+    """D205: exactly one blank line between summary and description."""
+    lines = content.split('\n')
+    i = _summary_index(lines)
+    end = i + 1
+    while end < len(lines) and not lines[end].strip():
+        end += 1
+    return '\n'.join(lines[:i + 1] + [''] + lines[end:])
+
+
+def _fix_closing_quotes(content: str, indent: str, params: tuple) -> str:
+    """D209: move the closing quotes to their own line."""
+    return content.rstrip(' \t') + '\n' + indent
+
+
+# Applied in this order, each to the output of the previous one
+FIXERS = (
+    ('D200', _fix_one_liner),
+    ('D210', _fix_whitespace),
+    ('D403', _fix_capitalized),
+    ('D400', _fix_period),
+    ('D205', _fix_blank_after_summary),
+    ('D209', _fix_closing_quotes),
+)
+
+
+def _definition_line(record: Dict) -> int:
+    """Line that violations of a definition are reported on."""
+    return record.get('docstring_line') or record.get('def_line') or 1
+
+
+def _definition_lines(file_data: Dict) -> List[int]:
+    """Violation lines of every definition, in ``iter_definitions`` order."""
+    records = [file_data['module']] if file_data.get('module') else []
+    records += file_data.get('classes', []) + file_data.get('functions', [])
+    return [_definition_line(record) for record in records]
+
+
+def _span(defn: native_rules.Definition) -> Tuple[int, int, int, int]:
+    """(start line, start col, end line, end col) of a docstring literal, 0-based."""
+    raw_lines = defn.raw.split('\n')
+    start = defn.record['docstring_line'] - 1
+    end = defn.record['docstring_end_line'] - 1
+    start_col = defn.lines[start].find(raw_lines[0])
+    end_col = start_col + len(raw_lines[0]) if start == end else len(raw_lines[-1])
+    return start, start_col, end, end_col
+
+
+def plan_fixes(file_data: Dict, source: str, violations: List[Dict],
+               codes: Iterable[str] = FIXABLE_CODES) -> List[Dict]:
+    """
+    Work out the literal replacements for one file.
+
+    Args:
+        file_data (Dict): Output of ``parse_source``
+        source (str): Source the records were parsed from
+        violations (List[Dict]): Native violations for the file
+        codes (Iterable[str]): Codes to fix
+
+    Returns:
+        List[Dict]: Edits with span, new text and the codes they fix
+    """
+
+    codes = set(codes)
+    found: Dict[int, Dict[str, tuple]] = {}
+    for v in violations:
+        if v['code'] in codes:
+            found.setdefault(v['line'], {})[v['code']] = v.get('params', ())
+
+    lines = source.split('\n')
+    edits = []
+    for defn in native_rules.iter_definitions(file_data, lines):
+        wanted = found.get(_definition_line(defn.record))
+        if not wanted or not defn.raw:
+            continue
+
+        match = _LITERAL.match(defn.raw)
+        if not match:
+            continue
+        prefix, quotes, content = match.groups()
+
+        # "Summary\n    continued" is a wrapped summary, not a missing
+        # blank line and period: leave it for a rewrite
+        if 'D400' in wanted and wanted.get('D205') == (0,):
+            wanted = {c: p for c, p in wanted.items() if c not in ('D400', 'D205')}
+
+        applied = []
+        for code, fixer in FIXERS:
+            if code in wanted:
+                fixed = fixer(content, defn.indent, wanted[code])
+                if fixed != content:
+                    content = fixed
+                    applied.append(code)
+
+        if applied:
+            start, start_col, end, end_col = _span(defn)
+            edits.append({
+                'start': (start, start_col),
+                'end': (end, end_col),
+                'text': f"{prefix}{quotes}{content}{quotes}",
+                'codes': applied
+            })
+
+    return edits
+
+
+def apply_edits(source: str, edits: List[Dict]) -> str:
+    """
+    Apply non-overlapping span edits to a source string.
+
+    Args:
+        source (str): Original source
+        edits (List[Dict]): Output of ``plan_fixes``
+
+    Returns:
+        str: Edited source
+    """
+
+    lines = source.split('\n')
+    for edit in sorted(edits, key=lambda e: e['start'], reverse=True):
+        (start, start_col), (end, end_col) = edit['start'], edit['end']
+        new = lines[start][:start_col] + edit['text'] + lines[end][end_col:]
+        lines[start:end + 1] = new.split('\n')
+    return '\n'.join(lines)
+
+
+def fix_source(source: str, file_path: str = '<string>',
+               codes: Iterable[str] = FIXABLE_CODES) -> Tuple[str, Dict]:
+    """
+    Fix mechanical violations in a source string.
+
+    Args:
+        source (str): Python source code
+        file_path (str): Path reported in the result
+        codes (Iterable[str]): Codes to fix
+
+    Returns:
+        Tuple[str, Dict]: New source and a report with fixes per code,
+        definitions left with no violations (LLM calls avoided) and the
+        remaining violations
+    """
+
+    report = {
+        'file_path': file_path,
+        'changed': False,
+        'fixed': {},
+        'llm_calls_avoided': 0,
+        'remaining': []
+    }
+
+    try:
+        file_data = parse_source(source, file_path)
+    except SyntaxError as e:
+        print(f"⚠️  Auto-fix skipped {file_path}: {e}")
+        return source, report
+
+    before = native_rules.check_parsed(file_data, source, with_params=True)
+    edits = plan_fixes(file_data, source, before, codes)
+    if not edits:
+        report['remaining'] = [_strip_params(v) for v in before]
+        return source, report
+
+    new_source = apply_edits(source, edits)
+    try:
+        new_data = parse_source(new_source, file_path)
+    except SyntaxError as e:
+        # A fix must never break the file; keep the original
+        print(f"⚠️  Auto-fix produced invalid code for {file_path}, skipped: {e}")
+        report['remaining'] = [_strip_params(v) for v in before]
+        return source, report
+
+    after = native_rules.check_parsed(new_data, new_source)
+
+    # Definitions keep their order, so compare them by position
+    old_lines = _definition_lines(file_data)
+    new_lines = _definition_lines(new_data)
+    had = {i for i, line in enumerate(old_lines) if any(v['line'] == line for v in before)}
+    still = {i for i, line in enumerate(new_lines) if any(v['line'] == line for v in after)}
+
+    for edit in edits:
+        for code in edit['codes']:
+            report['fixed'][code] = report['fixed'].get(code, 0) + 1
+    report['changed'] = True
+    report['llm_calls_avoided'] = len(had - still)
+    report['remaining'] = after
+    return new_source, report
+
+
+def _strip_params(violation: Dict) -> Dict:
+    """Drop the internal message parameters from a violation."""
+    return {k: v for k, v in violation.items() if k != 'params'}
+
+
+def fix_file(file_path: str, dry_run: bool = False,
+             codes: Iterable[str] = FIXABLE_CODES) -> Dict:
+    """
+    Fix one file in place with a single write.
+
+    The file keeps its line endings (CRLF stays CRLF); a file with mixed
+    endings is written with LF.
+
+    Args:
+        file_path (str): Path to Python file
+        dry_run (bool): Report without writing
+        codes (Iterable[str]): Codes to fix
+
+    Returns:
+        Dict: Fix report (see ``fix_source``)
+    """
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            source = f.read()
+            newline = f.newlines if isinstance(f.newlines, str) else '\n'
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"⚠️  Auto-fix could not read {file_path}: {e}")
+        return {'file_path': file_path, 'changed': False, 'fixed': {},
+                'llm_calls_avoided': 0, 'remaining': [], 'error': str(e)}
+
+    new_source, report = fix_source(source, file_path, codes)
+    if report['changed'] and not dry_run:
+        with open(file_path, 'w', encoding='utf-8', newline=newline) as f:
+            f.write(new_source)
+    return report
+
+
+def fix_files(file_paths: Iterable[str], dry_run: bool = False,
+              codes: Iterable[str] = FIXABLE_CODES) -> Dict:
+    """
+    Fix many files and summarize the result.
+
+    Args:
+        file_paths (Iterable[str]): Paths to Python files
+        dry_run (bool): Report without writing
+        codes (Iterable[str]): Codes to fix
+
+    Returns:
+        Dict: Per-file reports, totals per code, changed files and LLM calls avoided
+    """
+
+    files = [fix_file(path, dry_run, codes) for path in file_paths]
+
+    fixed: Dict[str, int] = {}
+    for report in files:
+        for code, count in report['fixed'].items():
+            fixed[code] = fixed.get(code, 0) + count
+
+    return {
+        'files': files,
+        'fixed': fixed,
+        'total_fixed': sum(fixed.values()),
+        'files_changed': [r['file_path'] for r in files if r['changed']],
+        'llm_calls_avoided': sum(r['llm_calls_avoided'] for r in files)
+    }
+
+
+if __name__ == '__main__':
+    import sys
+    from core.parser.python_parser import parse_path
+
+    args = sys.argv[1:]
+    dry_run = '--dry-run' in args
+    targets = [a for a in args if not a.startswith('--')] or ['.']
+
+    paths = [f['file_path'] for target in targets for f in parse_path(target)]
+    result = fix_files(paths, dry_run=dry_run)
+
+    for code, count in sorted(result['fixed'].items()):
+        print(f"   {code}: {count}")
+    verb = "would change" if dry_run else "changed"
+    print(f"\n🔧 {result['total_fixed']} fixes, {verb} {len(result['files_changed'])} files, "
+          f"{result['llm_calls_avoided']} LLM calls avoided")
@@ -0,0 +1,333 @@
+"""
+Validation Cache - Milestone 2
+
+Persistent cache of docstring violations per file.
+
+An entry is reused only when the file content hash, the validator
+backend, the enabled rules and the tool version all match. A stat
+(size + mtime) fingerprint is kept next to the hash, so files untouched
+since the last run are not even re-read.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from core.validator import native_rules
+from core.validator.validator import validate_files, BATCH_SIZE
+from core.validator.scheduler import iter_scheduled, DEFAULT_TIMEOUT
+
+try:
+    import pydocstyle
+except ImportError:
+    pydocstyle = None
+
+
+CACHE_FILE = "storage/validation_cache.json"
+
+# Bump when the shape of cached entries changes
+CACHE_FORMAT = 1
+
+
+def tool_version(backend: str) -> str:
+    """
+    Get the version string of the tool behind a validator backend.
+
+    Args:
+        backend (str): 'pydocstyle' or 'native'
+
+    Returns:
+        str: Version identifier included in cache keys
+    """
+
+    if backend == 'native':
+        return f"native-{native_rules.RULES_VERSION}"
+    return f"pydocstyle-{getattr(pydocstyle, '__version__', 'missing')}"
+
+
+def content_hash(file_path: str) -> Optional[str]:
+    """
+    Hash a file's bytes.
+
+    Args:
+        file_path (str): Path to file
+
+    Returns:
+        Optional[str]: Hex digest, or None if the file cannot be read
+    """
+
+    try:
+        with open(file_path, 'rb') as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    except OSError:
+        return None
+
+
+def _stat_key(file_path: str) -> Optional[List[int]]:
+    """Size and mtime of a file, or None if it is missing."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+class ValidationCache:
+    """
+    Violations per file path, persisted as JSON.
+
+    Entries are kept in memory after the first load; the file is only
+    written when something changed.
+    """
+
+    def __init__(self, path: Optional[str] = CACHE_FILE):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Read entries from disk, dropping an unreadable or stale cache."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('format') == CACHE_FORMAT:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable validation cache: {e}")
+
+    def save(self):
+        """Write the cache to disk if it changed."""
+        if not self.path or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'format': CACHE_FORMAT, 'files': self.entries}, f)
+        self._dirty = False
+
+    @staticmethod
+    def ruleset_key(backend: str, ignore: Optional[List[str]]) -> str:
+        """
+        Build the part of the cache key that does not depend on the file.
+
+        Args:
+            backend (str): Validator backend
+            ignore (Optional[List[str]]): Disabled rule codes
+
+        Returns:
+            str: Key combining backend, enabled rules and tool version
+        """
+
+        rules = ','.join(sorted(ignore or []))
+        return f"{backend}|{rules}|{tool_version(backend)}"
+
+    def lookup(self, file_path: str, backend: str = 'pydocstyle',
+               ignore: Optional[List[str]] = None) -> Optional[List[Dict]]:
+        """
+        Get cached violations for a file if its entry is still valid.
+
+        Args:
+            file_path (str): Path to Python file
+            backend (str): Validator backend
+            ignore (Optional[List[str]]): Disabled rule codes
+
+        Returns:
+            Optional[List[Dict]]: Violations, or None on a miss
+        """
+
+        entry = self.entries.get(file_path)
+        if entry is None or entry['ruleset'] != self.ruleset_key(backend, ignore):
+            return None
+
+        stat = _stat_key(file_path)
+        if stat is not None and entry['stat'] == stat:
+            return entry['violations']
+
+        # Size or mtime changed: only the content hash decides
+        if content_hash(file_path) != entry['hash']:
+            return None
+
+        # Touched but identical content: refresh the stat fingerprint
+        entry['stat'] = stat
+        self._dirty = True
+        return entry['violations']
+
+    def store(self, file_path: str, violations: List[Dict], backend: str = 'pydocstyle',
+              ignore: Optional[List[str]] = None):
+        """
+        Record the violations found for a file.
+
+        Args:
+            file_path (str): Path to Python file
+            violations (List[Dict]): Validation result
+            backend (str): Validator backend
+            ignore (Optional[List[str]]): Disabled rule codes
+        """
+
+        digest = content_hash(file_path)
+        if digest is None:
+            return
+        self.entries[file_path] = {
+            'hash': digest,
+            'ruleset': self.ruleset_key(backend, ignore),
+            'stat': _stat_key(file_path),
+            'violations': violations
+        }
+        self._dirty = True
+
+    def invalidate(self, file_path: str):
+        """
+        Drop the entry for a file (e.g. after a docstring was applied).
+
+        Args:
+            file_path (str): Path to Python file
+        """
+
+        if self.entries.pop(file_path, None) is not None:
+            self._dirty = True
+            self.save()
+
+    def clear(self):
+        """Drop every entry."""
+        self.entries = {}
+        self._dirty = True
+        self.save()
+
+
+_default_cache: Optional[ValidationCache] = None
+
+
+def get_cache() -> ValidationCache:
+    """
+    Get the process-wide cache, loading it from disk on first use.
+
+    Returns:
+        ValidationCache: Shared cache instance
+    """
+
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ValidationCache()
+    return _default_cache
+
+
+def validate_files_cached(file_paths: Iterable[str], ignore: Optional[List[str]] = None,
+                          backend: str = 'pydocstyle', cache: Optional[ValidationCache] = None,
+                          batch_size: int = BATCH_SIZE) -> Dict[str, List[Dict]]:
+    """
+    Validate files, only running the validator on cache misses.
+
+    Args:
+        file_paths (Iterable[str]): Paths to Python files
+        ignore (Optional[List[str]]): PEP-257 codes to skip
+        backend (str): 'pydocstyle' or 'native'
+        cache (Optional[ValidationCache]): Cache to use (defaults to ``get_cache()``)
+        batch_size (int): Files per worker task for the misses
+
+    Returns:
+        Dict[str, List[Dict]]: Violations per file, in input order
+    """
+
+    cache = cache if cache is not None else get_cache()
+    file_paths = list(file_paths)
+
+    results = {}
+    misses = []
+    for path in file_paths:
+        cached = cache.lookup(path, backend, ignore)
+        if cached is None:
+            misses.append(path)
+        else:
+            results[path] = cached
+
+    cache.hits += len(file_paths) - len(misses)
+    cache.misses += len(misses)
+
+    if misses:
+        fresh = validate_files(misses, ignore=ignore, batch_size=batch_size, backend=backend)
+        for path in misses:
+            violations = fresh.get(path, [])
+            results[path] = violations
+            # Tool errors are not cached so they are retried next time
+            if path in fresh and not any(v['code'] == 'ERROR' for v in violations):
+                cache.store(path, violations, backend, ignore)
+
+    cache.save()
+    return {path: results[path] for path in file_paths}
+
+
+def iter_validate_cached(file_paths: Iterable[str], ignore: Optional[List[str]] = None,
+                         backend: str = 'pydocstyle', cache: Optional[ValidationCache] = None,
+                         workers: Optional[int] = None,
+                         timeout: Optional[float] = DEFAULT_TIMEOUT,
+                         parsed: Optional[Dict[str, Dict]] = None) -> Iterator[Dict]:
+    """
+    Stream validation results: cache hits first, then misses as they finish.
+
+    Misses go through the scheduler (largest file first, per-file
+    timeout). Files that time out or fail are reported with an ERROR
+    violation and are not cached. With the native backend, misses that
+    already have parse records are checked in-process from those records
+    instead of being parsed again.
+
+    Args:
+        file_paths (Iterable[str]): Paths to Python files
+        ignore (Optional[List[str]]): PEP-257 codes to skip
+        backend (str): 'pydocstyle' or 'native'
+        cache (Optional[ValidationCache]): Cache to use (defaults to ``get_cache()``)
+        workers (Optional[int]): Worker processes for the misses
+        timeout (Optional[float]): Seconds allowed per file
+        parsed (Optional[Dict[str, Dict]]): ``parse_file`` output by path
+            (records of files edited since are ignored and the file parsed again)
+
+    Yields:
+        Dict: file_path, status ('cached', 'ok', 'error' or 'timeout'),
+        violations and seconds
+    """
+
+    cache = cache if cache is not None else get_cache()
+
+    misses = []
+    for path in file_paths:
+        cached = cache.lookup(path, backend, ignore)
+        if cached is None:
+            misses.append(path)
+            cache.misses += 1
+        else:
+            cache.hits += 1
+            yield {'file_path': path, 'status': 'cached', 'violations': cached, 'seconds': 0.0}
+
+    try:
+        if backend == 'native' and parsed:
+            scheduled = []
+            for path in misses:
+                if path not in parsed:
+                    scheduled.append(path)
+                    continue
+                started = time.perf_counter()
+                violations = native_rules.validate_parsed(parsed[path], ignore)
+                if not any(v['code'] == 'ERROR' for v in violations):
+                    cache.store(path, violations, backend, ignore)
+                yield {'file_path': path, 'status': 'ok', 'violations': violations,
+                       'seconds': round(time.perf_counter() - started, 4)}
+            misses = scheduled
+
+        for item in iter_scheduled(misses, 'validate', workers, timeout, ignore=ignore, backend=backend):
+            path = item['file_path']
+            if item['status'] == 'ok':
+                violations = item['result']
+                if not any(v['code'] == 'ERROR' for v in violations):
+                    cache.store(path, violations, backend, ignore)
+            else:
+                message = f"Timed out after {item['seconds']}s" if item['status'] == 'timeout' else item['result']
+                violations = [{'file': path, 'line': '-', 'code': 'ERROR', 'message': message}]
+            yield {'file_path': path, 'status': item['status'], 'violations': violations,
+                   'seconds': item['seconds']}
+    finally:
+        cache.save()
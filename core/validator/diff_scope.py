@@ -0,0 +1,276 @@
+"""
+Diff-Scoped Validation - Milestone 2
+
+Validate and score only the definitions a git diff touches.
+
+Changed hunks from ``git diff -U0`` are mapped onto the parser's
+function/class spans; only those definitions are checked with the native
+rules and measured with radon, so the cost follows the size of the diff
+rather than the size of the files. Meant for pre-commit hooks:
+
+    python -m core.validator.diff_scope --staged
+    python -m core.validator.diff_scope main..HEAD
+"""
+
+import os
+import re
+import subprocess
+import textwrap
+from typing import Dict, List, Optional, Set
+
+from radon.complexity import cc_visit
+from radon.metrics import mi_visit
+
+from core.parser.python_parser import parse_source
+from core.validator import native_rules
+from core.validator.validator import score_to_grade
+
+_FILE_HEADER = re.compile(r'^\+\+\+ (?:b/)?(.*)$')
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+def _git(repo_path: str, *args: str) -> str:
+    """Run a git command and return its stdout."""
+    result = subprocess.run(
+        ['git', '-C', repo_path, *args],
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+        check=True
+    )
+    return result.stdout
+
+
+def parse_diff(diff_text: str) -> Dict[str, Set[int]]:
+    """
+    Map a zero-context unified diff to changed line numbers.
+
+    Line numbers refer to the new side. A pure deletion marks the line
+    the removed block used to follow, so the enclosing definition still
+    counts as touched.
+
+    Args:
+        diff_text (str): Output of ``git diff -U0``
+
+    Returns:
+        Dict[str, Set[int]]: Repo-relative path -> changed lines
+    """
+
+    changed: Dict[str, Set[int]] = {}
+    current = None
+
+    for line in diff_text.splitlines():
+        header = _FILE_HEADER.match(line)
+        if header:
+            path = header.group(1)
+            current = None if path == '/dev/null' else changed.setdefault(path, set())
+            continue
+
+        hunk = _HUNK_HEADER.match(line)
+        if hunk and current is not None:
+            start = int(hunk.group(1))
+            count = int(hunk.group(2)) if hunk.group(2) is not None else 1
+            if count == 0:
+                current.add(max(start, 1))
+            else:
+                current.update(range(start, start + count))
+
+    return changed
+
+
+def changed_lines(repo_path: str = ".", rev_range: Optional[str] = None,
+                  staged: bool = False) -> Dict[str, Set[int]]:
+    """
+    Collect changed lines of Python files from git.
+
+    Args:
+        repo_path (str): Path inside a git repository
+        rev_range (Optional[str]): Revision or range to diff (e.g. ``main..HEAD``);
+            None diffs the working tree against the index
+        staged (bool): Diff the index against HEAD instead
+
+    Returns:
+        Dict[str, Set[int]]: Repo-relative path -> changed lines
+    """
+
+    args = ['diff', '-U0', '--no-color', '--no-ext-diff', '--diff-filter=d']
+    if staged:
+        args.append('--cached')
+    elif rev_range:
+        args.append(rev_range)
+    args += ['--', '*.py']
+
+    return parse_diff(_git(repo_path, *args))
+
+
+def _read_target(repo_path: str, root: str, path: str,
+                 rev_range: Optional[str], staged: bool) -> str:
+    """Read the new side of a diffed file (index, revision or working tree)."""
+    if staged:
+        return _git(repo_path, 'show', f':{path}')
+
+    if rev_range and '..' in rev_range:
+        end = rev_range.split('..', 1)[1].lstrip('.') or 'HEAD'
+        return _git(repo_path, 'show', f'{end}:{path}')
+
+    with open(os.path.join(root, path), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _touches(lines: Set[int], start: int, end: int) -> bool:
+    """Check whether any changed line falls inside [start, end]."""
+    if end - start < len(lines):
+        return any(n in lines for n in range(start, end + 1))
+    return any(start <= n <= end for n in lines)
+
+
+def select_touched(file_data: Dict, lines: Set[int]) -> Dict:
+    """
+    Keep only the parser records whose span contains a changed line.
+
+    Functions count as touched anywhere in their body. Classes and the
+    module only count when the change is in their header or docstring,
+    so editing one method does not re-check its whole class.
+
+    Args:
+        file_data (Dict): Output of ``parse_source``
+        lines (Set[int]): Changed line numbers
+
+    Returns:
+        Dict: Same shape as ``file_data`` with the untouched records removed
+    """
+
+    module = file_data.get('module')
+    module_end = (module or {}).get('docstring_end_line') or 1
+
+    return {
+        **file_data,
+        'module': module if module and _touches(lines, 1, module_end) else None,
+        'classes': [
+            c for c in file_data['classes']
+            # +1 covers the blank line D204 expects after the docstring
+            if _touches(lines, c['def_line'], (c.get('docstring_end_line') or c['def_line']) + 1)
+        ],
+        'functions': [
+            fn for fn in file_data['functions']
+            if _touches(lines, fn['def_line'], fn['end_line'])
+        ]
+    }
+
+
+def score_function(source_lines: List[str], record: Dict, violations: List[Dict]) -> Dict:
+    """
+    Score one function from its own source span.
+
+    Uses the same formula as ``get_quality_score``, applied to the
+    function instead of the whole file.
+
+    Args:
+        source_lines (List[str]): Lines of the file
+        record (Dict): Parser record of the function
+        violations (List[Dict]): Violations reported for the function
+
+    Returns:
+        Dict: Complexity, maintainability, score and grade
+    """
+
+    segment = textwrap.dedent('\n'.join(source_lines[record['def_line'] - 1:record['end_line']]))
+
+    try:
+        blocks = cc_visit(segment)
+        complexity = blocks[0].complexity if blocks else 1
+        maintainability = round(mi_visit(segment, multi=True), 2)
+    except Exception as e:
+        print(f"⚠️  Could not measure {record['name']}: {e}")
+        complexity, maintainability = 1, 0.0
+
+    score = max(0, 100 - len(violations) * 5 - (10 if complexity > 10 else 0))
+    if maintainability > 0:
+        score = (score + maintainability) / 2
+
+    return {
+        'name': record['name'],
+        'start_line': record['def_line'],
+        'end_line': record['end_line'],
+        'complexity': complexity,
+        'maintainability_index': maintainability,
+        'violations': violations,
+        'score': round(score, 2),
+        'grade': score_to_grade(score)
+    }
+
+
+def validate_diff(repo_path: str = ".", rev_range: Optional[str] = None,
+                  staged: bool = False, ignore: Optional[List[str]] = None) -> Dict:
+    """
+    Validate and score the definitions touched by a diff.
+
+    Args:
+        repo_path (str): Path inside a git repository
+        rev_range (Optional[str]): Revision or range to diff; None for
+            unstaged working tree changes
+        staged (bool): Check the staged changes instead
+        ignore (Optional[List[str]]): PEP-257 codes to skip
+
+    Returns:
+        Dict: Per-file results, all violations, overall score and grade
+    """
+
+    root = _git(repo_path, 'rev-parse', '--show-toplevel').strip()
+    select = native_rules.NATIVE_CODES - set(ignore or ())
+
+    files = []
+    all_violations = []
+    scores = []
+
+    for path, lines in sorted(changed_lines(repo_path, rev_range, staged).items()):
+        file_path = os.path.join(root, path)
+        try:
+            source = _read_target(repo_path, root, path, rev_range, staged)
+            file_data = parse_source(source, file_path)
+        except (OSError, UnicodeDecodeError, SyntaxError, subprocess.CalledProcessError) as e:
+            error = {'file': file_path, 'line': '-', 'code': 'ERROR', 'message': str(e)}
+            files.append({'file_path': file_path, 'functions': [], 'violations': [error]})
+            all_violations.append(error)
+            continue
+
+        touched = select_touched(file_data, lines)
+        violations = native_rules.check_parsed(touched, source, select)
+
+        source_lines = source.split('\n')
+        functions = []
+        for record in touched['functions']:
+            line = record.get('docstring_line') or record['def_line']
+            own = [v for v in violations if v['line'] == line]
+            functions.append(score_function(source_lines, record, own))
+
+        files.append({'file_path': file_path, 'functions': functions, 'violations': violations})
+        all_violations.extend(violations)
+        scores.extend(fn['score'] for fn in functions)
+
+    score = round(sum(scores) / len(scores), 2) if scores else 100.0
+    return {
+        'files': files,
+        'violations': all_violations,
+        'functions_checked': len(scores),
+        'score': score,
+        'grade': score_to_grade(score)
+    }
+
+
+if __name__ == '__main__':
+    import sys
+
+    args = sys.argv[1:]
+    staged = '--staged' in args
+    ranges = [a for a in args if not a.startswith('--')]
+    result = validate_diff('.', ranges[0] if ranges else None, staged)
+
+    for v in result['violations']:
+        print(f"{v['file']}:{v['line']}: {v['code']} {v['message']}")
+
+    print(f"\n🔍 {result['functions_checked']} touched functions  "
+          f"score {result['score']} ({result['grade']})  violations {len(result['violations'])}")
+
+    sys.exit(1 if result['violations'] else 0)
@@ -0,0 +1,522 @@
+"""
+Native PEP-257 Rules - Milestone 2
+
+Checks docstrings straight from the parser's records and the source
+buffer, without re-tokenizing the file the way pydocstyle does.
+
+Codes and messages match pydocstyle, so results can be mixed with (or
+compared against) ``validator.validate_docstrings``. Covered codes are
+listed in NATIVE_CODES; D401 (imperative mood, needs a verb dictionary)
+and the section rules D412/D414 are left to pydocstyle.
+"""
+
+import ast
+import re
+import string
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from core.parser.python_parser import content_hash, parse_source, VARIADIC_MAGIC_METHODS
+
+
+# code -> (short description, context template)
+MESSAGES = {
+    'D100': ('Missing docstring in public module', None),
+    'D101': ('Missing docstring in public class', None),
+    'D102': ('Missing docstring in public method', None),
+    'D103': ('Missing docstring in public function', None),
+    'D104': ('Missing docstring in public package', None),
+    'D105': ('Missing docstring in magic method', None),
+    'D106': ('Missing docstring in public nested class', None),
+    'D107': ('Missing docstring in __init__', None),
+    'D200': ('One-line docstring should fit on one line with quotes', 'found {0}'),
+    'D201': ('No blank lines allowed before function docstring', 'found {0}'),
+    'D202': ('No blank lines allowed after function docstring', 'found {0}'),
+    'D204': ('1 blank line required after class docstring', 'found {0}'),
+    'D205': ('1 blank line required between summary line and description', 'found {0}'),
+    'D206': ('Docstring should be indented with spaces, not tabs', None),
+    'D207': ('Docstring is under-indented', None),
+    'D208': ('Docstring is over-indented', None),
+    'D209': ('Multi-line docstring closing quotes should be on a separate line', None),
+    'D210': ('No whitespaces allowed surrounding docstring text', None),
+    'D211': ('No blank lines allowed before class docstring', 'found {0}'),
+    'D300': ('Use """triple double quotes"""', 'found {0}-quotes'),
+    'D301': ('Use r""" if any backslashes in a docstring', None),
+    'D400': ('First line should end with a period', 'not {0!r}'),
+    'D402': ('First line should not be the function\'s "signature"', None),
+    'D403': ('First word of the first line should be properly capitalized', '{0!r}, not {1!r}'),
+    'D419': ('Docstring is empty', None),
+}
+
+NATIVE_CODES = frozenset(MESSAGES)
+
+# Bump when a rule's behaviour changes (part of validation cache keys)
+RULES_VERSION = '2'
+
+# Profile key for the missing-docstring check, which decides all of D100-D107
+MISSING_GROUP = '/'.join(f'D10{n}' for n in range(8))
+
+FUNCTION_KINDS = ('function', 'method', 'nested_function')
+CLASS_KINDS = ('class', 'nested_class')
+
+_BLANK_THEN_DEF = re.compile(r"\s+(?:(?:class|def|async def)\s|@)")
+_LEADING_SPACE = re.compile(r'\s*')
+_BACKSLASH = re.compile(r'\\[^\nuN]')
+_DOUBLE_QUOTED = re.compile(r'[uU]?[rR]?"""[^"].*')
+_SINGLE_QUOTED = re.compile(r"[uU]?[rR]?'''[^'].*")
+_QUOTES = re.compile(r"""[uU]?[rR]?("+|'+).*""")
+
+# Rules in evaluation order: (code, kinds, check function)
+RULES: List[tuple] = []
+
+
+def rule(code: str, kinds: Optional[tuple] = None):
+    """
+    Register a rule function for one violation code.
+
+    Rule functions take a definition context and return the message
+    parameters (a tuple) when the rule is violated, or None.
+
+    Args:
+        code (str): pydocstyle code the rule reports
+        kinds (Optional[tuple]): Definition kinds it applies to (all if None)
+
+    Returns:
+        Callable: Decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        RULES.append((code, kinds, func))
+        return func
+
+    return decorator
+
+
+def is_blank(text: str) -> bool:
+    """Check whether a line holds only whitespace."""
+    return not text.strip()
+
+
+class Definition:
+    """Docstring context for one module, class or function record."""
+
+    __slots__ = ('record', 'kind', 'lines', 'raw', 'value', 'indent')
+
+    def __init__(self, record: Dict, kind: str, lines: List[str]):
+        self.record = record
+        self.kind = kind
+        self.lines = lines
+        self.raw = record.get('docstring_raw')
+        self.value = ast.literal_eval(self.raw) if self.raw else None
+
+        self.indent = ''
+        if self.raw:
+            line = lines[record['docstring_line'] - 1]
+            self.indent = line[:line.find(self.raw.split('\n')[0])]
+
+    @property
+    def name(self) -> str:
+        return self.record.get('name', '')
+
+    def blanks_before(self) -> int:
+        """Count blank lines directly above the docstring."""
+        count = 0
+        line = self.record['docstring_line'] - 1
+        while line > 0 and is_blank(self.lines[line - 1]):
+            count += 1
+            line -= 1
+        return count
+
+    def text_after(self) -> str:
+        """Source after the docstring up to the end of the definition."""
+        end_line = self.record['docstring_end_line']
+        tail = self.lines[end_line - 1]
+        last_raw_line = self.raw.split('\n')[-1]
+        tail = tail[tail.find(last_raw_line) + len(last_raw_line):]
+        following = self.lines[end_line:self.record['end_line']]
+        return '\n'.join([tail] + following)
+
+
+# ======================================================
+# D1xx - missing docstrings (terminal)
+# ======================================================
+def missing_code(defn: Definition) -> Optional[str]:
+    """Return the D10x code for a public definition without a docstring."""
+    record = defn.record
+    if defn.raw or not record.get('is_public'):
+        return None
+
+    decorators = record.get('decorators', [])
+    is_overload = any(dec.split('.')[-1] == 'overload' for dec in decorators)
+
+    if defn.kind == 'module':
+        return 'D104' if record.get('is_package') else 'D100'
+    if defn.kind == 'class':
+        return 'D101'
+    if defn.kind == 'nested_class':
+        return 'D106'
+    if defn.kind == 'method':
+        name = defn.name
+        if name.startswith('__') and name.endswith('__') and name not in VARIADIC_MAGIC_METHODS:
+            return 'D105'
+        if name == '__init__':
+            return 'D107'
+        return None if is_overload else 'D102'
+    if defn.kind == 'function':
+        return None if is_overload else 'D103'
+    return None
+
+
+# ======================================================
+# D2xx - whitespace
+# ======================================================
+@rule('D200')
+def check_one_liner(defn: Definition):
+    """D200: One-liner docstrings should fit on one line with quotes."""
+    lines = defn.value.split('\n')
+    if len(lines) > 1 and sum(1 for line in lines if not is_blank(line)) == 1:
+        return (len(lines),)
+
+
+@rule('D201', FUNCTION_KINDS)
+def check_no_blank_before_function(defn: Definition):
+    """D201: No blank lines allowed before function docstring."""
+    count = defn.blanks_before()
+    if count:
+        return (count,)
+
+
+def _blanks_after(defn: Definition):
+    """Return (blank flags, leading blank count, text after docstring)."""
+    after = defn.text_after()
+    blanks = [is_blank(line) for line in after.split('\n')[1:]]
+    count = 0
+    for blank in blanks:
+        if not blank:
+            break
+        count += 1
+    return blanks, count, after
+
+
+@rule('D202', FUNCTION_KINDS)
+def check_no_blank_after_function(defn: Definition):
+    """D202: No blank lines allowed after function docstring (except before an inner def/class)."""
+    blanks, count, after = _blanks_after(defn)
+    if not all(blanks) and count != 0:
+        if not (count == 1 and _BLANK_THEN_DEF.match(after)):
+            return (count,)
+
+
+@rule('D211', CLASS_KINDS)
+def check_no_blank_before_class(defn: Definition):
+    """D211: No blank lines allowed before class docstring."""
+    count = defn.blanks_before()
+    if count:
+        return (count,)
+
+
+@rule('D204', CLASS_KINDS)
+def check_blank_after_class(defn: Definition):
+    """D204: 1 blank line required after class docstring."""
+    blanks, count, _ = _blanks_after(defn)
+    if not all(blanks) and count != 1:
+        return (count,)
+
+
+@rule('D205')
+def check_blank_after_summary(defn: Definition):
+    """D205: 1 blank line required between summary line and description."""
+    lines = defn.value.strip().split('\n')
+    if len(lines) > 1:
+        count = 0
+        for line in lines[1:]:
+            if not is_blank(line):
+                break
+            count += 1
+        if count != 1:
+            return (count,)
+
+
+def _indents(defn: Definition) -> List[str]:
+    """Leading whitespace of docstring lines that need indentation."""
+    lines = defn.raw.split('\n')
+    lines = [line for i, line in enumerate(lines) if i and not lines[i - 1].endswith('\\')]
+    return [_LEADING_SPACE.match(line).group() for line in lines if not is_blank(line)]
+
+
+@rule('D206')
+def check_tabs(defn: Definition):
+    """D206: Docstring should be indented with spaces, not tabs."""
+    if '\n' in defn.raw and set(' \t') == set(''.join(_indents(defn)) + defn.indent):
+        return ()
+
+
+@rule('D208')
+def check_over_indented(defn: Definition):
+    """D208: Docstring is over-indented."""
+    if '\n' not in defn.raw:
+        return None
+    indents = _indents(defn)
+    if (len(indents) > 1 and min(indents[:-1]) > defn.indent) or (indents and indents[-1] > defn.indent):
+        return ()
+
+
+@rule('D207')
+def check_under_indented(defn: Definition):
+    """D207: Docstring is under-indented."""
+    if '\n' not in defn.raw:
+        return None
+    indents = _indents(defn)
+    if indents and min(indents) < defn.indent:
+        return ()
+
+
+@rule('D209')
+def check_closing_quotes(defn: Definition):
+    """D209: Multi-line docstring closing quotes should be on a separate line."""
+    lines = [line for line in defn.value.split('\n') if not is_blank(line)]
+    if len(lines) > 1 and defn.raw.split('\n')[-1].strip() not in ('"""', "'''"):
+        return ()
+
+
+@rule('D210')
+def check_surrounding_whitespace(defn: Definition):
+    """D210: No whitespaces allowed surrounding docstring text."""
+    lines = defn.value.split('\n')
+    if lines[0].startswith(' ') or (len(lines) == 1 and lines[0].endswith(' ')):
+        return ()
+
+
+# ======================================================
+# D3xx - quotes
+# ======================================================
+@rule('D300')
+def check_triple_double_quotes(defn: Definition):
+    '''D300: Use """triple double quotes""".'''
+    regex = _SINGLE_QUOTED if '"""' in defn.value else _DOUBLE_QUOTED
+    if not regex.match(defn.raw):
+        return (_QUOTES.match(defn.raw).group(1),)
+
+
+@rule('D301')
+def check_backslashes(defn: Definition):
+    '''D301: Use r""" if any backslashes in a docstring.'''
+    if _BACKSLASH.search(defn.raw) and not defn.raw.startswith(('r', 'ur')):
+        return ()
+
+
+# ======================================================
+# D4xx - content
+# ======================================================
+@rule('D400')
+def check_ends_with_period(defn: Definition):
+    """D400: First line should end with a period."""
+    summary = defn.value.strip().split('\n')[0]
+    if not summary.endswith('.'):
+        return (summary[-1],)
+
+
+@rule('D402', FUNCTION_KINDS)
+def check_no_signature(defn: Definition):
+    """D402: First line should not be the function's "signature"."""
+    first_line = defn.value.strip().split('\n')[0]
+    if defn.name + '(' in first_line.replace(' ', ''):
+        return ()
+
+
+@rule('D403', FUNCTION_KINDS)
+def check_capitalized(defn: Definition):
+    """D403: First word of the first line should be properly capitalized."""
+    first_word = defn.value.split()[0]
+    if first_word == first_word.upper():
+        return None
+    for char in first_word:
+        if char not in string.ascii_letters and char != "'":
+            return None
+    if first_word != first_word.capitalize():
+        return (first_word.capitalize(), first_word)
+
+
+# ======================================================
+# ENGINE
+# ======================================================
+def format_message(code: str, params: tuple) -> str:
+    """Render a pydocstyle-compatible message (without the code prefix)."""
+    short_desc, context = MESSAGES[code]
+    if context is None:
+        return short_desc
+    return f"{short_desc} ({context.format(*params)})"
+
+
+def _skipped_codes(record: Dict, lines: List[str]) -> str:
+    """Read a ``# noqa`` comment on the definition line, like pydocstyle."""
+    line_no = record.get('def_line')
+    if not line_no or line_no > len(lines):
+        return ''
+    line = lines[line_no - 1]
+    comment = line[line.find('#'):] if '#' in line else ''
+    if 'noqa: ' in comment:
+        return ''.join(comment.split('noqa: ')[1:])
+    if comment.startswith('# noqa'):
+        return 'all'
+    return ''
+
+
+def iter_definitions(file_data: Dict, lines: List[str]) -> Iterable[Definition]:
+    """Yield a Definition for the module, every class and every function."""
+    module = file_data.get('module')
+    if module:
+        yield Definition({**module, 'def_line': 1}, 'module', lines)
+    for record in file_data.get('classes', []):
+        yield Definition(record, record['kind'], lines)
+    for record in file_data.get('functions', []):
+        yield Definition(record, record['kind'], lines)
+
+
+def check_parsed(file_data: Dict, source: str, select: Optional[Set[str]] = None,
+                 with_params: bool = False,
+                 observer: Optional[Callable[[str, float, bool], None]] = None) -> List[Dict]:
+    """
+    Check parser records against the native rule set.
+
+    Args:
+        file_data (Dict): Output of ``parse_source`` / ``parse_file``
+        source (str): The source the records were parsed from
+        select (Optional[Set[str]]): Codes to report (all native codes if None)
+        with_params (bool): Keep each rule's message parameters under ``params``
+        observer (Optional[Callable]): Called as ``observer(code, seconds, hit)``
+            after every rule evaluation, for profiling
+
+    Returns:
+        List[Dict]: Violations sorted by line
+    """
+
+    if observer is not None:
+        clock = time.perf_counter
+
+    codes = NATIVE_CODES if select is None else NATIVE_CODES & set(select)
+    lines = source.split('\n')
+    file_path = file_data['file_path']
+    violations = []
+
+    for defn in iter_definitions(file_data, lines):
+        skipped = _skipped_codes(defn.record, lines)
+        if skipped == 'all':
+            continue
+
+        found = []
+        if observer is not None:
+            started = clock()
+        code = missing_code(defn)
+        if observer is not None:
+            observer(MISSING_GROUP, clock() - started, code is not None)
+
+        if code:
+            found.append((code, ()))
+        elif defn.raw and is_blank(defn.value):
+            # D419 is terminal, like the missing-docstring codes
+            found.append(('D419', ()))
+        elif defn.raw:
+            for rule_code, kinds, check in RULES:
+                if rule_code in codes and (kinds is None or defn.kind in kinds):
+                    if observer is None:
+                        params = check(defn)
+                    else:
+                        started = clock()
+                        params = check(defn)
+                        observer(rule_code, clock() - started, params is not None)
+                    if params is not None:
+                        found.append((rule_code, params))
+
+        line = defn.record.get('docstring_line') or defn.record.get('def_line') or 1
+        for found_code, params in found:
+            if found_code in codes and found_code not in skipped:
+                violation = {
+                    'file': file_path,
+                    'line': line,
+                    'code': found_code,
+                    'message': format_message(found_code, params)
+                }
+                if with_params:
+                    violation['params'] = params
+                violations.append(violation)
+
+    violations.sort(key=lambda v: (v['line'], v['code']))
+    return violations
+
+
+def validate_source(source: str, file_path: str = '<string>',
+                    ignore: Optional[List[str]] = None,
+                    observer: Optional[Callable[[str, float, bool], None]] = None) -> List[Dict]:
+    """
+    Parse and check a source string with the native rules.
+
+    Args:
+        source (str): Python source code
+        file_path (str): Path reported in violations
+        ignore (Optional[List[str]]): Codes to skip
+        observer (Optional[Callable]): Per-rule timing hook (see ``check_parsed``)
+
+    Returns:
+        List[Dict]: List of violations
+    """
+
+    select = NATIVE_CODES - set(ignore or ())
+    try:
+        file_data = parse_source(source, file_path)
+    except SyntaxError as e:
+        return [{'file': file_path, 'line': '-', 'code': 'ERROR', 'message': str(e)}]
+
+    return check_parsed(file_data, source, select, observer=observer)
+
+
+def validate_parsed(file_data: Dict, ignore: Optional[List[str]] = None,
+                    observer: Optional[Callable[[str, float, bool], None]] = None) -> List[Dict]:
+    """
+    Check a file from parse records that already exist (no second parse).
+
+    The records are used only if they describe the text on disk now; a file
+    edited since it was parsed is parsed again from what was just read.
+
+    Args:
+        file_data (Dict): Output of ``parse_file`` / ``parse_source``
+        ignore (Optional[List[str]]): Codes to skip
+        observer (Optional[Callable]): Per-rule timing hook (see ``check_parsed``)
+
+    Returns:
+        List[Dict]: List of violations
+    """
+
+    file_path = file_data['file_path']
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return [{'file': file_path, 'line': '-', 'code': 'ERROR', 'message': str(e)}]
+
+    if file_data.get('content_hash') != content_hash(source):
+        return validate_source(source, file_path, ignore, observer)
+    return check_parsed(file_data, source, NATIVE_CODES - set(ignore or ()), observer=observer)
+
+
+def validate_file(file_path: str, ignore: Optional[List[str]] = None,
+                  observer: Optional[Callable[[str, float, bool], None]] = None) -> List[Dict]:
+    """
+    Read, parse and check one file with the native rules.
+
+    Args:
+        file_path (str): Path to Python file
+        ignore (Optional[List[str]]): Codes to skip
+        observer (Optional[Callable]): Per-rule timing hook (see ``check_parsed``)
+
+    Returns:
+        List[Dict]: List of violations
+    """
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return [{'file': file_path, 'line': '-', 'code': 'ERROR', 'message': str(e)}]
+
+    return validate_source(source, file_path, ignore, observer)
@@ -0,0 +1,279 @@
+"""
+Rule Profiler - Milestone 2
+
+Time spent and hits per validation rule and per file, for both backends.
+
+- Native rules report each evaluation through the ``observer`` hook of
+  ``native_rules.check_parsed``
+- pydocstyle checks are wrapped in a ConventionChecker subclass. A check
+  may emit several codes (e.g. D201/D202), so its time is booked under the
+  group of codes it can report.
+
+The checker subclass also drops checks that cannot report any selected
+code, so turning off an expensive rule saves its time instead of only
+hiding its output.
+"""
+
+import inspect
+import json
+import os
+import re
+import time
+import types
+from typing import Dict, Iterable, Optional
+
+try:
+    from pydocstyle.checker import ConventionChecker
+except ImportError:
+    ConventionChecker = None
+
+PROFILE_FILE = "storage/validation_profile.json"
+
+# Section checks call helpers, so their codes are not visible in the source
+_SECTION_CODES = tuple(f"D{n}" for n in range(405, 418))
+
+
+class RuleProfile:
+    """Accumulated per-rule and per-file validation costs."""
+
+    def __init__(self):
+        # rule -> {'calls', 'seconds', 'hits'}
+        self.rules: Dict[str, Dict] = {}
+        # file -> {'seconds', 'hits'}
+        self.files: Dict[str, Dict] = {}
+
+    def record(self, rule: str, seconds: float, hits: int = 0):
+        """
+        Book one evaluation of a rule.
+
+        Args:
+            rule (str): Rule code (or code group)
+            seconds (float): Time the evaluation took
+            hits (int): Violations it produced
+        """
+
+        entry = self.rules.get(rule)
+        if entry is None:
+            entry = self.rules[rule] = {'calls': 0, 'seconds': 0.0, 'hits': 0}
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+        entry['hits'] += hits
+
+    def add_hits(self, rule: str, hits: int = 1):
+        """
+        Count violations for a rule without booking an evaluation.
+
+        Args:
+            rule (str): Rule code (or code group)
+            hits (int): Violations reported
+        """
+
+        entry = self.rules.setdefault(rule, {'calls': 0, 'seconds': 0.0, 'hits': 0})
+        entry['hits'] += hits
+
+    def observe(self, code: str, seconds: float, hit: bool):
+        """Observer hook for ``native_rules.check_parsed``."""
+        self.record(code, seconds, int(hit))
+
+    def record_file(self, file_path: str, seconds: float, hits: int):
+        """
+        Book the total cost of one file.
+
+        Args:
+            file_path (str): Path to Python file
+            seconds (float): Time spent validating it
+            hits (int): Violations found
+        """
+
+        entry = self.files.setdefault(file_path, {'seconds': 0.0, 'hits': 0})
+        entry['seconds'] += seconds
+        entry['hits'] += hits
+
+    def merge(self, data: Dict):
+        """
+        Add the counters of another profile (e.g. from a worker process).
+
+        Args:
+            data (Dict): Output of ``to_dict``
+        """
+
+        for rule, entry in data.get('rules', {}).items():
+            mine = self.rules.setdefault(rule, {'calls': 0, 'seconds': 0.0, 'hits': 0})
+            for key in mine:
+                mine[key] += entry[key]
+        for file_path, entry in data.get('files', {}).items():
+            self.record_file(file_path, entry['seconds'], entry['hits'])
+
+    def to_dict(self) -> Dict:
+        """Plain-dict form for pickling and JSON."""
+        return {'rules': self.rules, 'files': self.files}
+
+    def report(self, limit: int = 20) -> Dict:
+        """
+        Build the profile report.
+
+        Args:
+            limit (int): Maximum number of slowest files listed
+
+        Returns:
+            Dict: Rules sorted by total time with cost per hit, slowest files
+        """
+
+        total = sum(entry['seconds'] for entry in self.rules.values()) or 1.0
+
+        rules = []
+        for rule, entry in self.rules.items():
+            rules.append({
+                'rule': rule,
+                'calls': entry['calls'],
+                'hits': entry['hits'],
+                'seconds': round(entry['seconds'], 6),
+                'share_percent': round(entry['seconds'] / total * 100, 2),
+                'us_per_call': round(entry['seconds'] / entry['calls'] * 1e6, 2) if entry['calls'] else 0.0,
+                # Expensive rules that rarely fire are the ones worth disabling
+                'ms_per_hit': round(entry['seconds'] / entry['hits'] * 1000, 3) if entry['hits'] else None
+            })
+        rules.sort(key=lambda r: r['seconds'], reverse=True)
+
+        files = [
+            {'file_path': path, 'seconds': round(entry['seconds'], 6), 'hits': entry['hits']}
+            for path, entry in self.files.items()
+        ]
+        files.sort(key=lambda f: f['seconds'], reverse=True)
+
+        return {
+            'total_seconds': round(sum(f['seconds'] for f in self.files.values()), 6),
+            # The rest of total_seconds is reading and parsing
+            'rule_seconds': round(sum(entry['seconds'] for entry in self.rules.values()), 6),
+            'rules': rules,
+            'files': files[:limit]
+        }
+
+    def save(self, path: str = PROFILE_FILE, backend: Optional[str] = None):
+        """
+        Write the report to a JSON file.
+
+        Args:
+            path (str): Output path
+            backend (Optional[str]): Backend name stored with the report
+        """
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'backend': backend, **self.report()}, f, indent=2)
+
+
+def load_report(path: str = PROFILE_FILE) -> Optional[Dict]:
+    """
+    Load a saved profile report.
+
+    Args:
+        path (str): Report path
+
+    Returns:
+        Optional[Dict]: Report, or None if there is none
+    """
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def check_codes(check) -> tuple:
+    """
+    Codes a pydocstyle check method can report.
+
+    Args:
+        check (Callable): ConventionChecker check method
+
+    Returns:
+        tuple: Sorted violation codes
+    """
+
+    if check.__name__ == 'check_docstring_sections':
+        return _SECTION_CODES
+    try:
+        source = inspect.getsource(check)
+    except (OSError, TypeError):
+        return ()
+    return tuple(sorted(set(re.findall(r'violations\.(D\d{3})', source))))
+
+
+def _timed_check(check, group: str, profile: RuleProfile):
+    """Wrap a pydocstyle check so each call is timed."""
+    def wrapper(self, definition, docstring):
+        started = time.perf_counter()
+        result = check(self, definition, docstring)
+        if isinstance(result, types.GeneratorType):
+            # Generator checks do their work lazily; run them inside the timer
+            result = list(result)
+        # Hits are counted by the caller, after noqa and select filtering
+        profile.record(group, time.perf_counter() - started)
+        return result
+
+    wrapper._check_for = check._check_for
+    wrapper._terminal = check._terminal
+    wrapper.__doc__ = check.__doc__
+    wrapper.__name__ = check.__name__
+    return wrapper
+
+
+if ConventionChecker is not None:
+    class ProfilingChecker(ConventionChecker):
+        """ConventionChecker that skips unselected checks and optionally profiles the rest."""
+
+        def __init__(self, select: Optional[Iterable[str]] = None, profile: Optional[RuleProfile] = None):
+            super().__init__()
+            select = None if select is None else set(select)
+            # code -> profile key of the check that reports it
+            self.groups: Dict[str, str] = {}
+            checks = []
+            # The base property lists checks from vars(type(self)), which
+            # would be empty for this subclass; ask it with the base class
+            base = ConventionChecker.checks.fget(ConventionChecker())
+            for check in base:
+                codes = check_codes(check)
+                # Terminal checks stay: they stop later checks from running
+                # on a missing or empty docstring
+                if (select is not None and codes and select.isdisjoint(codes)
+                        and not check._terminal):
+                    continue
+                group = '/'.join(codes) or check.__name__
+                self.groups.update((code, group) for code in codes)
+                if profile is not None:
+                    check = _timed_check(check, group, profile)
+                checks.append(check)
+            self._checks = checks
+
+        @property
+        def checks(self):
+            return self._checks
+else:
+    ProfilingChecker = None
+
+
+if __name__ == '__main__':
+    import sys
+    from core.parser.python_parser import parse_path
+    from core.validator.validator import validate_files
+
+    args = sys.argv[1:]
+    backend = 'native' if '--native' in args else 'pydocstyle'
+    targets = [a for a in args if not a.startswith('--')] or ['.']
+
+    paths = [f['file_path'] for target in targets for f in parse_path(target)]
+    profile = RuleProfile()
+    validate_files(paths, backend=backend, max_workers=1, profile=profile)
+    profile.save(backend=backend)
+    report = profile.report()
+
+    print(f"\n⏱️  {backend}: {report['total_seconds']}s total, {report['rule_seconds']}s in rules\n")
+    for r in report['rules']:
+        per_hit = f"{r['ms_per_hit']}ms/hit" if r['ms_per_hit'] is not None else "never hit"
+        print(f"   {r['rule']:<20} {r['seconds']:>9.4f}s {r['share_percent']:>6.2f}%  "
+              f"{r['hits']:>5} hits  {per_hit}")
+    print("\n🐢 Slowest files:")
+    for f in report['files'][:10]:
+        print(f"   {f['file_path']:<55} {f['seconds']:>8.4f}s  {f['hits']} hits")
@@ -0,0 +1,273 @@
+"""
+Validation Scheduler - Milestone 2
+
+Runs per-file validation or metrics work across worker processes.
+
+- Largest files are dispatched first, so huge files start early instead
+  of forming the tail
+- Each worker gets its next file as soon as it reports the previous one
+  (idle workers pull work; nothing is pre-assigned)
+- A file that exceeds the per-file timeout gets its worker killed and
+  replaced, and is reported with status 'timeout'
+- Results are yielded as they finish, with p50/p95/p99 time per file
+
+Every worker talks to the scheduler over its own pipe, so killing one
+never leaves a shared queue or lock in a broken state.
+"""
+
+import math
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from core.validator.validator import _check_batch
+
+# Seconds a single file may take before its worker is killed
+DEFAULT_TIMEOUT = 30.0
+
+
+def _validate_task(file_path: str, ignore: Optional[List[str]] = None,
+                   backend: str = 'pydocstyle') -> List[Dict]:
+    """Validate one file (runs in a worker)."""
+    return _check_batch([file_path], ignore, backend)[file_path]
+
+
+def _metrics_task(file_path: str) -> Dict:
+    """Compute file metrics (runs in a worker)."""
+    from core.metrics.code_metrics import get_comprehensive_metrics
+    return get_comprehensive_metrics(file_path)
+
+
+TASKS = {
+    'validate': _validate_task,
+    'metrics': _metrics_task,
+}
+
+
+def _worker(conn, task: str, options: Dict):
+    """Worker loop: receive a path, run the task, send the result back."""
+    func = TASKS[task]
+    while True:
+        try:
+            file_path = conn.recv()
+        except EOFError:
+            break
+        if file_path is None:
+            break
+
+        started = time.perf_counter()
+        try:
+            status, result = 'ok', func(file_path, **options)
+        except Exception as e:
+            status, result = 'error', str(e)
+        conn.send((file_path, status, result, time.perf_counter() - started))
+
+    conn.close()
+
+
+def order_largest_first(file_paths: Iterable[str]) -> List[str]:
+    """
+    Sort files by size, largest first.
+
+    Args:
+        file_paths (Iterable[str]): Paths to files
+
+    Returns:
+        List[str]: Paths in dispatch order (missing files last)
+    """
+
+    def size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return -1
+
+    return sorted(file_paths, key=size, reverse=True)
+
+
+def percentiles(durations: List[float], points: Iterable[int] = (50, 95, 99)) -> Dict[str, float]:
+    """
+    Nearest-rank percentiles of a list of durations.
+
+    Args:
+        durations (List[float]): Seconds per file
+        points (Iterable[int]): Percentiles to compute
+
+    Returns:
+        Dict[str, float]: e.g. {'p50': 0.01, 'p95': 0.2, 'p99': 1.3}
+    """
+
+    ordered = sorted(durations)
+    result = {}
+    for p in points:
+        if not ordered:
+            result[f'p{p}'] = 0.0
+            continue
+        rank = max(1, math.ceil(p / 100 * len(ordered)))
+        result[f'p{p}'] = round(ordered[rank - 1], 4)
+    return result
+
+
+class _WorkerHandle:
+    """A worker process, the parent end of its pipe and its current file."""
+
+    def __init__(self, context, task: str, options: Dict):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker, args=(child, task, options), daemon=True)
+        self.process.start()
+        child.close()
+        self.file_path: Optional[str] = None
+        self.started = 0.0
+
+    def assign(self, file_path: str):
+        self.file_path = file_path
+        self.started = time.perf_counter()
+        self.conn.send(file_path)
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def iter_scheduled(file_paths: Iterable[str], task: str = 'validate',
+                   workers: Optional[int] = None, timeout: Optional[float] = DEFAULT_TIMEOUT,
+                   **options) -> Iterator[Dict]:
+    """
+    Run a task over files and yield each result as soon as it finishes.
+
+    Args:
+        file_paths (Iterable[str]): Paths to Python files
+        task (str): 'validate' or 'metrics'
+        workers (Optional[int]): Worker processes (defaults to CPU count)
+        timeout (Optional[float]): Seconds allowed per file; None disables
+        **options: Extra keyword arguments for the task (e.g. ``backend``)
+
+    Yields:
+        Dict: file_path, status ('ok', 'error' or 'timeout'), result and seconds
+    """
+
+    if task not in TASKS:
+        raise ValueError(f"Unknown task '{task}', expected one of {sorted(TASKS)}")
+
+    pending = order_largest_first(file_paths)
+    pending.reverse()  # pop() from the end takes the largest
+    if not pending:
+        return
+
+    context = multiprocessing.get_context()
+    count = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+    handles = [_WorkerHandle(context, task, options) for _ in range(count)]
+
+    try:
+        for handle in handles:
+            handle.assign(pending.pop())
+
+        while any(h.file_path for h in handles):
+            busy = [h for h in handles if h.file_path]
+            if timeout is None:
+                wait_for = None
+            else:
+                oldest = min(h.started for h in busy)
+                wait_for = max(0.0, oldest + timeout - time.perf_counter())
+
+            ready = wait([h.conn for h in busy], timeout=wait_for)
+            now = time.perf_counter()
+
+            for i, handle in enumerate(handles):
+                if not handle.file_path:
+                    continue
+
+                if handle.conn in ready:
+                    try:
+                        file_path, status, result, seconds = handle.conn.recv()
+                    except EOFError:
+                        # Worker died (e.g. crashed in C code): replace it
+                        file_path, status, result, seconds = (
+                            handle.file_path, 'error', 'worker exited', now - handle.started
+                        )
+                        handle.kill()
+                        handle = handles[i] = _WorkerHandle(context, task, options)
+                elif timeout is not None and now - handle.started >= timeout:
+                    file_path, status, result, seconds = (
+                        handle.file_path, 'timeout', None, now - handle.started
+                    )
+                    handle.kill()
+                    handle = handles[i] = _WorkerHandle(context, task, options)
+                else:
+                    continue
+
+                handle.file_path = None
+                if pending:
+                    handle.assign(pending.pop())
+
+                yield {
+                    'file_path': file_path,
+                    'status': status,
+                    'result': result,
+                    'seconds': round(seconds, 4)
+                }
+    finally:
+        for handle in handles:
+            if handle.file_path:
+                handle.kill()
+            else:
+                handle.stop()
+
+
+def run_scheduled(file_paths: Iterable[str], task: str = 'validate',
+                  workers: Optional[int] = None, timeout: Optional[float] = DEFAULT_TIMEOUT,
+                  **options) -> Dict:
+    """
+    Run a task over files and collect every result with timing stats.
+
+    Args:
+        file_paths (Iterable[str]): Paths to Python files
+        task (str): 'validate' or 'metrics'
+        workers (Optional[int]): Worker processes (defaults to CPU count)
+        timeout (Optional[float]): Seconds allowed per file; None disables
+        **options: Extra keyword arguments for the task
+
+    Returns:
+        Dict: Results per file (input order), timed-out/failed files and percentiles
+    """
+
+    file_paths = list(file_paths)
+    finished = {r['file_path']: r for r in iter_scheduled(file_paths, task, workers, timeout, **options)}
+
+    return {
+        'results': {path: finished[path] for path in file_paths if path in finished},
+        'timeouts': [path for path in file_paths if finished.get(path, {}).get('status') == 'timeout'],
+        'errors': [path for path in file_paths if finished.get(path, {}).get('status') == 'error'],
+        'timings': percentiles([r['seconds'] for r in finished.values()])
+    }
+
+
+if __name__ == '__main__':
+    import sys
+    from core.parser.python_parser import parse_path
+
+    target = sys.argv[1] if len(sys.argv) > 1 else '.'
+    paths = [f['file_path'] for f in parse_path(target)]
+
+    seconds = []
+    for item in iter_scheduled(paths, backend='native'):
+        seconds.append(item['seconds'])
+        flag = '⏱️ ' if item['status'] == 'timeout' else ''
+        count = len(item['result']) if item['status'] == 'ok' else item['status']
+        print(f"   {flag}{item['file_path']:<55} {item['seconds']:>8.4f}s  {count}")
+
+    stats = percentiles(seconds)
+    print(f"\n⏲️  p50 {stats['p50']}s  p95 {stats['p95']}s  p99 {stats['p99']}s")
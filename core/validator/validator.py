@@ -4,53 +4,252 @@ Validator - Milestone 2
 PEP-257 validation and code metrics.
 """
 
-import subprocess
-import json
-from typing import List, Dict
+import os
+import time
+import tokenize
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 from radon.complexity import cc_visit
 from radon.metrics import mi_visit
 
+from core.validator import native_rules
+from core.validator.profiler import ProfilingChecker, RuleProfile
 
-def validate_docstrings(file_path: str) -> List[Dict]:
+try:
+    import pydocstyle
+except ImportError:
+    pydocstyle = None
+
+
+# Files per in-process validation task
+BATCH_SIZE = 50
+
+# Validation backends: pydocstyle, or the native rules driven by the parser
+BACKENDS = ('pydocstyle', 'native')
+
+
+def _violation_from_error(error, file_path: str) -> Dict:
     """
-    Validate docstrings against PEP-257 using pydocstyle.
+    Convert a pydocstyle result into a violation dict.
+    
+    Args:
+        error: pydocstyle Error (or exception yielded for unparsable files)
+        file_path (str): File the error belongs to
+        
+    Returns:
+        Dict: Violation with file, line, code and message
+    """
+    
+    code = getattr(error, 'code', None)
+    if code is None:
+        return {
+            'file': file_path,
+            'line': '-',
+            'code': 'ERROR',
+            'message': str(error)
+        }
+    
+    # error.message is "D401: First line ... (details)"
+    message = error.message
+    if message.startswith(f"{code}: "):
+        message = message[len(code) + 2:]
+    
+    return {
+        'file': error.filename,
+        'line': error.line,
+        'code': code,
+        'message': message
+    }
+
+
+def _pydocstyle_file(file_path: str, checker, select: set,
+                     profile: Optional[RuleProfile] = None) -> List[Dict]:
+    """
+    Check one file with pydocstyle (same results as ``pydocstyle.check``).
     
     Args:
         file_path (str): Path to Python file
+        checker: ProfilingChecker to run
+        select (set): Codes to report
+        profile (Optional[RuleProfile]): Profile that counts the hits
         
     Returns:
         List[Dict]: List of violations
     """
     
+    violations = []
     try:
-        result = subprocess.run(
-            ['pydocstyle', file_path],
-            capture_output=True,
-            text=True
-        )
+        with tokenize.open(file_path) as f:
+            source = f.read()
+        for error in checker.check_source(source, file_path):
+            code = getattr(error, 'code', None)
+            if code in select:
+                violations.append(_violation_from_error(error, file_path))
+                if profile is not None:
+                    profile.add_hits(checker.groups.get(code, code))
+    except tokenize.TokenError:
+        violations.append(_violation_from_error(
+            SyntaxError(f'invalid syntax in file {file_path}'), file_path
+        ))
+    except Exception as e:
+        violations.append(_violation_from_error(e, file_path))
+    
+    return violations
+
+
+def _check_batch(file_paths: List[str], ignore: Optional[List[str]] = None,
+                 backend: str = 'pydocstyle',
+                 profile: Optional[RuleProfile] = None) -> Dict[str, List[Dict]]:
+    """
+    Validate a batch of files in-process.
+    
+    Args:
+        file_paths (List[str]): Files to check
+        ignore (Optional[List[str]]): PEP-257 codes to skip
+        backend (str): 'pydocstyle' or 'native'
+        profile (Optional[RuleProfile]): Collects time and hits per rule and file
         
-        violations = []
+    Returns:
+        Dict[str, List[Dict]]: Violations per file
+    """
+    
+    if backend == 'native':
+        observer = profile.observe if profile is not None else None
+        check = lambda path: native_rules.validate_file(path, ignore, observer)
+    else:
+        select = set(pydocstyle.violations.conventions.pep257) - set(ignore or ())
+        # Checks that can only report unselected codes are never run
+        checker = ProfilingChecker(select, profile)
+        check = lambda path: _pydocstyle_file(path, checker, select, profile)
+    
+    if profile is None:
+        return {path: check(path) for path in file_paths}
+    
+    results = {}
+    for path in file_paths:
+        started = time.perf_counter()
+        results[path] = check(path)
+        profile.record_file(path, time.perf_counter() - started, len(results[path]))
+    return results
+
+
+def _profiled_batch(file_paths: List[str], ignore: Optional[List[str]],
+                    backend: str) -> Tuple[Dict[str, List[Dict]], Dict]:
+    """Run ``_check_batch`` with a fresh profile (pool worker entry point)."""
+    profile = RuleProfile()
+    return _check_batch(file_paths, ignore, backend, profile), profile.to_dict()
+
+
+def validate_docstrings(file_path: str, ignore: Optional[List[str]] = None,
+                        backend: str = 'pydocstyle') -> List[Dict]:
+    """
+    Validate docstrings against PEP-257.
+    
+    Args:
+        file_path (str): Path to Python file
+        ignore (Optional[List[str]]): PEP-257 codes to skip
+        backend (str): 'pydocstyle' (full rule set) or 'native' (parser-driven,
+            no D401/D412/D414)
         
-        if result.stdout:
-            for line in result.stdout.strip().split('\n'):
-                if line and ':' in line:
-                    parts = line.split(':', 3)
-                    if len(parts) >= 3:
-                        violations.append({
-                            'file': parts[0],
-                            'line': parts[1],
-                            'code': parts[2].strip(),
-                            'message': parts[3].strip() if len(parts) > 3 else ''
-                        })
+    Returns:
+        List[Dict]: List of violations
+    """
+    
+    if backend == 'pydocstyle' and pydocstyle is None:
+        print("⚠️  pydocstyle not installed. Install: pip install pydocstyle")
+        return []
+    
+    return _check_batch([file_path], ignore, backend)[file_path]
+
+
+def validate_files(file_paths: Iterable[str], ignore: Optional[List[str]] = None,
+                   batch_size: int = BATCH_SIZE, max_workers: Optional[int] = None,
+                   backend: str = 'pydocstyle',
+                   profile: Optional[RuleProfile] = None) -> Dict[str, List[Dict]]:
+    """
+    Validate many files in-process, in parallel batches.
+    
+    Files are split into batches that run in a process pool, so a large
+    tree costs a few interpreter startups instead of one per file.
+    
+    Args:
+        file_paths (Iterable[str]): Paths to Python files
+        ignore (Optional[List[str]]): PEP-257 codes to skip
+        batch_size (int): Files per worker task
+        max_workers (Optional[int]): Pool size (defaults to CPU count)
+        backend (str): 'pydocstyle' or 'native'
+        profile (Optional[RuleProfile]): Collects time and hits per rule and
+            file (worker profiles are merged into it)
         
-        return violations
+    Returns:
+        Dict[str, List[Dict]]: Violations per file, in input order
+    """
+    
+    file_paths = list(file_paths)
+    
+    if backend == 'pydocstyle' and pydocstyle is None:
+        print("⚠️  pydocstyle not installed. Install: pip install pydocstyle")
+        return {path: [] for path in file_paths}
+    
+    batches = [file_paths[i:i + batch_size] for i in range(0, len(file_paths), batch_size)]
+    workers = min(max_workers or os.cpu_count() or 1, len(batches))
+    
+    results = {}
+    if workers <= 1:
+        for batch in batches:
+            results.update(_check_batch(batch, ignore, backend, profile))
+    else:
+        task = _check_batch if profile is None else _profiled_batch
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for batch_result in pool.map(task, batches, [ignore] * len(batches),
+                                             [backend] * len(batches)):
+                    if profile is not None:
+                        batch_result, batch_profile = batch_result
+                        profile.merge(batch_profile)
+                    results.update(batch_result)
+        except Exception as e:
+            # e.g. no fork/spawn support in the host process
+            print(f"⚠️  Parallel validation failed ({e}), running serially")
+            for batch in batches:
+                results.update(_check_batch(batch, ignore, backend, profile))
+    
+    return {path: results.get(path, []) for path in file_paths}
+
+
+def iter_violations(file_paths: Iterable[str], ignore: Optional[List[str]] = None,
+                    batch_size: int = BATCH_SIZE, backend: str = 'pydocstyle') -> Iterator[Dict]:
+    """
+    Yield violations batch by batch instead of collecting them all.
+    
+    Only one batch of results is held at a time, so the output can be
+    streamed to a writer for trees of any size.
+    
+    Args:
+        file_paths (Iterable[str]): Paths to Python files (consumed lazily)
+        ignore (Optional[List[str]]): PEP-257 codes to skip
+        batch_size (int): Files per batch
+        backend (str): 'pydocstyle' or 'native'
         
-    except FileNotFoundError:
+    Yields:
+        Dict: One violation
+    """
+    
+    if backend == 'pydocstyle' and pydocstyle is None:
         print("⚠️  pydocstyle not installed. Install: pip install pydocstyle")
-        return []
-    except Exception as e:
-        print(f"⚠️  Validation error: {e}")
-        return []
+        return
+    
+    batch = []
+    for path in file_paths:
+        batch.append(path)
+        if len(batch) >= batch_size:
+            for violations in _check_batch(batch, ignore, backend).values():
+                yield from violations
+            batch = []
+    
+    if batch:
+        for violations in _check_batch(batch, ignore, backend).values():
+            yield from violations
 
 
 def compute_complexity(source_code: str) -> Dict:
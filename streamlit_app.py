@@ -14,6 +14,7 @@ Features:
 - Professional clean design
 """
 
+import io
 import json
 import os
 import difflib
@@ -23,9 +24,21 @@ import pandas as pd
 import subprocess
 
 from core.parser.python_parser import parse_path, parse_file
-from core.docstring_engine.generator import generate_docstring
-from core.validator.validator import validate_docstrings, compute_complexity, compute_maintainability
+from core.docstring_engine.generator import duplicate_key, generate_docstrings, stream_docstring
+from core.docstring_engine.async_engine import generate_concurrently
+from core.docstring_engine.style_converter import convert_project
+from core.docstring_engine.priority_scheduler import run_budgeted
+from core.docstring_engine.generation_cache import get_cache as get_generation_cache
+from core.docstring_engine.backends import DEFAULT_BACKEND, available_backends, get_backend, get_breaker
+from core.docstring_engine.llm_metrics import registry as llm_metrics
+from core.validator.validator import validate_files, compute_complexity, compute_maintainability
+from core.validator.cache import iter_validate_cached, get_cache as get_validation_cache
+from core.validator.scheduler import percentiles
+from core.validator.autofix import fix_files, FIXABLE_CODES
+from core.validator.profiler import RuleProfile, load_report as load_profile_report
 from core.reporter.coverage_reporter import compute_coverage, write_report
+from core.reporter.stream_writer import SarifWriter, JsonlWriter
+from core.metrics.code_metrics import get_function_metrics
 
 # -------------------------------------------------
 # Page Configuration
@@ -347,26 +360,6 @@ def generate_diff(before, after):
     )
 
 
-def detect_docstring_style(docstring):
-    """Detect docstring style."""
-    if not docstring:
-        return None
-    
-    doc = docstring.strip().lower()
-    
-    if any(kw in doc for kw in ['args:', 'returns:', 'raises:', 'yields:']):
-        return 'google'
-    
-    if ('parameters' in doc and '----------' in doc) or \
-       ('returns' in doc and '-------' in doc):
-        return 'numpy'
-    
-    if any(kw in doc for kw in [':param', ':type', ':return', ':rtype', ':raises']):
-        return 'rest'
-    
-    return None
-
-
 def is_docstring_complete(fn, style):
     """Check if function has complete docstring in selected style."""
     if not fn.get("has_docstring"):
@@ -376,9 +369,13 @@ def is_docstring_complete(fn, style):
     if not docstring or len(docstring.strip()) < 10:
         return False
     
-    detected_style = detect_docstring_style(docstring)
+    # Style label is computed once by the parser
+    if fn.get("docstring_style") != style:
+        return False
     
-    if detected_style != style:
+    # Documented params/returns/raises must match the real signature
+    check = fn.get("signature_check")
+    if check and not check["consistent"]:
         return False
     
     return True
@@ -543,6 +540,8 @@ if "selected_file" not in st.session_state:
     st.session_state["selected_file"] = None
 if "doc_style" not in st.session_state:
     st.session_state["doc_style"] = "google"
+if "doc_backend" not in st.session_state:
+    st.session_state["doc_backend"] = DEFAULT_BACKEND
 if "scan_path" not in st.session_state:
     st.session_state["scan_path"] = "examples"
 if "show_help" not in st.session_state:
@@ -550,6 +549,11 @@ if "show_help" not in st.session_state:
 # Track which functions user has manually applied docstrings to
 if "applied_functions" not in st.session_state:
     st.session_state["applied_functions"] = set()  # Store (file_path, function_name) tuples
+# Docstrings generated for the whole project: (file_path, function_name, style) -> docstring
+if "project_docstrings" not in st.session_state:
+    st.session_state["project_docstrings"] = {}
+if "generation_timings" not in st.session_state:
+    st.session_state["generation_timings"] = {}
 
 # -------------------------------------------------
 # SIDEBAR
@@ -777,6 +781,126 @@ elif menu == "📘 Docstrings":
         
         st.info(f"**Current Style:** {style.upper()}")
         
+        backend_names = available_backends()
+        backend = st.radio(
+            "Generator backend",
+            backend_names,
+            index=backend_names.index(st.session_state["doc_backend"]),
+            horizontal=True,
+            help="template: offline skeletons from the signature, no API calls"
+        )
+        st.session_state["doc_backend"] = backend
+        stream_responses = False
+        if not get_backend(backend).offline:
+            stream_responses = st.checkbox(
+                "⚡ Stream responses", value=True,
+                help="Show each docstring as it is written instead of waiting for the whole file"
+            )
+            breaker = get_breaker(backend).stats()
+            if not get_backend(backend).available():
+                st.caption(f"🔌 {backend} is not configured; template skeletons are used instead")
+            elif breaker['state'] != 'closed':
+                st.caption(
+                    f"🔌 {backend} is failing (circuit {breaker['state'].replace('_', '-')}); "
+                    f"{breaker['short_circuited']} calls served by template skeletons"
+                )
+        share_duplicates = st.checkbox(
+            "🔗 Generate once per duplicate function", value=True,
+            help="Identical functions copied into several modules share one docstring; "
+                 "uncheck to generate and review every copy on its own"
+        )
+        
+        with st.expander("📦 Generation cache", expanded=False):
+            generation_cache = get_generation_cache()
+            cache_stats = generation_cache.stats()
+            st.caption(
+                f"{cache_stats['entries']} docstrings cached ({cache_stats['bytes'] / 1024:.1f} KB) | "
+                f"this session: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                f"({cache_stats['hit_rate']:.0%}), {cache_stats['evictions']} evicted"
+            )
+            if st.button("🔥 Warm from review log", key="warm_generation_cache"):
+                warmed = generation_cache.warm_from_review_log()
+                st.success(f"✅ {warmed} accepted docstrings added to the cache")
+        
+        # Docstrings written in another style are converted locally (no API calls)
+        convertible = [
+            (f["file_path"], fn) for f in parsed_files for fn in f.get("functions", [])
+            if fn.get("has_docstring") and fn.get("docstring_style") not in (None, style)
+            and (f["file_path"], fn["name"], style) not in st.session_state["project_docstrings"]
+        ]
+        if convertible and st.button(f"🔄 Convert {len(convertible)} documented functions to {style} style locally", use_container_width=True):
+            conversion = convert_project(parsed_files, style)
+            for (path, name), content in conversion["docstrings"].items():
+                st.session_state["project_docstrings"][(path, name, style)] = f'"""\n{content}\n"""'
+            stats = conversion["stats"]
+            st.success(
+                f"✅ {stats['converted']} docstrings converted in {stats['seconds'] * 1000:.0f} ms, no API calls"
+                + (f" ({stats['skipped']} left for the generator: sections do not match the signature)" if stats['skipped'] else "")
+            )
+        
+        # Whole-project generation: concurrent, rate limited, with retries
+        pending = [
+            (f["file_path"], fn) for f in parsed_files for fn in f.get("functions", [])
+            if not is_docstring_complete(fn, style)
+            and (f["file_path"], fn["name"], style) not in st.session_state["project_docstrings"]
+        ]
+        if pending and st.button(f"⚡ Generate all {len(pending)} missing docstrings in {style} style", use_container_width=True):
+            bar = st.progress(0.0, text="Generating...")
+            try:
+                if get_backend(backend).offline:
+                    docstrings, batch_stats = generate_docstrings([fn for _, fn in pending], style, backend=backend,
+                                                                  dedupe=share_duplicates)
+                    result = {"docstrings": docstrings, "errors": {},
+                              "stats": {"completed": len(docstrings), "seconds": 0, "docstrings_per_minute": 0,
+                                        "cache_hits": 0, "retries": 0, "calls_avoided": batch_stats['calls_avoided']}}
+                else:
+                    result = generate_concurrently(
+                        [fn for _, fn in pending], style,
+                        progress=lambda done, total: bar.progress(done / total, text=f"Generated {done}/{total}"),
+                        cache=get_generation_cache(), dedupe=share_duplicates
+                    )
+                for index, ((path, fn), docstring) in enumerate(zip(pending, result["docstrings"])):
+                    if index not in result["errors"]:
+                        st.session_state["project_docstrings"][(path, fn["name"], style)] = docstring
+                stats = result["stats"]
+                st.success(
+                    f"✅ {stats['completed']} docstrings in {stats['seconds']}s "
+                    f"({stats['docstrings_per_minute']}/min, {stats['cache_hits']} from cache, {stats['retries']} retries, "
+                    f"{stats['calls_avoided']} duplicate calls avoided)"
+                )
+                if stats.get('template_fallbacks'):
+                    st.info(f"ℹ️ No GROQ_API_KEY set: {stats['template_fallbacks']} template skeletons generated")
+            except Exception as e:
+                st.error(f"❌ Generation failed: {str(e)}")
+        
+        # Daily-budgeted generation: most valuable functions first, resumable
+        with st.expander("🎯 Budgeted generation (priority order)", expanded=False):
+            st.caption("Ranks undocumented functions by visibility, complexity, fan-in and churn; "
+                       "each run continues from the last checkpoint")
+            budget_col1, budget_col2 = st.columns(2)
+            with budget_col1:
+                token_budget = st.number_input("Daily token budget", min_value=0, value=20000, step=1000)
+            with budget_col2:
+                cost_budget = st.number_input("Daily cost budget ($, 0 = none)", min_value=0.0, value=0.0, step=0.01)
+            if st.button("🎯 Generate within budget", use_container_width=True):
+                bar = st.progress(0.0, text="Ranking functions...")
+                try:
+                    scheduled = run_budgeted(
+                        parsed_files, style, token_budget=token_budget or None, cost_budget=cost_budget or None,
+                        repo_path=st.session_state["scan_path"], cache=get_generation_cache(),
+                        progress=lambda done, total: bar.progress(done / total, text=f"Finished {done}/{total}")
+                    )
+                    for (path, name), docstring in scheduled["docstrings"].items():
+                        st.session_state["project_docstrings"][(path, name, style)] = docstring
+                    stats = scheduled["stats"]
+                    st.success(
+                        f"✅ {stats['generated']} generated, {stats['free']} free, {stats['already_done']} done earlier, "
+                        f"{stats['remaining']} remaining ({stats['stopped']}) | "
+                        f"{stats['tokens_spent']} tokens (${stats['cost_spent']}) spent today"
+                    )
+                except Exception as e:
+                    st.error(f"❌ Budgeted generation failed: {str(e)}")
+        
         st.markdown("---")
         
         # File selection
@@ -815,8 +939,53 @@ elif menu == "📘 Docstrings":
                 
                 st.info(f"📝 {len(all_functions)} total functions | ✅ {complete_count} complete | 🔴 {incomplete_count} need docstrings")
                 
+                # Reuse project-wide results; generate the rest of the file in batched requests
+                project_docstrings = st.session_state["project_docstrings"]
+                generated_docstrings = [
+                    project_docstrings.get((selected_file, fn["name"], style)) for fn in all_functions
+                ]
+                missing_fns = [fn for fn, doc in zip(all_functions, generated_docstrings) if doc is None]
+                generation_stats = {}
+                # Streamed docstrings are generated one by one as they are shown below
+                if missing_fns and not stream_responses:
+                    with st.spinner("🤖 Generating docstrings..."):
+                        try:
+                            new_docstrings, generation_stats = generate_docstrings(
+                                missing_fns, style, backend=backend, dedupe=share_duplicates
+                            )
+                        except Exception as e:
+                            new_docstrings = [f'"""\nGeneration failed: {str(e)}\n"""'] * len(missing_fns)
+                    new_docstrings = iter(new_docstrings)
+                    generated_docstrings = [doc if doc is not None else next(new_docstrings) for doc in generated_docstrings]
+                
+                if generation_stats.get('requests'):
+                    st.caption(
+                        f"⚡ {generation_stats['requests']} LLM requests for {generation_stats['functions']} functions "
+                        f"({generation_stats['cache_hits']} from cache, {generation_stats['requests_saved']} saved by batching), "
+                        f"~{generation_stats['prompt_tokens']} prompt tokens, "
+                        f"{generation_stats['seconds_per_docstring']}s per docstring"
+                    )
+                elif generation_stats.get('cache_hits'):
+                    st.caption(f"📦 All {generation_stats['cache_hits']} docstrings served from the generation cache")
+                if generation_stats.get('converted'):
+                    st.caption(f"🔄 {generation_stats['converted']} converted from another style locally")
+                if generation_stats.get('template_fallbacks'):
+                    st.caption(f"🧩 {generation_stats['template_fallbacks']} template skeletons (LLM unavailable)")
+                if generation_stats.get('calls_avoided'):
+                    st.caption(
+                        f"🔗 {generation_stats['calls_avoided']} calls avoided: "
+                        f"{generation_stats['duplicate_groups']} duplicated functions generated once"
+                    )
+                
+                # Copies of each function elsewhere in the project
+                copies = {}
+                if share_duplicates:
+                    for f in parsed_files:
+                        for other in f.get("functions", []):
+                            copies.setdefault(duplicate_key(other), []).append(f"{os.path.basename(f['file_path'])}:{other['name']}")
+                
                 # Show ALL functions
-                for fn in all_functions:
+                for fn, generated in zip(all_functions, generated_docstrings):
                     # Check if USER has applied this function (not just if it has docstring in file)
                     function_key = (selected_file, fn['name'])
                     user_applied = function_key in st.session_state["applied_functions"]
@@ -832,13 +1001,6 @@ elif menu == "📘 Docstrings":
                         else:
                             st.markdown(f"### 🔴 `{fn['name']}()`")
                     
-                    # Generate docstring
-                    with st.spinner("🤖 Generating docstring..."):
-                        try:
-                            generated = generate_docstring(fn, style)
-                        except Exception as e:
-                            generated = f'"""\nGeneration failed: {str(e)}\n"""'
-                    
                     # Show current and generated side by side
                     col1, col2 = st.columns(2)
                     
@@ -850,7 +1012,32 @@ elif menu == "📘 Docstrings":
                     
                     with col2:
                         st.caption("🤖 Generated")
-                        st.code(generated, language="python", line_numbers=True)
+                        timing_key = (selected_file, fn['name'], style)
+                        if generated is None:
+                            placeholder = st.empty()
+                            placeholder.caption("⏳ Waiting for the first token...")
+                            generated, timing = stream_docstring(
+                                fn, style, backend=backend,
+                                on_text=lambda text: placeholder.code(f'"""\n{text}\n"""', language="python")
+                            )
+                            placeholder.code(generated, language="python", line_numbers=True)
+                            st.session_state["project_docstrings"][timing_key] = generated
+                            st.session_state["generation_timings"][timing_key] = timing
+                        else:
+                            st.code(generated, language="python", line_numbers=True)
+                        
+                        same = copies.get(duplicate_key(fn), [])
+                        if len(same) > 1:
+                            st.caption(f"🔗 Shared with {len(same) - 1} identical copies: "
+                                       + ", ".join(c for c in same if c != f"{os.path.basename(selected_file)}:{fn['name']}"))
+                        timing = st.session_state["generation_timings"].get(timing_key)
+                        if timing and timing['cached']:
+                            st.caption("📦 From the generation cache")
+                        elif timing and timing['first_token_seconds'] is not None:
+                            st.caption(
+                                f"⏱️ First token {timing['first_token_seconds']:.2f}s · "
+                                f"total {timing['total_seconds']:.2f}s ({timing['backend']})"
+                            )
                     
                     # Action buttons
                     btn_col1, btn_col2, btn_col3 = st.columns([2, 2, 3])
@@ -867,6 +1054,7 @@ elif menu == "📘 Docstrings":
                             try:
                                 # Apply docstring to file
                                 apply_docstring(selected_file, fn, generated)
+                                get_validation_cache().invalidate(selected_file)
                                 
                                 # Mark this function as applied by user
                                 st.session_state["applied_functions"].add(function_key)
@@ -946,15 +1134,60 @@ elif menu == "📊 Validation":
     if not parsed_files:
         st.warning("Please scan first")
     else:
-        # Collect violations
-        all_violations = []
+        backend = st.radio(
+            "Validator backend",
+            ["native", "pydocstyle"],
+            format_func=lambda b: "⚡ Native (fast)" if b == "native" else "🐢 pydocstyle (full rule set)",
+            horizontal=True
+        )
+        
+        # Collect violations: cache hits first, misses streamed from the
+        # scheduler (largest file first, per-file timeout)
+        file_paths = [f["file_path"] for f in parsed_files]
         file_violations = {}
+        hits = 0
+        durations = []
+        progress = st.progress(0.0, text="Validating...")
+        # The native rules run on the records from the scan (no second parse)
+        records = {f["file_path"]: f for f in parsed_files}
+        for done, item in enumerate(iter_validate_cached(file_paths, backend=backend, parsed=records), 1):
+            file_violations[item["file_path"]] = item["violations"]
+            if item["status"] == "cached":
+                hits += 1
+            else:
+                durations.append(item["seconds"])
+            progress.progress(done / len(file_paths), text=f"Validated {done}/{len(file_paths)}: {item['file_path']}")
+        progress.empty()
+        file_violations = {path: file_violations[path] for path in file_paths}
         
-        for f in parsed_files:
-            file_path = f["file_path"]
-            violations = validate_docstrings(file_path)
-            file_violations[file_path] = violations
-            all_violations.extend(violations)
+        caption = f"♻️ {hits}/{len(file_paths)} files served from the validation cache"
+        if durations:
+            timings = percentiles(durations)
+            caption += f" · ⏲️ per file p50 {timings['p50']}s · p95 {timings['p95']}s · p99 {timings['p99']}s"
+        st.caption(caption)
+        all_violations = [v for violations in file_violations.values() for v in violations]
+        
+        # Mechanical violations can be fixed locally, without the LLM
+        fixable = sum(1 for v in all_violations if v["code"] in FIXABLE_CODES)
+        if fixable:
+            if st.button(f"🔧 Auto-fix {fixable} mechanical violations ({', '.join(FIXABLE_CODES)})"):
+                fix_result = fix_files([path for path, violations in file_violations.items() if violations])
+                for path in fix_result["files_changed"]:
+                    get_validation_cache().invalidate(path)
+                    for i, f in enumerate(st.session_state["parsed_files"]):
+                        if f["file_path"] == path:
+                            st.session_state["parsed_files"][i] = parse_file(path)
+                            break
+                st.session_state["coverage"] = compute_coverage(st.session_state["parsed_files"])
+                st.session_state["autofix_result"] = fix_result
+                st.rerun()
+        
+        if st.session_state.get("autofix_result"):
+            fix_result = st.session_state.pop("autofix_result")
+            st.success(
+                f"🔧 Fixed {fix_result['total_fixed']} violations in {len(fix_result['files_changed'])} files "
+                f"— {fix_result['llm_calls_avoided']} LLM calls avoided"
+            )
         
         # Count compliant vs non-compliant
         total_items = len(parsed_files)
@@ -1004,6 +1237,23 @@ elif menu == "📊 Validation":
                         st.error(f"**{v['code']}** (Line {v['line']}): {v['message']}")
             else:
                 st.success(f"✅ {file_name} - No issues")
+        
+        # Export (findings are streamed into the writers one at a time)
+        if all_violations:
+            st.markdown("### 📤 Export")
+            sarif_buffer, jsonl_buffer = io.StringIO(), io.StringIO()
+            with SarifWriter(sarif_buffer, base_dir=os.getcwd()) as writer:
+                writer.write_all(all_violations)
+            with JsonlWriter(jsonl_buffer) as writer:
+                writer.write_all(all_violations)
+            
+            export_col1, export_col2 = st.columns(2)
+            with export_col1:
+                st.download_button("⬇️ SARIF 2.1", sarif_buffer.getvalue(), file_name="violations.sarif",
+                                   mime="application/sarif+json", use_container_width=True)
+            with export_col2:
+                st.download_button("⬇️ JSON Lines", jsonl_buffer.getvalue(), file_name="violations.jsonl",
+                                   mime="application/x-ndjson", use_container_width=True)
 
 # -------------------------------------------------
 # METRICS
@@ -1044,6 +1294,25 @@ elif menu == "📐 Metrics":
         if complexity:
             st.markdown("### ⚙️ Complexity Analysis")
             st.json(complexity)
+        
+        # Per-function metrics from the parser's spans
+        file_data = next(f for f in parsed_files if f["file_path"] == selected_file)
+        function_metrics = get_function_metrics(src, file_data.get("functions", []))
+        
+        if function_metrics:
+            st.markdown("### 🔬 Per-Function Metrics")
+            df_functions = pd.DataFrame([
+                {
+                    "Function": m["name"],
+                    "Lines": f"{m['start_line']}-{m['end_line']}",
+                    "SLOC": m["sloc"],
+                    "Comment %": m["comment_ratio"],
+                    "Complexity": m["complexity"],
+                    "MI": m["maintainability_index"]
+                }
+                for m in function_metrics
+            ]).sort_values("MI")
+            st.dataframe(df_functions, use_container_width=True, hide_index=True)
 
 # -------------------------------------------------
 # DASHBOARD (with Tests inside)
@@ -1170,6 +1439,100 @@ elif menu == "📊 Dashboard":
             
             st.markdown("---")
             
+            # Validation Rule Profile
+            st.markdown("### ⏱️ Validation Rule Profile")
+            st.caption("Time and hits per rule: costly rules that rarely fire are candidates to ignore")
+            
+            prof_col1, prof_col2 = st.columns([2, 1])
+            with prof_col1:
+                profile_backend = st.radio(
+                    "Profile backend",
+                    ["native", "pydocstyle"],
+                    horizontal=True,
+                    key="profile_backend"
+                )
+            with prof_col2:
+                if st.button("▶ Run Profile", use_container_width=True):
+                    profile = RuleProfile()
+                    with st.spinner("Profiling validation rules..."):
+                        validate_files(
+                            [f["file_path"] for f in parsed_files],
+                            backend=profile_backend,
+                            profile=profile
+                        )
+                    profile.save(backend=profile_backend)
+            
+            rule_report = load_profile_report()
+            if rule_report:
+                st.caption(
+                    f"{rule_report['backend']}: {rule_report['total_seconds']:.3f}s total, "
+                    f"{rule_report['rule_seconds']:.3f}s in rules (the rest is reading and parsing)"
+                )
+                df_rules = pd.DataFrame(rule_report['rules']).rename(columns={
+                    'rule': 'Rule', 'calls': 'Calls', 'hits': 'Hits', 'seconds': 'Seconds',
+                    'share_percent': 'Share %', 'us_per_call': 'µs/call', 'ms_per_hit': 'ms/hit'
+                })
+                st.dataframe(df_rules, use_container_width=True, hide_index=True)
+                
+                st.markdown("**🐢 Slowest files**")
+                df_slow = pd.DataFrame([
+                    {"File": os.path.basename(f['file_path']), "Seconds": f['seconds'], "Hits": f['hits']}
+                    for f in rule_report['files'][:10]
+                ])
+                st.dataframe(df_slow, use_container_width=True, hide_index=True)
+            else:
+                st.info("No profile yet. Run one to see the cost of each rule.")
+            
+            st.markdown("---")
+            
+            # LLM call metrics (this session)
+            st.markdown("### 📡 LLM Calls")
+            st.caption("Latency, tokens, retries, errors and estimated cost of every LLM call in this session")
+            
+            llm_summary = llm_metrics.summary()
+            if llm_summary:
+                df_llm = pd.DataFrame([
+                    {
+                        "Operation": operation, "Calls": row['requests'], "Error rate": f"{row['error_rate']:.1%}",
+                        "p50 s": row['p50_seconds'], "p95 s": row['p95_seconds'],
+                        "p95 first token s": row['p95_first_token_seconds'], "Retries": row['retries'],
+                        "Prompt tokens": row['prompt_tokens'], "Completion tokens": row['completion_tokens'],
+                        "Cost $": row['cost_dollars']
+                    }
+                    for operation, row in llm_summary.items()
+                ])
+                st.dataframe(df_llm, use_container_width=True, hide_index=True)
+                
+                histogram_name = st.selectbox(
+                    "Histogram",
+                    ["llm_request_duration_seconds", "llm_time_to_first_token_seconds", "llm_prompt_tokens",
+                     "llm_completion_tokens", "llm_request_retries", "llm_request_cost_dollars"]
+                )
+                histograms = [h for h in llm_metrics.to_dict()['histograms'] if h['name'] == histogram_name]
+                if histograms:
+                    df_hist = pd.DataFrame({
+                        h['labels']['operation']: [
+                            total - previous for total, previous in
+                            zip(h['buckets'].values(), [0, *list(h['buckets'].values())[:-1]])
+                        ]
+                        for h in histograms
+                    }, index=[f"≤ {bound}" for bound in histograms[0]['buckets']])
+                    st.bar_chart(df_hist, use_container_width=True, height=250)
+                else:
+                    st.caption("No observations for this histogram yet")
+                
+                exp_col1, exp_col2 = st.columns(2)
+                with exp_col1:
+                    if st.button("💾 Export JSON", use_container_width=True, key="export_llm_json"):
+                        st.success(f"✅ Written to {llm_metrics.export('storage/llm_metrics.json')}")
+                with exp_col2:
+                    if st.button("💾 Export Prometheus", use_container_width=True, key="export_llm_prom"):
+                        st.success(f"✅ Written to {llm_metrics.export('storage/llm_metrics.prom')}")
+            else:
+                st.info("No LLM calls yet. Generate docstrings to collect metrics.")
+            
+            st.markdown("---")
+            
             # Enhanced UI Features Section
             st.markdown("### 🎨 Enhanced UI Features")
             st.caption("Professional tools for advanced code analysis")
@@ -18,6 +18,12 @@ except ImportError as e:
     print(f"Warning: Could not import parser: {e}")
     parse_path = parse_file = None
 
+try:
+    from core.parser.docstring_parser import parse_sections, check_signature, classify_style
+except ImportError as e:
+    print(f"Warning: Could not import docstring_parser: {e}")
+    parse_sections = check_signature = classify_style = None
+
 try:
     from core.reporter.coverage_reporter import compute_coverage
 except ImportError as e:
@@ -34,12 +40,129 @@ except ImportError as e:
     print(f"Warning: Could not import validator: {e}")
     validate_docstrings = None
 
+try:
+    from core.validator.validator import validate_files
+except ImportError as e:
+    print(f"Warning: Could not import validate_files: {e}")
+    validate_files = None
+
+try:
+    from core.validator import native_rules
+except ImportError as e:
+    print(f"Warning: Could not import native_rules: {e}")
+    native_rules = None
+
+try:
+    from core.validator.cache import ValidationCache, validate_files_cached, iter_validate_cached
+except ImportError as e:
+    print(f"Warning: Could not import validation cache: {e}")
+    ValidationCache = validate_files_cached = iter_validate_cached = None
+
+try:
+    from core.validator.profiler import RuleProfile
+except ImportError as e:
+    print(f"Warning: Could not import profiler: {e}")
+    RuleProfile = None
+
+try:
+    from core.validator import diff_scope
+except ImportError as e:
+    print(f"Warning: Could not import diff_scope: {e}")
+    diff_scope = None
+
+try:
+    from core.validator import autofix
+except ImportError as e:
+    print(f"Warning: Could not import autofix: {e}")
+    autofix = None
+
+try:
+    from core.validator import scheduler
+except ImportError as e:
+    print(f"Warning: Could not import scheduler: {e}")
+    scheduler = None
+
+try:
+    from core.reporter.stream_writer import SarifWriter, JsonlWriter, write_findings
+except ImportError as e:
+    print(f"Warning: Could not import stream_writer: {e}")
+    SarifWriter = JsonlWriter = write_findings = None
+
 try:
     from core.docstring_engine.generator import generate_docstring
 except ImportError as e:
     print(f"Warning: Could not import generator: {e}")
     generate_docstring = None
 
+try:
+    from core.docstring_engine import llm_integration
+except ImportError as e:
+    print(f"Warning: Could not import llm_integration: {e}")
+    llm_integration = None
+
+try:
+    from core.docstring_engine import async_engine
+    from core.docstring_engine.mock_server import MockLLMServer
+except ImportError as e:
+    print(f"Warning: Could not import async_engine: {e}")
+    async_engine = MockLLMServer = None
+
+try:
+    from core.docstring_engine import client_pool
+except ImportError as e:
+    print(f"Warning: Could not import client_pool: {e}")
+    client_pool = None
+
+try:
+    from core.docstring_engine.generation_cache import GenerationCache
+except ImportError as e:
+    print(f"Warning: Could not import generation_cache: {e}")
+    GenerationCache = None
+
+try:
+    from core.docstring_engine import backends
+except ImportError as e:
+    print(f"Warning: Could not import backends: {e}")
+    backends = None
+
+try:
+    from core.docstring_engine import llm_metrics
+except ImportError as e:
+    print(f"Warning: Could not import llm_metrics: {e}")
+    llm_metrics = None
+
+try:
+    from core.docstring_engine import priority_scheduler
+except ImportError as e:
+    print(f"Warning: Could not import priority_scheduler: {e}")
+    priority_scheduler = None
+
+try:
+    from core.metrics.clone_detector import CloneIndex
+except ImportError as e:
+    print(f"Warning: Could not import clone_detector: {e}")
+    CloneIndex = None
+
+try:
+    from core.metrics.import_graph import (
+        build_import_graph, rank_documentation_priority, strongly_connected_components
+    )
+except ImportError as e:
+    print(f"Warning: Could not import import_graph: {e}")
+    build_import_graph = rank_documentation_priority = strongly_connected_components = None
+
+try:
+    from core.metrics.code_metrics import get_function_metrics
+except ImportError as e:
+    print(f"Warning: Could not import code_metrics: {e}")
+    get_function_metrics = None
+
+try:
+    from core.metrics import churn as churn_module
+except ImportError as e:
+    print(f"Warning: Could not import churn: {e}")
+    churn_module = None
+
 
 # -------------------------------------------------
 # Parser Tests
@@ -150,6 +273,156 @@ def outer():
             assert len(result['functions']) == 2
         finally:
             os.unlink(temp_path)
+    
+    @pytest.mark.skipif(parse_file is None, reason="parse_file not available")
+    def test_parse_imports(self):
+        """Test import statements are collected."""
+        code = '''
+import os.path
+from . import sibling
+from ..pkg.mod import thing
+'''
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(code)
+            temp_path = f.name
+        
+        try:
+            imports = parse_file(temp_path)['imports']
+            assert imports[0] == {'module': 'os.path', 'names': [], 'level': 0, 'line': 2}
+            assert imports[1]['level'] == 1 and imports[1]['names'] == ['sibling']
+            assert imports[2]['module'] == 'pkg.mod' and imports[2]['level'] == 2
+        finally:
+            os.unlink(temp_path)
+    
+    @pytest.mark.skipif(parse_file is None, reason="parse_file not available")
+    def test_parse_module_classes_and_publicity(self):
+        """Test module/class records and definition kinds."""
+        code = '''"""Module doc."""
+__all__ = ['Api']
+
+
+class Api:
+    """Public API."""
+    def call(self):
+        def helper():
+            pass
+    def _hidden(self):
+        pass
+
+
+class Other:
+    pass
+'''
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(code)
+            temp_path = f.name
+        
+        try:
+            result = parse_file(temp_path)
+            assert result['module']['has_docstring'] and result['module']['dunder_all'] == ['Api']
+            
+            classes = {c['name']: c for c in result['classes']}
+            assert classes['Api']['is_public'] and classes['Api']['docstring_line'] == 6
+            assert not classes['Other']['is_public']
+            
+            functions = {fn['name']: fn for fn in result['functions']}
+            assert functions['call']['kind'] == 'method' and functions['call']['is_public']
+            assert functions['helper']['kind'] == 'nested_function'
+            assert not functions['_hidden']['is_public']
+        finally:
+            os.unlink(temp_path)
+
+
+# -------------------------------------------------
+# Docstring Parser Tests
+# -------------------------------------------------
+class TestDocstringParser:
+    """Test section parsing and signature consistency."""
+    
+    @pytest.mark.skipif(parse_sections is None, reason="docstring_parser not available")
+    def test_parses_all_styles(self):
+        """Test params, returns and raises are read from each style."""
+        google = "Do.\n\nArgs:\n    a (int): First.\n        More text.\n    *args: Rest.\n\nReturns:\n    int: Value.\n\nRaises:\n    ValueError: Bad."
+        numpy = "Do.\n\nParameters\n----------\na, b : int\n    Desc.\n\nNotes\n-----\nword\n"
+        rest = "Do.\n\n:param int a: First.\n:returns: Value.\n:raises KeyError: Missing."
+        
+        assert parse_sections(google) == {
+            'style': 'google', 'params': ['a', '*args'], 'returns': True, 'raises': ['ValueError']
+        }
+        assert parse_sections(numpy)['params'] == ['a', 'b']
+        assert parse_sections(numpy)['style'] == 'numpy'
+        assert parse_sections(rest) == {'style': 'rest', 'params': ['a'], 'returns': True, 'raises': ['KeyError']}
+    
+    @pytest.mark.skipif(parse_file is None or check_signature is None, reason="parser not available")
+    def test_flags_stale_docstrings(self):
+        """Test missing, extra and renamed params are reported in the parse pass."""
+        code = '''
+class Box:
+    def resize(self, width, height, *, keep_ratio=False):
+        """Resize.
+
+        Args:
+            w (int): Width.
+            height (int): Height.
+            scale (float): Removed parameter.
+
+        Returns:
+            Box: Self.
+        """
+        if width < 0:
+            raise ValueError(width)
+        return self
+
+    def ok(self, x) -> int:
+        """Ok.
+
+        Args:
+            x: Value.
+
+        Returns:
+            int: Value.
+        """
+        return x
+'''
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(code)
+            temp_path = f.name
+        
+        try:
+            functions = {fn['name']: fn for fn in parse_file(temp_path)['functions']}
+            assert functions['resize']['params'] == ['self', 'width', 'height', 'keep_ratio']
+            
+            check = functions['resize']['signature_check']
+            assert check['renamed'] == [{'documented': 'w', 'actual': 'width'}]
+            assert check['missing'] == ['keep_ratio']
+            assert check['extra'] == ['scale']
+            assert check['missing_raises'] == ['ValueError']
+            assert not check['consistent']
+            assert functions['ok']['signature_check']['consistent']
+        finally:
+            os.unlink(temp_path)
+    
+    @pytest.mark.skipif(classify_style is None or parse_file is None, reason="docstring_parser not available")
+    def test_style_label_stored_on_records(self):
+        """Test the style classifier and that the parser stores its label."""
+        assert classify_style("Do.\n\nArgs:\n    a: First.") == 'google'
+        assert classify_style("Do.\n\nReturns\n-------\nint") == 'numpy'
+        assert classify_style("Do.\n\n:param a: First.\n:rtype: int") == 'rest'
+        assert classify_style("Do.\n\n:returns: Google marker wins.") == 'google'
+        assert classify_style("Do.\n\nRETURNS:\n    int: Total.") == 'google'
+        assert classify_style("Do.\n\n:parameters\n----------\nx") == 'numpy'
+        assert classify_style("Do. Nothing: special.") is None
+        assert classify_style('') is None
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write('def a(x):\n    """Do.\n\n    :param x: Value.\n    """\n\n\ndef b():\n    pass\n')
+            temp_path = f.name
+        
+        try:
+            labels = {fn['name']: fn['docstring_style'] for fn in parse_file(temp_path)['functions']}
+            assert labels == {'a': 'rest', 'b': None}
+        finally:
+            os.unlink(temp_path)
 
 
 # -------------------------------------------------
@@ -192,6 +465,76 @@ class TestCoverageReporter:
         assert coverage['coverage_percent'] == 50
 
 
+# -------------------------------------------------
+# Streaming Writer Tests
+# -------------------------------------------------
+class TestStreamWriters:
+    """Test incremental SARIF and JSONL output."""
+    
+    FINDINGS = [
+        {'file': 'pkg/a.py', 'line': 3, 'code': 'D103', 'message': 'Missing docstring in public function'},
+        {'file': 'pkg/b.py', 'line': '-', 'code': 'ERROR', 'message': 'invalid syntax'},
+        {'file': 'pkg/a.py', 'line': 9, 'code': 'D103', 'message': 'Missing docstring in public function'},
+    ]
+    
+    @pytest.mark.skipif(SarifWriter is None, reason="stream_writer not available")
+    def test_sarif_document(self, tmp_path):
+        """Test the streamed SARIF log is valid JSON with a rule table."""
+        import json
+        path = str(tmp_path / 'out.sarif')
+        count = write_findings(iter(self.FINDINGS), path, base_dir=str(tmp_path),
+                               rule_descriptions={'D103': 'Public function docstring'})
+        assert count == 3
+        
+        with open(path) as f:
+            log = json.load(f)
+        run = log['runs'][0]
+        assert log['version'] == '2.1.0'
+        assert [r['id'] for r in run['tool']['driver']['rules']] == ['D103', 'ERROR']
+        assert run['tool']['driver']['rules'][0]['shortDescription']['text'] == 'Public function docstring'
+        assert [r['ruleIndex'] for r in run['results']] == [0, 1, 0]
+        assert run['results'][0]['locations'][0]['physicalLocation']['region'] == {'startLine': 3}
+        assert 'region' not in run['results'][1]['locations'][0]['physicalLocation']
+        assert run['results'][1]['level'] == 'error'
+    
+    @pytest.mark.skipif(JsonlWriter is None, reason="stream_writer not available")
+    def test_jsonl_and_empty_sarif(self):
+        """Test JSON Lines output and a SARIF log without results."""
+        import io
+        import json
+        buffer = io.StringIO()
+        with JsonlWriter(buffer) as writer:
+            writer.write_all(self.FINDINGS)
+        assert [json.loads(line) for line in buffer.getvalue().splitlines()] == self.FINDINGS
+        
+        empty = io.StringIO()
+        SarifWriter(empty).close()
+        assert json.loads(empty.getvalue())['runs'][0]['results'] == []
+    
+    @pytest.mark.skipif(JsonlWriter is None, reason="stream_writer not available")
+    def test_memory_stays_flat(self):
+        """Test peak memory does not grow with the number of findings."""
+        import io
+        import tracemalloc
+        
+        class NullStream(io.StringIO):
+            def write(self, text):
+                return len(text)
+        
+        def findings(n):
+            for i in range(n):
+                yield {'file': f'm{i % 50}.py', 'line': i + 1, 'code': f'D{100 + i % 7}', 'message': 'x' * 40}
+        
+        peaks = []
+        for n in (500, 5000):
+            tracemalloc.start()
+            with SarifWriter(NullStream()) as writer:
+                writer.write_all(findings(n))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        assert peaks[1] < peaks[0] * 2
+
+
 # -------------------------------------------------
 # Generator Tests
 # -------------------------------------------------
@@ -353,6 +696,268 @@ class TestLLMIntegration:
         assert '"""' in numpy
         assert '"""' in rest
     
+    @pytest.mark.skipif(llm_integration is None, reason="llm_integration not available")
+    def test_batched_generation_with_fallback(self):
+        """Test functions share one request and unparsed entries retry alone."""
+        from types import SimpleNamespace
+        prompts = []
+        
+        def create(model, messages, temperature):
+            prompt = messages[0]['content']
+            prompts.append(prompt)
+            if '<<<DOCSTRING n>>>' in prompt:
+                # Answer functions 1 and 3 only
+                content = '<<<DOCSTRING 1>>>\nAdd numbers.\n<<<END 1>>>\n<<<DOCSTRING 3>>>\nNegate x.\n<<<END 3>>>'
+            else:
+                content = 'Scale x.'
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        functions = [('add', 'def add(a, b):\n    pass'), ('scale', 'def scale(x):\n    pass'),
+                     ('neg', 'def neg(x):\n    pass')]
+        result = llm_integration.generate_docstrings_batch(functions, 'google', client=client)
+        
+        assert result['docstrings'] == ['Add numbers.', 'Scale x.', 'Negate x.']
+        assert len(prompts) == 2
+        assert result['stats']['requests'] == 2
+        assert result['stats']['fallbacks'] == 1
+        assert result['stats']['requests_saved'] == 1
+    
+    @pytest.mark.skipif(llm_integration is None, reason="llm_integration not available")
+    def test_failed_batch_is_not_resent_as_single_calls(self):
+        """Test a batched request that raises marks its functions failed without more requests."""
+        from types import SimpleNamespace
+        prompts = []
+        
+        def create(model, messages, temperature):
+            prompts.append(messages[0]['content'])
+            raise ConnectionError('rate limited')
+        
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        functions = [(f'f{i}', f'def f{i}(x):\n    pass') for i in range(3)]
+        result = llm_integration.generate_docstrings_batch(functions, 'google', client=client)
+        
+        assert len(prompts) == 1
+        assert result['docstrings'] == [None, None, None]
+        assert (result['stats']['failed'], result['stats']['fallbacks']) == (3, 0)
+    
+    @pytest.mark.skipif(llm_integration is None or backends is None, reason="llm_integration not available")
+    def test_outage_requests_bounded_by_breaker(self, monkeypatch):
+        """Test an outage trips the breaker within one run and the rest get skeletons."""
+        import httpx
+        from types import SimpleNamespace
+        from groq import APIConnectionError
+        from core.docstring_engine import generator
+        requests = []
+        
+        def create(model, messages, temperature):
+            requests.append(messages[0]['content'])
+            raise APIConnectionError(request=httpx.Request('POST', 'http://llm.invalid'))
+        
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        breaker = backends.CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        monkeypatch.setenv('GROQ_API_KEY', 'test')
+        monkeypatch.setattr(llm_integration, '_client', lambda: client)
+        monkeypatch.setitem(backends._breakers, 'groq', breaker)
+        fns = [{'name': f'get_value_{i}', 'args': [], 'returns': 'int',
+                'source': f'def get_value_{i}() -> int:\n    return {i}'} for i in range(40)]
+        
+        docstrings, stats = generator.generate_docstrings(fns, 'google', use_cache=False, backend='groq')
+        assert len(requests) == breaker.failure_threshold
+        assert breaker.stats()['state'] == 'open'
+        assert stats['template_fallbacks'] == 40
+        assert docstrings[0] == '"""\nReturn value 0.\n\nReturns:\n    int: The result.\n"""'
+        
+        generator.generate_docstrings(fns, 'google', use_cache=False, backend='groq')
+        assert len(requests) == breaker.failure_threshold
+    
+    @pytest.mark.skipif(llm_integration is None, reason="llm_integration not available")
+    def test_batches_respect_token_budget(self):
+        """Test functions are packed up to the budget and oversized ones stand alone."""
+        small = [(f'f{i}', 'def f():\n    return 1') for i in range(5)]
+        huge = ('big', 'x = 1\n' * 4000)
+        
+        assert llm_integration.pack_batches(small) == [[0, 1, 2, 3, 4]]
+        assert llm_integration.pack_batches(small, max_size=2) == [[0, 1], [2, 3], [4]]
+        assert llm_integration.pack_batches(small[:2] + [huge] + small[2:]) == [[0, 1], [2], [3, 4, 5]]
+    
+    @pytest.mark.skipif(llm_integration is None or parse_file is None, reason="llm_integration not available")
+    def test_prompt_uses_real_source_within_budget(self, tmp_path):
+        """Test prompts carry the parsed body, trimmed to the budget, and their size is recorded."""
+        from types import SimpleNamespace
+        from core.docstring_engine import prompt_builder
+        from core.docstring_engine.generator import build_function_source
+        source = tmp_path / 'mod.py'
+        source.write_text(
+            'def load(rows: list) -> int:\n'
+            '    """Old docstring."""\n'
+            '    banner = "' + 'x' * 200 + '"\n'
+            '    codes = [' + ', '.join(str(i) for i in range(40)) + ']\n'
+            + ''.join(f'    rows.append({i})\n' for i in range(30)) +
+            '    if not rows:\n'
+            '        raise ValueError("empty")\n'
+            '    return len(rows)\n'
+        )
+        fn = parse_file(str(source))['functions'][0]
+        assert 'Old docstring' not in fn['source'] and 'rows.append(29)' in fn['source']
+        
+        fitted = build_function_source(fn, token_budget=60)
+        assert prompt_builder.estimate_tokens(fitted) <= 60
+        assert fitted.startswith('def load(rows: list) -> int:')
+        assert 'raise ValueError("empty")' in fitted and 'return len(rows)' in fitted
+        assert 'x' * 200 not in fitted and '# ... 29 similar statements' in fitted
+        assert build_function_source(fn, token_budget=10_000) == fn['source']
+        
+        def create(model, messages, temperature):
+            message = SimpleNamespace(content='Load rows.')
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=SimpleNamespace(prompt_tokens=90))
+        
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        prompt_builder.stats.reset()
+        result = llm_integration.generate_docstrings_batch([('load', fitted)], 'google', client=client)
+        recorded = prompt_builder.stats.to_dict()
+        assert recorded['requests'] == 1 and recorded['reported_prompt_tokens'] == 90
+        assert result['stats']['prompt_tokens'] == recorded['prompt_tokens'] > 60
+    
+    @pytest.mark.skipif(client_pool is None or MockLLMServer is None or backends is None,
+                        reason="streaming not available")
+    def test_streamed_generation_reports_first_token(self, monkeypatch):
+        """Test streamed text arrives in pieces and time to first token is measured."""
+        from core.docstring_engine import generator
+        fn = {'name': 'total', 'args': [], 'returns': 'int'}
+        
+        with MockLLMServer(latency=0.05, token_delay=0.01) as server:
+            client = client_pool.get_client('mock', server.base_url)
+            pieces = list(llm_integration.stream_docstring_llm('total', 'def total(): pass', 'google', client))
+            assert len(pieces) > 1
+            assert ''.join(pieces) == MockLLMServer.completion('mock', '')['choices'][0]['message']['content']
+            
+            monkeypatch.setenv('GROQ_API_KEY', 'mock')
+            monkeypatch.setattr(llm_integration, '_client', lambda: client)
+            monkeypatch.setitem(backends._breakers, 'groq', backends.CircuitBreaker())
+            seen = []
+            docstring, timing = generator.stream_docstring(fn, 'google', on_text=seen.append, use_cache=False,
+                                                           backend='groq')
+            client_pool.close_all()
+        
+        assert seen[0] == 'Return ' and seen[-1] == ''.join(pieces)
+        assert docstring == f'"""\n{seen[-1]}\n"""'
+        assert timing['backend'] == 'groq'
+        assert 0.05 <= timing['first_token_seconds'] < timing['total_seconds']
+    
+    @pytest.mark.skipif(async_engine is None, reason="async_engine not available")
+    def test_async_engine_retries_against_mock_server(self):
+        """Test concurrency is bounded, 429/5xx are retried and 4xx are not."""
+        fns = [{'name': f'f{i}', 'args': [], 'returns': 'int'} for i in range(6)]
+        
+        with MockLLMServer(latency=0.02, failures=[429, 503]) as server:
+            result = async_engine.generate_concurrently(
+                fns, base_url=server.base_url, api_key='mock', concurrency=3,
+                rpm=6000, tpm=1_000_000, base_delay=0.01
+            )
+            assert server.requests == 8
+            assert server.max_in_flight <= 3
+        
+        stats = result['stats']
+        assert (stats['completed'], stats['retries'], stats['rate_limited']) == (6, 2, 1)
+        assert all(d.startswith('"""\nReturn the result') for d in result['docstrings'])
+        assert stats['docstrings_per_minute'] > 0
+        
+        with MockLLMServer(latency=0, failures=[400]) as server:
+            result = async_engine.generate_concurrently(
+                fns[:1], base_url=server.base_url, api_key='mock', base_delay=0.01
+            )
+            assert server.requests == 1
+        assert result['stats']['failed'] == 1
+        assert result['docstrings'][0] == '"""\nF0.\n\nReturns:\n    int: The result.\n"""'
+    
+    @pytest.mark.skipif(async_engine is None, reason="async_engine not available")
+    def test_async_engine_without_api_key(self, monkeypatch):
+        """Test no API key falls back to template skeletons instead of raising."""
+        monkeypatch.delenv('GROQ_API_KEY', raising=False)
+        fns = [{'name': 'get_total', 'args': [], 'returns': 'int'}, {'name': 'reset', 'args': [], 'returns': None}]
+        
+        result = async_engine.generate_concurrently(fns)
+        assert result['errors'] == {}
+        assert (result['stats']['completed'], result['stats']['template_fallbacks']) == (2, 2)
+        assert result['docstrings'][0] == '"""\nReturn total.\n\nReturns:\n    int: The result.\n"""'
+    
+    @pytest.mark.skipif(async_engine is None or parse_path is None, reason="async_engine not available")
+    def test_duplicate_functions_share_one_request(self, tmp_path):
+        """Test a helper copied into two modules is generated once and fanned out."""
+        from core.docstring_engine import generator
+        helper = "def fibonacci(n: int) -> int:\n    # copied\n    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)\n"
+        (tmp_path / "a.py").write_text(helper + "\n\ndef other(x):\n    return x\n")
+        (tmp_path / "b.py").write_text("import os\n\n\n" + helper.replace("# copied", "# same as a.py"))
+        fns = [fn for f in parse_path(str(tmp_path)) for fn in f['functions']]
+        assert len(generator.group_duplicates(fns)) == 2
+        
+        with MockLLMServer(latency=0) as server:
+            result = async_engine.generate_concurrently(fns, base_url=server.base_url, api_key='mock',
+                                                        rpm=6000, tpm=1_000_000)
+            assert server.requests == 2
+        
+        fib = [i for i, fn in enumerate(fns) if fn['name'] == 'fibonacci']
+        assert (result['stats']['calls_avoided'], result['stats']['completed']) == (1, 3)
+        assert result['docstrings'][fib[0]] == result['docstrings'][fib[1]]
+        
+        _, stats = generator.generate_docstrings(fns, backend='template')
+        assert (stats['calls_avoided'], stats['duplicate_groups']) == (1, 1)
+        _, stats = generator.generate_docstrings(fns, backend='template', dedupe=False)
+        assert stats['calls_avoided'] == 0
+    
+    @pytest.mark.skipif(async_engine is None, reason="async_engine not available")
+    def test_rate_limit_and_backoff_math(self):
+        """Test token buckets delay over-budget requests and backoff stays bounded."""
+        import random
+        bucket = async_engine.TokenBucket(per_minute=60)
+        assert bucket.delay_for(60) == 0
+        bucket.take(60)
+        assert bucket.delay_for(1) == pytest.approx(1.0, abs=0.05)
+        assert bucket.delay_for(600) == pytest.approx(60.0, abs=0.1)
+        
+        rng = random.Random(0)
+        delays = [async_engine.backoff_delay(a, base=1, cap=8, rng=rng) for a in range(10)]
+        assert all(0 <= d <= 8 for d in delays)
+        assert async_engine.backoff_delay(0, base=1, cap=8, retry_after=5, rng=rng) >= 5
+    
+    @pytest.mark.skipif(client_pool is None or MockLLMServer is None, reason="client_pool not available")
+    def test_pooled_client_reuses_connections(self):
+        """Test one client serves every thread and its connections are kept alive."""
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        messages = [{"role": "user", "content": "Document this."}]
+        
+        with MockLLMServer(latency=0) as server:
+            client_pool.stats.reset()
+            clients = {id(client_pool.get_client('mock', server.base_url)) for _ in range(3)}
+            assert len(clients) == 1
+            
+            def call(_):
+                client = client_pool.get_client('mock', server.base_url)
+                return client.chat.completions.create(model="mock", messages=messages).choices[0].message.content
+            
+            for _ in range(4):
+                call(0)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                assert all(list(pool.map(call, range(8))))
+            
+            stats = client_pool.stats.to_dict()
+            assert stats['clients_created'] == 1
+            assert stats['requests'] == 12
+            assert stats['connections_opened'] <= 4
+            assert stats['connections_reused'] >= 8
+            client_pool.close_all()
+            
+            async def borrow_twice():
+                async with client_pool.async_client('mock', server.base_url) as first:
+                    async with client_pool.async_client('mock', server.base_url) as second:
+                        assert first is second
+                        await second.chat.completions.create(model="mock", messages=messages)
+                return first
+            
+            assert asyncio.run(borrow_twice()).is_closed()
+    
     @pytest.mark.skip(reason="Requires API call")
     def test_llm_response_quality(self):
         """Test LLM generates quality docstrings."""
@@ -369,6 +974,311 @@ class TestLLMIntegration:
         pass
 
 
+# -------------------------------------------------
+# LLM Metrics Tests
+# -------------------------------------------------
+class TestLLMMetrics:
+    """Test per-call instrumentation and histogram export."""
+    
+    @pytest.mark.skipif(llm_metrics is None, reason="llm_metrics not available")
+    def test_histogram_quantiles(self):
+        """Test bucket counts and interpolated percentiles."""
+        histogram = llm_metrics.Histogram((1, 2, 4))
+        for value in (0.5, 1.5, 1.5, 3, 10):
+            histogram.observe(value)
+        
+        assert histogram.cumulative() == [('1', 1), ('2', 3), ('4', 4), ('+Inf', 5)]
+        assert histogram.quantile(0.5) == pytest.approx(1.75)
+        assert histogram.quantile(0.99) == 4
+        assert llm_metrics.Histogram((1,)).quantile(0.5) is None
+    
+    @pytest.mark.skipif(llm_metrics is None or async_engine is None or client_pool is None,
+                        reason="llm_metrics not available")
+    def test_calls_recorded_and_exported(self, tmp_path):
+        """Test async and streamed calls record latency, tokens, retries and status."""
+        import json
+        llm_metrics.registry.reset()
+        fns = [{'name': f'f{i}', 'args': [], 'returns': 'int'} for i in range(2)]
+        
+        with MockLLMServer(latency=0.01, failures=[429, 400], token_delay=0.01) as server:
+            async_engine.generate_concurrently(fns, base_url=server.base_url, api_key='mock', concurrency=1,
+                                               rpm=6000, tpm=1_000_000, base_delay=0.01)
+            client = client_pool.get_client('mock', server.base_url)
+            list(llm_integration.stream_docstring_llm('total', 'def total(): pass', 'google', client))
+            client_pool.close_all()
+        
+        summary = llm_metrics.registry.summary()
+        assert summary['async']['statuses'] == {'ok': 1, 'client_error': 1}
+        assert (summary['async']['retries'], summary['async']['error_rate']) == (1, 0.5)
+        assert summary['async']['completion_tokens'] > 0 and summary['async']['cost_dollars'] > 0
+        assert summary['stream']['p95_first_token_seconds'] is not None
+        
+        text = open(llm_metrics.registry.export(str(tmp_path / "llm.prom"))).read()
+        assert 'llm_requests_total{operation="async",status="ok"} 1' in text
+        assert 'llm_request_duration_seconds_bucket{operation="stream",le="+Inf"} 1' in text
+        data = json.load(open(llm_metrics.registry.export(str(tmp_path / "llm.json"))))
+        assert data['summary']['stream']['requests'] == 1
+        llm_metrics.registry.reset()
+
+
+# -------------------------------------------------
+# Backend Tests
+# -------------------------------------------------
+class TestBackends:
+    """Test pluggable backends, the template backend and the circuit breaker."""
+    
+    @pytest.mark.skipif(backends is None or parse_file is None, reason="backends not available")
+    @pytest.mark.parametrize("style", ["google", "numpy", "rest"])
+    def test_template_skeleton_matches_signature(self, tmp_path, style):
+        """Test template output parses in its style and documents the signature."""
+        source = tmp_path / 'mod.py'
+        source.write_text(
+            'class Store:\n'
+            '    def get_item(self, key: str, default=None, *rest, **opts) -> int:\n'
+            '        if not key:\n'
+            '            raise KeyError(key)\n'
+            '        return 1\n'
+        )
+        fn = parse_file(str(source))['functions'][0]
+        content = backends.get_backend('template').generate(fn, style)
+        
+        assert content.startswith('Return item.')
+        assert classify_style(content) == style
+        sections = parse_sections(content)
+        assert [p.lstrip('*') for p in sections['params']] == ['key', 'default', 'rest', 'opts']
+        assert sections['raises'] == ['KeyError']
+        assert check_signature(dict(fn, docstring=content), sections)['consistent']
+    
+    @pytest.mark.skipif(backends is None, reason="backends not available")
+    def test_breaker_skips_failing_backend(self, monkeypatch):
+        """Test the breaker opens after repeated failures and probes after the timeout."""
+        now = [0.0]
+        breaker = backends.CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+        monkeypatch.setitem(backends._breakers, 'groq', breaker)
+        monkeypatch.setenv('GROQ_API_KEY', 'test')
+        calls = []
+        
+        def failing(self, fn, style):
+            calls.append(fn['name'])
+            raise ConnectionError('down')
+        
+        monkeypatch.setattr(backends.GroqBackend, 'generate', failing)
+        fn = {'name': 'is_ready', 'args': [], 'returns': 'bool'}
+        for _ in range(4):
+            content, used = backends.generate_content(fn, 'google', 'groq')
+            assert used.name == 'template' and content.startswith('Check whether ready.')
+        assert len(calls) == 2
+        assert breaker.stats()['state'] == 'open' and breaker.stats()['short_circuited'] == 2
+        
+        now[0] = 11
+        monkeypatch.setattr(backends.GroqBackend, 'generate', lambda self, fn, style: 'Report readiness.')
+        assert backends.generate_content(fn, 'google', 'groq') == ('Report readiness.', backends.get_backend('groq'))
+        assert breaker.stats()['state'] == 'closed'
+
+
+# -------------------------------------------------
+# Style Converter Tests
+# -------------------------------------------------
+GOOGLE_DOC = """Merge two mappings.
+
+Keys of ``extra`` win over ``base``.
+
+Args:
+    base (Dict[str, int]): Starting values.
+    extra (Dict[str, int]): Values that override
+        the starting ones.
+    *keys: Keys to keep.
+
+Returns:
+    Dict[str, int]: The merged mapping.
+
+Raises:
+    KeyError: If a kept key is missing.
+
+Examples:
+    >>> merge({'a': 1}, {'a': 2}, 'a')
+    {'a': 2}"""
+
+
+class TestStyleConverter:
+    """Test local conversion between docstring styles."""
+    
+    @pytest.mark.skipif(parse_sections is None, reason="docstring_parser not available")
+    @pytest.mark.parametrize("target", ["numpy", "rest"])
+    def test_round_trip_keeps_sections(self, target):
+        """Test converting away and back keeps every documented part."""
+        from core.docstring_engine.style_converter import convert_docstring, parse_docstring
+        converted = convert_docstring(GOOGLE_DOC, target)
+        
+        assert classify_style(converted) == target
+        assert parse_sections(converted)['params'] == ['base', 'extra', '*keys']
+        assert parse_sections(converted)['raises'] == ['KeyError']
+        assert ">>> merge({'a': 1}, {'a': 2}, 'a')" in converted
+        
+        parsed = parse_docstring(converted)
+        assert parsed['params'][1] == {'name': 'extra', 'type': 'Dict[str, int]',
+                                       'description': 'Values that override the starting ones.'}
+        assert parsed['returns'] == {'type': 'Dict[str, int]', 'description': 'The merged mapping.'}
+        assert convert_docstring(converted, 'google') == GOOGLE_DOC.replace('override\n        the', 'override the')
+    
+    @pytest.mark.skipif(backends is None or parse_file is None, reason="backends not available")
+    def test_generation_converts_without_backend(self, tmp_path, monkeypatch):
+        """Test documented functions are converted locally instead of generated."""
+        from core.docstring_engine import generator
+        from core.docstring_engine.style_converter import convert_project
+        source = tmp_path / 'mod.py'
+        source.write_text(
+            'def merge(base, extra, *keys):\n'
+            '    """' + GOOGLE_DOC.replace('\n', '\n    ') + '\n    """\n'
+            '    raise KeyError(keys)\n'
+        )
+        parsed = parse_file(str(source))
+        fn = parsed['functions'][0]
+        assert fn['signature_check']['consistent']
+        
+        for name in ('GroqBackend', 'TemplateBackend'):
+            monkeypatch.setattr(getattr(backends, name), 'generate', lambda *a, **k: pytest.fail('backend called'))
+        docstrings, stats = generator.generate_docstrings([fn], 'numpy', use_cache=False)
+        assert stats['converted'] == 1 and stats['requests'] == 0
+        assert docstrings[0].startswith('"""\nMerge two mappings.') and 'Parameters\n----------' in docstrings[0]
+        converted = convert_project([parsed], 'rest')
+        assert converted['stats']['converted'] == 1
+        assert generator.generate_docstring(fn, 'rest', use_cache=False) == \
+            generator.format_content(fn, converted['docstrings'][(str(source), 'merge')], 'rest')
+
+
+# -------------------------------------------------
+# Priority Scheduler Tests
+# -------------------------------------------------
+class TestPriorityScheduler:
+    """Test budget-aware, checkpointed generation order."""
+    
+    SOURCE = (
+        "def _tiny():\n    return 1\n\n\n"
+        "def route(kind, value):\n    if kind == 'a':\n        return value\n    elif kind == 'b':\n"
+        "        return -value\n    for _ in range(3):\n        value += 1\n    return value\n\n\n"
+        "def helper(x):\n    return x + 1\n\n\n"
+        "def main():\n    return route('a', helper(1)) + route('b', helper(2))\n"
+    )
+    
+    @pytest.mark.skipif(priority_scheduler is None or parse_file is None, reason="priority_scheduler not available")
+    def test_ranks_by_value(self, tmp_path):
+        """Test public, complex, often-called functions come first."""
+        path = tmp_path / "mod.py"
+        path.write_text(self.SOURCE)
+        ranking = priority_scheduler.rank_functions([parse_file(str(path))], str(tmp_path), churn={})
+        
+        assert [r['fn']['name'] for r in ranking] == ['route', 'helper', 'main', '_tiny']
+        assert (ranking[0]['fan_in'], ranking[0]['complexity']) == (2, 4)
+    
+    @pytest.mark.skipif(priority_scheduler is None or parse_file is None or MockLLMServer is None,
+                        reason="priority_scheduler not available")
+    def test_budget_stops_and_checkpoint_resumes(self, tmp_path):
+        """Test generation stops at the budget and the next run continues."""
+        path = tmp_path / "mod.py"
+        path.write_text(self.SOURCE)
+        parsed = [parse_file(str(path))]
+        first = priority_scheduler.estimate_request_tokens(parsed[0]['functions'][1], 'google')
+        options = dict(style='google', repo_path=str(tmp_path), churn={}, rpm=6000, tpm=1_000_000,
+                       checkpoint_path=str(tmp_path / "checkpoint.json"),
+                       cache=GenerationCache(str(tmp_path / "cache.sqlite3")))
+        
+        with MockLLMServer(latency=0) as server:
+            options.update(base_url=server.base_url, api_key='mock')
+            result = priority_scheduler.run_budgeted(parsed, token_budget=first + 10, **options)
+            assert server.requests == 1
+            assert list(result['docstrings']) == [(str(path), 'route')]
+            assert (result['stats']['stopped'], result['stats']['remaining']) == ('budget', 3)
+            
+            result = priority_scheduler.run_budgeted(parsed, token_budget=first * 10, **options)
+            assert server.requests == 4
+        
+        stats = result['stats']
+        assert (stats['already_done'], stats['generated'], stats['stopped']) == (1, 3, 'complete')
+        assert stats['tokens_spent'] <= first * 10 and stats['runs'] == 2
+    
+    @pytest.mark.skipif(priority_scheduler is None or parse_file is None or MockLLMServer is None,
+                        reason="priority_scheduler not available")
+    def test_failed_requests_are_not_charged(self, tmp_path):
+        """Test spending follows reported usage and failures are refunded."""
+        path = tmp_path / "mod.py"
+        path.write_text(self.SOURCE)
+        parsed = [parse_file(str(path))]
+        first = priority_scheduler.estimate_request_tokens(parsed[0]['functions'][1], 'google')
+        options = dict(style='google', repo_path=str(tmp_path), churn={}, rpm=6000, tpm=1_000_000,
+                       token_budget=first + 10, checkpoint_path=None, base_delay=0.01,
+                       cache=GenerationCache(str(tmp_path / "cache.sqlite3")))
+        
+        with MockLLMServer(latency=0, failures=[400]) as server:
+            options.update(base_url=server.base_url, api_key='mock')
+            result = priority_scheduler.run_budgeted(parsed, **options)
+        assert (result['stats']['failed'], result['stats']['tokens_spent']) == (1, 0)
+        
+        with MockLLMServer(latency=0) as server:
+            options.update(base_url=server.base_url)
+            result = priority_scheduler.run_budgeted(parsed, **options)
+        assert result['stats']['generated'] == 1
+        assert 0 < result['stats']['tokens_spent'] != first
+
+
+# -------------------------------------------------
+# Generation Cache Tests
+# -------------------------------------------------
+class TestGenerationCache:
+    """Test the persistent docstring generation cache."""
+    
+    @pytest.mark.skipif(GenerationCache is None or parse_file is None, reason="generation cache not available")
+    def test_key_ignores_docstring_and_lru_evicts(self, tmp_path):
+        """Test documenting a function keeps its key and old entries are evicted."""
+        before = tmp_path / 'before.py'
+        after = tmp_path / 'after.py'
+        before.write_text('def add(a, b):\n    # sum\n    return a + b\n')
+        after.write_text('class K:\n    def add(a, b):\n        """Add."""\n        return a + b\n')
+        fn_before = parse_file(str(before))['functions'][0]
+        fn_after = parse_file(str(after))['functions'][0]
+        assert fn_before['source_hash'] == fn_after['source_hash']
+        
+        cache = GenerationCache(str(tmp_path / 'gen.sqlite3'), max_bytes=30)
+        assert cache.get(fn_before, 'google') is None
+        assert not (tmp_path / 'gen.sqlite3').exists()
+        
+        cache.put(fn_before, 'google', '"""\nAdd a and b.\n"""')
+        assert cache.get(fn_after, 'google') == '"""\nAdd a and b.\n"""'
+        assert cache.get(fn_after, 'numpy') is None
+        assert GenerationCache(cache.path, prompt_version='other').get(fn_after, 'google') is None
+        
+        other = {'name': 'neg', 'args': [{'name': 'x', 'annotation': 'int'}], 'returns': 'int'}
+        cache.put(other, 'google', '"""\nNegate x.\n"""')
+        assert cache.get(other, 'google') == '"""\nNegate x.\n"""'
+        assert cache.get(fn_before, 'google') is None
+        
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (2, 3, 1, 1)
+    
+    @pytest.mark.skipif(GenerationCache is None or parse_file is None, reason="generation cache not available")
+    def test_warm_from_review_log_serves_generation(self, tmp_path, monkeypatch):
+        """Test accepted docstrings are served without calling the LLM."""
+        import json
+        from core.docstring_engine import generator
+        source = tmp_path / 'mod.py'
+        source.write_text('def add(a, b):\n    """Add a and b."""\n    return a + b\n')
+        log = tmp_path / 'review_logs.json'
+        log.write_text(json.dumps([
+            {'file': str(source), 'function': 'add', 'style': 'google', 'timestamp': 'now'},
+            {'file': str(tmp_path / 'gone.py'), 'function': 'x', 'style': 'google', 'timestamp': 'now'}
+        ]))
+        
+        cache = GenerationCache(str(tmp_path / 'gen.sqlite3'))
+        assert cache.warm_from_review_log(str(log)) == 1
+        
+        monkeypatch.setattr(generator, 'get_cache', lambda: cache)
+        monkeypatch.setattr(backends.GroqBackend, 'generate', lambda *a, **k: pytest.fail('LLM called'))
+        fn = parse_file(str(source))['functions'][0]
+        assert generator.generate_docstring(fn, 'google') == '"""\nAdd a and b.\n"""'
+        docstrings, stats = generator.generate_docstrings([fn], 'google')
+        assert stats['cache_hits'] == 1 and stats['requests'] == 0
+
+
 # -------------------------------------------------
 # Validation Tests
 # -------------------------------------------------
@@ -448,6 +1358,909 @@ def no_doc():
                 assert 'line' in violations[0]
         finally:
             os.unlink(temp_path)
+    
+    @pytest.mark.skipif(validate_files is None, reason="validate_files not available")
+    def test_batched_validation_matches_single_file(self):
+        """Test batched validation returns the same dicts per file."""
+        codes = ['def a():\n    pass\n', '"""Mod."""\n\ndef b():\n    """Return b"""\n']
+        paths = []
+        try:
+            for code in codes:
+                with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+                    f.write(code)
+                    paths.append(f.name)
+            
+            batched = validate_files(paths, batch_size=1, max_workers=2)
+            assert list(batched) == paths
+            for path in paths:
+                assert batched[path] == validate_docstrings(path)
+            
+            d400 = [v for v in batched[paths[1]] if v['code'] == 'D400']
+            assert d400 and d400[0]['line'] == 4
+            assert d400[0]['message'].startswith('First line should end with a period')
+        finally:
+            for path in paths:
+                os.unlink(path)
+    
+    @pytest.mark.skipif(validate_files is None, reason="validate_files not available")
+    def test_batched_validation_ignore(self):
+        """Test ignored codes are not reported."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write('def a():\n    pass\n')
+            temp_path = f.name
+        
+        try:
+            result = validate_files([temp_path], ignore=['D100', 'D103'])
+            assert result[temp_path] == []
+        finally:
+            os.unlink(temp_path)
+
+
+# -------------------------------------------------
+# Native Validator Tests
+# -------------------------------------------------
+NATIVE_CASES = {
+    'missing': '''import functools
+
+
+class Public:
+    def __init__(self):
+        pass
+
+    def __repr__(self):
+        pass
+
+    @functools.lru_cache()
+    def method(self):
+        pass
+
+    class Inner:
+        pass
+
+
+def _private():
+    pass
+''',
+    'blank_lines': '''"""Mod."""
+
+
+def before():
+
+    """Blank before."""
+    return 1
+
+
+def after():
+    """Blank after."""
+
+    return 1
+
+
+class Cls:
+    """Class doc."""
+    x = 1
+
+
+class Spaced:
+
+    """Class doc."""
+
+    x = 1
+''',
+    'content': '''"""Mod."""
+
+
+def one_liner():
+    """
+    Spread over lines.
+    """
+
+
+def no_blank():
+    """Summary.
+    Description right after.
+    """
+
+
+def closing():
+    """Summary.
+
+    Description."""
+
+
+def spaces():
+    """ Leading space."""
+
+
+def no_period():
+    """Return something"""
+
+
+def sig():
+    """sig(a, b) does things."""
+
+
+def lower():
+    """return the value."""
+
+
+def single():
+    \'\'\'Single quotes.\'\'\'
+
+
+def empty():
+    """   """
+
+
+def over():
+    """Summary.
+
+        Over indented.
+    """
+''',
+    'noqa_and_all': '''"""Mod"""
+__all__ = ['exported']
+
+
+def exported():  # noqa: D103
+    pass
+
+
+def not_exported():
+    pass
+
+
+def silenced():  # noqa
+    """no period"""
+''',
+    'async': '''"""Mod."""
+
+
+async def fetch():
+    pass
+
+
+async def summary_only():
+    """Summary
+    Description."""
+
+
+async def backslash():
+    """Split on \\\\ only."""
+
+
+class Client:
+    """Client."""
+
+    async def __aenter__(self):
+        pass
+
+    async def get(self):
+        """Get."""
+
+        return 1
+
+    async def close(self):
+        pass
+''',
+    'dynamic_all': '''"""Mod."""
+__all__ = ['listed']
+__all__ += ['extra']
+
+
+def listed():
+    pass
+
+
+def extra():
+    pass
+
+
+def _private():
+    pass
+
+
+class Exported:
+    def method(self):
+        pass
+
+    def __len__(self):
+        return 0
+''',
+}
+
+
+class TestNativeValidator:
+    """Conformance of the native rule engine against pydocstyle."""
+    
+    @staticmethod
+    def _keys(violations):
+        return {
+            (v['line'], v['code'], v['message'])
+            for v in violations
+            if v['code'] in native_rules.NATIVE_CODES
+        }
+    
+    @pytest.mark.skipif(native_rules is None or validate_docstrings is None, reason="native_rules not available")
+    @pytest.mark.parametrize('case', sorted(NATIVE_CASES))
+    def test_matches_pydocstyle(self, case):
+        """Test native results equal pydocstyle's for the covered codes."""
+        pytest.importorskip('pydocstyle')
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(NATIVE_CASES[case])
+            temp_path = f.name
+        
+        try:
+            expected = self._keys(validate_docstrings(temp_path))
+            native = native_rules.validate_file(temp_path)
+            assert expected
+            assert self._keys(native) == expected
+            assert all(v['file'] == temp_path for v in native)
+        finally:
+            os.unlink(temp_path)
+    
+    @pytest.mark.skipif(validate_files is None or native_rules is None, reason="native_rules not available")
+    def test_native_backend(self):
+        """Test the validator entry points accept the native backend."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write('def a():\n    """Return a"""\n')
+            temp_path = f.name
+        
+        try:
+            codes = [v['code'] for v in validate_docstrings(temp_path, backend='native')]
+            assert codes == ['D100', 'D400']
+            
+            batched = validate_files([temp_path], ignore=['D100'], backend='native')
+            assert [v['code'] for v in batched[temp_path]] == ['D400']
+        finally:
+            os.unlink(temp_path)
+    
+    @pytest.mark.skipif(native_rules is None, reason="native_rules not available")
+    def test_syntax_error_reported(self):
+        """Test unparsable source yields an ERROR entry instead of raising."""
+        violations = native_rules.validate_source('def broken(:\n', 'broken.py')
+        assert len(violations) == 1 and violations[0]['code'] == 'ERROR'
+
+
+# -------------------------------------------------
+# Validation Cache Tests
+# -------------------------------------------------
+class TestValidationCache:
+    """Test the persistent validation cache."""
+    
+    @pytest.mark.skipif(ValidationCache is None, reason="validation cache not available")
+    def test_unchanged_files_are_not_revalidated(self, tmp_path, monkeypatch):
+        """Test hits survive a reload and skip the validator."""
+        source = tmp_path / 'mod.py'
+        source.write_text('def a():\n    """Return a"""\n')
+        cache_path = str(tmp_path / 'cache.json')
+        
+        first = validate_files_cached([str(source)], backend='native', cache=ValidationCache(cache_path))
+        
+        from core.validator import cache as cache_module
+        monkeypatch.setattr(cache_module, 'validate_files', lambda *a, **k: pytest.fail('validator ran'))
+        reloaded = ValidationCache(cache_path)
+        assert validate_files_cached([str(source)], backend='native', cache=reloaded) == first
+        assert (reloaded.hits, reloaded.misses) == (1, 0)
+    
+    @pytest.mark.skipif(ValidationCache is None, reason="validation cache not available")
+    def test_key_includes_content_and_rules(self, tmp_path):
+        """Test edits, rule changes and invalidate() cause misses."""
+        source = tmp_path / 'mod.py'
+        source.write_text('def a():\n    """Return a"""\n')
+        path = str(source)
+        cache = ValidationCache(str(tmp_path / 'cache.json'))
+        
+        validate_files_cached([path], backend='native', cache=cache)
+        assert cache.lookup(path, 'native') is not None
+        assert cache.lookup(path, 'native', ignore=['D400']) is None
+        assert cache.lookup(path, 'pydocstyle') is None
+        
+        source.write_text('def a():\n    """Return a."""\n')
+        assert cache.lookup(path, 'native') is None
+        codes = [v['code'] for v in validate_files_cached([path], backend='native', cache=cache)[path]]
+        assert codes == ['D100']
+        
+        cache.invalidate(path)
+        assert cache.lookup(path, 'native') is None
+    
+    @pytest.mark.skipif(ValidationCache is None, reason="validation cache not available")
+    def test_streamed_validation_fills_cache(self, tmp_path):
+        """Test scheduler results are cached and served as hits next time."""
+        source = tmp_path / 'mod.py'
+        source.write_text('def a():\n    """Return a"""\n')
+        cache = ValidationCache(str(tmp_path / 'cache.json'))
+        
+        first = list(iter_validate_cached([str(source)], backend='native', cache=cache))
+        second = list(iter_validate_cached([str(source)], backend='native', cache=cache))
+        assert first[0]['status'] == 'ok' and second[0]['status'] == 'cached'
+        assert first[0]['violations'] == second[0]['violations']
+    
+    @pytest.mark.skipif(ValidationCache is None or parse_file is None, reason="validation cache not available")
+    def test_native_reuses_parse_records(self, tmp_path, monkeypatch):
+        """Test scan records are checked in-process without parsing the file again."""
+        source = tmp_path / 'mod.py'
+        source.write_text('def a():\n    """Return a"""\n\n\nasync def b():\n    pass\n')
+        expected = native_rules.validate_file(str(source))
+        records = {str(source): parse_file(str(source))}
+        
+        from core.validator import cache as cache_module
+        monkeypatch.setattr(native_rules, 'parse_source', lambda *a, **k: pytest.fail('parsed again'))
+        monkeypatch.setattr(cache_module, 'iter_scheduled', lambda *a, **k: iter(()))
+        items = list(iter_validate_cached([str(source)], backend='native',
+                                          cache=ValidationCache(str(tmp_path / 'cache.json')), parsed=records))
+        assert [item['status'] for item in items] == ['ok']
+        assert items[0]['violations'] == expected
+        assert {v['code'] for v in expected} == {'D100', 'D400', 'D103'}
+    
+    @pytest.mark.skipif(native_rules is None or parse_file is None, reason="native rules not available")
+    def test_stale_parse_records_are_not_used(self, tmp_path):
+        """Test a file edited after the scan is checked as it is now, not from old records."""
+        source = tmp_path / 'mod.py'
+        source.write_text('"""Mod."""\n\n\ndef a():\n    pass\n\n\ndef b():\n    """Return b"""\n')
+        records = {str(source): parse_file(str(source))}
+        source.write_text('def c():\n    pass\n')
+        expected = native_rules.validate_file(str(source))
+        assert {v['code'] for v in expected} == {'D100', 'D103'}
+        
+        cache = ValidationCache(str(tmp_path / 'cache.json'))
+        items = list(iter_validate_cached([str(source)], backend='native', cache=cache, parsed=records))
+        assert items[0]['violations'] == expected
+        assert cache.lookup(str(source), 'native', None) == expected
+
+
+# -------------------------------------------------
+# Rule Profiler Tests
+# -------------------------------------------------
+PROFILE_SOURCE = '''"""Mod"""
+
+
+def a():
+
+    """return a"""
+    return 1
+
+
+class B:
+    def c(self):
+        pass
+'''
+
+
+class TestRuleProfiler:
+    """Test per-rule and per-file validation profiling."""
+    
+    @pytest.mark.skipif(RuleProfile is None or validate_files is None, reason="profiler not available")
+    @pytest.mark.parametrize('backend', ['native', 'pydocstyle'])
+    def test_hits_match_violations(self, tmp_path, backend):
+        """Test hits add up to the violations and every file is timed."""
+        if backend == 'pydocstyle':
+            pytest.importorskip('pydocstyle')
+        source = tmp_path / 'mod.py'
+        source.write_text(PROFILE_SOURCE)
+        path = str(source)
+        
+        profile = RuleProfile()
+        violations = validate_files([path], backend=backend, profile=profile)[path]
+        report = profile.report()
+        
+        assert violations
+        assert sum(r['hits'] for r in report['rules']) == len(violations)
+        assert report['files'] == [{'file_path': path, 'seconds': report['files'][0]['seconds'],
+                                    'hits': len(violations)}]
+        assert all(r['calls'] > 0 and r['seconds'] >= 0 for r in report['rules'])
+        assert validate_files([path], backend=backend) == {path: violations}
+    
+    @pytest.mark.skipif(RuleProfile is None or validate_files is None, reason="profiler not available")
+    def test_ignored_rules_are_not_run(self, tmp_path):
+        """Test a pydocstyle check whose codes are all ignored never runs."""
+        pytest.importorskip('pydocstyle')
+        source = tmp_path / 'mod.py'
+        source.write_text(PROFILE_SOURCE)
+        
+        profile = RuleProfile()
+        validate_files([str(source)], ignore=['D401'], profile=profile)
+        assert 'D401' not in profile.rules
+        assert 'D201/D202' in profile.rules
+        
+        merged = RuleProfile()
+        merged.merge(profile.to_dict())
+        merged.merge(profile.to_dict())
+        assert merged.rules['D201/D202']['calls'] == 2 * profile.rules['D201/D202']['calls']
+
+
+# -------------------------------------------------
+# Diff-Scoped Validation Tests
+# -------------------------------------------------
+DIFF_BASE = '''"""Mod."""
+
+
+def untouched():
+    """no period"""
+    return 1
+
+
+def edited():
+    """Return two."""
+    return 2
+'''
+
+
+class TestDiffScope:
+    """Test validation limited to the functions a diff touches."""
+    
+    @pytest.mark.skipif(diff_scope is None, reason="diff_scope not available")
+    def test_parse_diff(self):
+        """Test hunks map to new-side lines, deletions to the preceding line."""
+        diff = (
+            "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n"
+            "@@ -3 +3,2 @@\n-x\n+y\n+z\n@@ -9,2 +10,0 @@\n-q\n-r\n"
+            "diff --git a/gone.py b/gone.py\n--- a/gone.py\n+++ /dev/null\n@@ -1 +0,0 @@\n-x\n"
+        )
+        assert diff_scope.parse_diff(diff) == {'a.py': {3, 4, 10}}
+    
+    @pytest.mark.skipif(diff_scope is None, reason="diff_scope not available")
+    def test_only_touched_functions_reported(self, tmp_path):
+        """Test staged and range diffs ignore violations outside the change."""
+        import shutil
+        import subprocess
+        if shutil.which('git') is None:
+            pytest.skip("git not available")
+        repo = str(tmp_path)
+        subprocess.run(['git', 'init', '-q', repo], check=True)
+        _git_commit(repo, 'm.py', DIFF_BASE)
+        
+        with open(os.path.join(repo, 'm.py'), 'w') as f:
+            f.write(DIFF_BASE.replace('"""Return two."""', '"""return two"""'))
+        subprocess.run(['git', '-C', repo, 'add', 'm.py'], check=True)
+        
+        staged = diff_scope.validate_diff(repo, staged=True)
+        assert staged['functions_checked'] == 1
+        assert staged['files'][0]['functions'][0]['name'] == 'edited'
+        assert sorted(v['code'] for v in staged['violations']) == ['D400', 'D403']
+        assert all(v['line'] == 10 for v in staged['violations'])
+        
+        subprocess.run(
+            ['git', '-C', repo, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-qm', 'edit'],
+            check=True
+        )
+        ranged = diff_scope.validate_diff(repo, 'HEAD~1..HEAD')
+        assert ranged['violations'] == staged['violations']
+        assert diff_scope.validate_diff(repo, staged=True)['functions_checked'] == 0
+
+
+# -------------------------------------------------
+# Auto-Fix Tests
+# -------------------------------------------------
+AUTOFIX_SOURCE = '''"""Mod."""
+
+
+def spread():
+    """
+    return the value
+    """
+
+
+def no_blank():
+    """Summary.
+    Description right after."""
+
+
+def wrapped():
+    """Summary that
+    continues here.
+    """
+'''
+
+
+class TestAutofix:
+    """Test local fixes for mechanical violations."""
+    
+    @pytest.mark.skipif(autofix is None, reason="autofix not available")
+    def test_fixes_mechanical_violations(self):
+        """Test D200/D403/D400/D205/D209 are rewritten in place."""
+        new_source, report = autofix.fix_source(AUTOFIX_SOURCE)
+        
+        assert '    """Return the value."""\n' in new_source
+        assert '    """Summary.\n\n    Description right after.\n    """\n' in new_source
+        assert report['fixed'] == {'D200': 1, 'D403': 1, 'D400': 1, 'D205': 1, 'D209': 1}
+        assert report['llm_calls_avoided'] == 2
+        
+        # A wrapped summary is left for the LLM
+        assert {v['code'] for v in report['remaining']} == {'D205', 'D400'}
+        assert autofix.fix_source(new_source)[1]['changed'] is False
+    
+    @pytest.mark.skipif(autofix is None, reason="autofix not available")
+    def test_fix_file_writes_once(self, tmp_path, monkeypatch):
+        """Test all edits for a file land in a single write."""
+        target = tmp_path / 'mod.py'
+        target.write_text(AUTOFIX_SOURCE)
+        
+        import builtins
+        real_open = builtins.open
+        writes = []
+        
+        def counting_open(path, mode='r', *args, **kwargs):
+            if 'w' in mode:
+                writes.append(path)
+            return real_open(path, mode, *args, **kwargs)
+        
+        monkeypatch.setattr(builtins, 'open', counting_open)
+        dry = autofix.fix_files([str(target)], dry_run=True)
+        assert writes == [] and dry['total_fixed'] == 5
+        
+        result = autofix.fix_files([str(target)])
+        assert writes == [str(target)]
+        assert result['files_changed'] == [str(target)]
+        assert result['llm_calls_avoided'] == 2
+    
+    @pytest.mark.skipif(autofix is None, reason="autofix not available")
+    def test_fix_file_keeps_crlf(self, tmp_path):
+        """Test a CRLF file is fixed without converting its line endings."""
+        target = tmp_path / 'mod.py'
+        target.write_bytes(AUTOFIX_SOURCE.replace('\n', '\r\n').encode('utf-8'))
+        
+        assert autofix.fix_file(str(target))['changed'] is True
+        data = target.read_bytes()
+        assert data.count(b'\r\n') == data.count(b'\n')
+        assert b'    """Return the value."""\r\n' in data
+
+
+# -------------------------------------------------
+# Scheduler Tests
+# -------------------------------------------------
+def _slow_task(file_path):
+    """Scheduler task that hangs on files named slow*."""
+    import time
+    if os.path.basename(file_path).startswith('slow'):
+        time.sleep(30)
+    return os.path.getsize(file_path)
+
+
+class TestScheduler:
+    """Test the parallel validation scheduler."""
+    
+    @pytest.mark.skipif(scheduler is None, reason="scheduler not available")
+    def test_largest_first_and_percentiles(self, tmp_path):
+        """Test dispatch order and nearest-rank percentiles."""
+        paths = []
+        for name, size in (('small.py', 10), ('big.py', 1000), ('mid.py', 100)):
+            (tmp_path / name).write_text('#' * size)
+            paths.append(str(tmp_path / name))
+        
+        assert [os.path.basename(p) for p in scheduler.order_largest_first(paths)] == ['big.py', 'mid.py', 'small.py']
+        assert scheduler.percentiles([float(i) for i in range(1, 101)]) == {'p50': 50.0, 'p95': 95.0, 'p99': 99.0}
+        assert scheduler.percentiles([]) == {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    
+    @pytest.mark.skipif(scheduler is None, reason="scheduler not available")
+    def test_results_match_validator(self, tmp_path):
+        """Test scheduled validation returns the same violations as a direct run."""
+        paths = []
+        for i, code in enumerate(['def a():\n    pass\n', '"""Mod."""\n\ndef b():\n    """Return b"""\n']):
+            (tmp_path / f'm{i}.py').write_text(code)
+            paths.append(str(tmp_path / f'm{i}.py'))
+        
+        run = scheduler.run_scheduled(paths, workers=2, backend='native')
+        assert list(run['results']) == paths
+        for path in paths:
+            assert run['results'][path]['status'] == 'ok'
+            assert run['results'][path]['result'] == validate_docstrings(path, backend='native')
+        assert set(run['timings']) == {'p50', 'p95', 'p99'}
+    
+    @pytest.mark.skipif(scheduler is None, reason="scheduler not available")
+    def test_timeout_kills_and_replaces_worker(self, tmp_path, monkeypatch):
+        """Test a hanging file times out while the rest still complete."""
+        import multiprocessing
+        import time
+        if multiprocessing.get_start_method() != 'fork':
+            pytest.skip("needs fork to register a test task")
+        monkeypatch.setitem(scheduler.TASKS, 'slow', _slow_task)
+        
+        paths = []
+        for name in ('slow.py', 'a.py', 'b.py', 'c.py'):
+            (tmp_path / name).write_text('x = 1\n')
+            paths.append(str(tmp_path / name))
+        
+        started = time.perf_counter()
+        run = scheduler.run_scheduled(paths, task='slow', workers=1, timeout=0.5)
+        assert time.perf_counter() - started < 10
+        assert run['timeouts'] == [paths[0]]
+        assert all(run['results'][p]['status'] == 'ok' for p in paths[1:])
+
+
+# -------------------------------------------------
+# Clone Detector Tests
+# -------------------------------------------------
+CLONE_SOURCE = '''
+def total(items, tax):
+    """Sum prices."""
+    result = 0
+    for item in items:
+        if item.price > 0:
+            result += item.price * (1 + tax)
+    return round(result, 2)
+
+def copied(things, rate):
+    acc = 0
+    for t in things:
+        if t.price > 0:
+            acc += t.price * (1 + rate)
+    return round(acc, 2)
+
+def unrelated(text):
+    return text.strip().upper()
+'''
+
+
+class TestCloneDetector:
+    """Test AST fingerprint clone detection."""
+    
+    @pytest.mark.skipif(CloneIndex is None, reason="clone_detector not available")
+    def test_renamed_copy_is_exact_clone(self):
+        """Test renamed copies share a subtree hash."""
+        index = CloneIndex(min_nodes=10)
+        index.add_source('a.py', CLONE_SOURCE)
+        groups = index.clone_groups()
+        
+        assert len(groups) == 1
+        assert groups[0]['kind'] == 'exact'
+        names = {m['name'] for m in groups[0]['members']}
+        assert names == {'total', 'copied'}
+    
+    @pytest.mark.skipif(CloneIndex is None, reason="clone_detector not available")
+    def test_near_duplicate_across_files(self):
+        """Test a copy with an extra statement is a near clone."""
+        edited = CLONE_SOURCE.replace(
+            "    return round(acc, 2)",
+            "    print(acc)\n    return round(acc, 2)"
+        )
+        index = CloneIndex(min_nodes=10)
+        index.add_source('a.py', CLONE_SOURCE.split('def copied')[0])
+        index.add_source('b.py', edited.split('def total')[0] + 'def copied' + edited.split('def copied')[1])
+        groups = index.clone_groups(threshold=0.5)
+        
+        assert len(groups) == 1
+        assert groups[0]['kind'] == 'near'
+        assert {m['file_path'] for m in groups[0]['members']} == {'a.py', 'b.py'}
+    
+    @pytest.mark.skipif(CloneIndex is None, reason="clone_detector not available")
+    def test_duplication_metric(self):
+        """Test per-file duplication counts clone line spans."""
+        index = CloneIndex(min_nodes=10)
+        index.add_source('a.py', CLONE_SOURCE)
+        report = index.duplication_by_file()
+        
+        assert report[0]['file_path'] == 'a.py'
+        assert report[0]['duplicated_lines'] == 13
+        assert 0 < report[0]['duplication_percent'] < 100
+    
+    @pytest.mark.skipif(CloneIndex is None or parse_file is None, reason="clone_detector not available")
+    def test_detects_from_parse_records(self, tmp_path):
+        """Test detect_clones uses parsed records (async defs included) without re-reading files."""
+        from core.metrics.clone_detector import detect_clones
+        target = tmp_path / 'a.py'
+        target.write_text(CLONE_SOURCE.replace('def total', 'async def total').replace('def copied', 'async def copied'))
+        parsed = [parse_file(str(target))]
+        target.unlink()
+        
+        index = CloneIndex(min_nodes=10)
+        assert index.add_parsed(parsed[0]) == 2
+        result = detect_clones(parsed)
+        assert [{m['name'] for m in g['members']} for g in result['groups']] == [{'total', 'copied'}]
+        assert result['files'][0]['total_lines'] == CLONE_SOURCE.count('\n') + 1
+
+
+# -------------------------------------------------
+# Import Graph Tests
+# -------------------------------------------------
+class TestImportGraph:
+    """Test repository import graph metrics."""
+    
+    @pytest.mark.skipif(build_import_graph is None, reason="import_graph not available")
+    def test_resolves_absolute_and_relative_imports(self):
+        """Test imports resolve to scanned files."""
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, 'pkg'))
+            files = {
+                'pkg/__init__.py': '',
+                'pkg/core.py': 'def base():\n    return 1\n',
+                'pkg/util.py': 'from . import core\n\ndef helper():\n    return core.base()\n',
+                'app.py': 'import pkg.util\nfrom pkg.core import base\nimport json\n',
+            }
+            for name, code in files.items():
+                with open(os.path.join(root, name), 'w') as f:
+                    f.write(code)
+            
+            graph = build_import_graph(parse_path(root), root)
+            modules = {m['module']: m for m in graph['modules']}
+            
+            assert modules['pkg.core']['fan_in'] == 2
+            assert modules['app']['fan_out'] == 2
+            assert ('pkg.util', 'pkg.core') in graph['edges']
+            assert graph['cycles'] == []
+    
+    @pytest.mark.skipif(strongly_connected_components is None, reason="import_graph not available")
+    def test_scc_finds_cycles(self):
+        """Test cycles are reported as components."""
+        adjacency = [[1], [2], [0], [2, 4], []]
+        components = sorted(sorted(c) for c in strongly_connected_components(adjacency))
+        assert components == [[0, 1, 2], [3], [4]]
+    
+    @pytest.mark.skipif(strongly_connected_components is None, reason="import_graph not available")
+    def test_scc_deep_chain_is_iterative(self):
+        """Test long chains do not hit the recursion limit."""
+        n = 50000
+        adjacency = [[i + 1] for i in range(n - 1)] + [[0]]
+        components = strongly_connected_components(adjacency)
+        assert len(components) == 1
+    
+    @pytest.mark.skipif(rank_documentation_priority is None, reason="import_graph not available")
+    def test_documentation_priority(self):
+        """Test depended-on, undocumented modules rank first."""
+        graph = {'modules': [
+            {'module': 'a', 'file_path': 'a.py', 'fan_in': 5, 'fan_out': 0},
+            {'module': 'b', 'file_path': 'b.py', 'fan_in': 5, 'fan_out': 0},
+            {'module': 'c', 'file_path': 'c.py', 'fan_in': 1, 'fan_out': 0},
+        ]}
+        coverage = {'files': [
+            {'file_path': 'a.py', 'total_functions': 4, 'coverage_percent': 100},
+            {'file_path': 'b.py', 'total_functions': 4, 'coverage_percent': 25},
+            {'file_path': 'c.py', 'total_functions': 4, 'coverage_percent': 0},
+        ]}
+        ranking = rank_documentation_priority(graph, coverage)
+        assert [r['module'] for r in ranking] == ['b', 'c']
+
+
+# -------------------------------------------------
+# Churn Tests
+# -------------------------------------------------
+def _git_commit(repo, name, code):
+    """Write a file and commit it in a scratch repository."""
+    import subprocess
+    with open(os.path.join(repo, name), 'w') as f:
+        f.write(code)
+    subprocess.run(['git', '-C', repo, 'add', name], check=True, capture_output=True)
+    subprocess.run(
+        ['git', '-C', repo, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-m', name],
+        check=True, capture_output=True
+    )
+
+
+class TestChurn:
+    """Test git churn collection and risk ranking."""
+    
+    @pytest.fixture
+    def repo(self, tmp_path):
+        import shutil
+        import subprocess
+        if churn_module is None or shutil.which('git') is None:
+            pytest.skip("git or churn module not available")
+        subprocess.run(['git', 'init', '-q', str(tmp_path)], check=True)
+        return str(tmp_path)
+    
+    def test_counts_changes_per_file(self, repo):
+        """Test commits and line counts are aggregated per file."""
+        _git_commit(repo, 'a.py', 'x = 1\n')
+        _git_commit(repo, 'a.py', 'x = 1\ny = 2\n')
+        _git_commit(repo, 'b.py', 'z = 3\n')
+        
+        churn = churn_module.collect_churn(repo, days=None, cache_path=None)
+        assert churn['a.py']['commits'] == 2
+        assert churn['a.py']['added'] == 2
+        assert churn['b.py']['commits'] == 1
+    
+    def test_non_ascii_paths_are_not_quoted(self, repo):
+        """Test non-ASCII file names come back as written, not git-quoted."""
+        _git_commit(repo, 'données.py', 'x = 1\n')
+        
+        churn = churn_module.collect_churn(repo, days=None, cache_path=None)
+        assert churn['données.py']['commits'] == 1
+    
+    def test_cache_only_reads_new_commits(self, repo, tmp_path_factory, monkeypatch):
+        """Test the cached log is extended from the old HEAD."""
+        cache = str(tmp_path_factory.mktemp('cache') / 'churn.json')
+        _git_commit(repo, 'a.py', 'x = 1\n')
+        churn_module.collect_churn(repo, days=None, cache_path=cache)
+        old_head = churn_module.get_head_sha(repo)
+        
+        _git_commit(repo, 'a.py', 'x = 2\n')
+        ranges = []
+        original = churn_module.iter_git_log
+        
+        def tracking(repo_path, rev_range='HEAD'):
+            ranges.append(rev_range)
+            return original(repo_path, rev_range)
+        
+        monkeypatch.setattr(churn_module, 'iter_git_log', tracking)
+        churn = churn_module.collect_churn(repo, days=None, cache_path=cache)
+        
+        assert ranges == [f"{old_head}..{churn_module.get_head_sha(repo)}"]
+        assert churn['a.py']['commits'] == 2
+    
+    def test_failed_log_is_not_cached(self, repo, tmp_path_factory, monkeypatch):
+        """Test a failing git log raises and leaves no cache behind."""
+        import subprocess
+        cache = tmp_path_factory.mktemp('cache') / 'churn.json'
+        _git_commit(repo, 'a.py', 'x = 1\n')
+        with pytest.raises(subprocess.CalledProcessError):
+            list(churn_module.iter_git_log(repo, 'no-such-branch'))
+        
+        original = churn_module.iter_git_log
+        monkeypatch.setattr(churn_module, 'iter_git_log',
+                            lambda repo_path, rev_range='HEAD': original(repo_path, 'no-such-branch'))
+        assert churn_module.collect_churn(repo, days=None, cache_path=str(cache)) == {}
+        assert not cache.exists()
+    
+    def test_risk_ranking(self, repo):
+        """Test risk joins churn, complexity and coverage."""
+        _git_commit(repo, 'a.py', 'x = 1\n')
+        _git_commit(repo, 'a.py', 'x = 2\n')
+        _git_commit(repo, 'b.py', 'y = 1\n')
+        
+        churn = churn_module.collect_churn(repo, days=None, cache_path=None)
+        a, b = os.path.join(repo, 'a.py'), os.path.join(repo, 'b.py')
+        complexity = {
+            a: {'functions': [{'complexity': 5}], 'max_complexity': 5},
+            b: {'functions': [{'complexity': 20}], 'max_complexity': 20},
+        }
+        coverage = {'files': [
+            {'file_path': a, 'coverage_percent': 100},
+            {'file_path': b, 'coverage_percent': 0},
+        ]}
+        ranking = churn_module.rank_risk(churn, complexity, coverage, repo)
+        
+        assert [r['file_path'] for r in ranking] == [b, a]
+        assert ranking[0]['risk'] == 40
+
+
+# -------------------------------------------------
+# Per-Function Metrics Tests
+# -------------------------------------------------
+class TestFunctionMetrics:
+    """Test per-function maintainability and raw LOC."""
+    
+    CODE = '''
+def small():
+    """Return one."""
+    return 1
+
+
+def big(items):
+    # accumulate
+    total = 0
+    for item in items:
+        if item > 0 and item % 2:
+            total += item * 3
+        elif item < -10:
+            total -= item
+        else:
+            total += 1
+
+    return total
+'''
+    
+    @pytest.mark.skipif(get_function_metrics is None or parse_file is None, reason="code_metrics not available")
+    def test_span_line_counts(self):
+        """Test SLOC, comments and blanks come from each span."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(self.CODE)
+            temp_path = f.name
+        
+        try:
+            functions = parse_file(temp_path)['functions']
+            small, big = get_function_metrics(self.CODE, functions)
+            
+            assert (small['sloc'], small['multi'], small['comments']) == (2, 1, 0)
+            assert (big['sloc'], big['comments'], big['blank']) == (10, 1, 1)
+            assert big['complexity'] > small['complexity']
+            assert big['maintainability_index'] < small['maintainability_index']
+        finally:
+            os.unlink(temp_path)
+    
+    @pytest.mark.skipif(get_function_metrics is None, reason="code_metrics not available")
+    def test_invalid_source_returns_empty(self):
+        """Test tokenizer errors are handled."""
+        assert get_function_metrics('def broken(:\n    (', []) == []
 
 
 if __name__ == '__main__':